@@ -0,0 +1,86 @@
+"""
+Benchmarks the movies list API with the serializer path and the .values()
+fast path, reporting requests/sec for each and checking that both return
+the same bytes. Runs against a throwaway test database.
+
+    python benchmarks/api_list.py --movies 5000 --per-page 100 --requests 200
+"""
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'imdb_scrapper.settings')
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.db import connection  # noqa: E402
+from django.test import Client  # noqa: E402
+from django.test.utils import override_settings, setup_test_environment  # noqa: E402
+
+from scraper import renderers  # noqa: E402
+from scraper.models import Movie  # noqa: E402
+
+
+def populate(count):
+    Movie.objects.bulk_create([
+        Movie(
+            imdb_id=f'tt{n:07d}',
+            title=f'Movie {n}',
+            year=1950 + n % 75,
+            rating=None if n % 17 == 0 else (n % 90 + 10) / 10,
+            directors=f'Director {n % 300}',
+            cast=', '.join(f'Actor {(n + k) % 2000}' for k in range(4)),
+            plot=f'Plot of movie {n}, in which things happen. ' * 3,
+        )
+        for n in range(count)
+    ], batch_size=1000)
+
+
+def measure(client, paths, requests):
+    started = time.perf_counter()
+    for i in range(requests):
+        client.get(paths[i % len(paths)])
+    elapsed = time.perf_counter() - started
+    return requests / elapsed, [client.get(path).content for path in paths]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--movies', type=int, default=5000)
+    parser.add_argument('--per-page', type=int, default=100)
+    parser.add_argument('--requests', type=int, default=200)
+    args = parser.parse_args()
+
+    setup_test_environment()
+    old_name = connection.creation.create_test_db(verbosity=0)
+    try:
+        populate(args.movies)
+        pages = max(1, args.movies // args.per_page)
+        paths = [f'/scraper/movies/?per_page={args.per_page}&page={page}&ordering=-rating'
+                 for page in range(1, min(pages, 20) + 1)]
+        client = Client()
+
+        print(f"{args.movies} movies, {args.requests} requests of {args.per_page} rows "
+              f"(orjson {'installed' if renderers.orjson else 'not installed'})")
+        # Response caching would turn both runs into cache hits
+        with override_settings(SCRAPER_API_CACHE_SECONDS=0, SCRAPER_API_COUNT_CACHE_SECONDS=0):
+            reference = None
+            for name, fast in (('serializer', False), ('values fast path', True)):
+                with override_settings(SCRAPER_API_FAST_PATH=fast):
+                    per_sec, bodies = measure(client, paths, args.requests)
+                if reference is None:
+                    reference = bodies
+                elif bodies != reference:
+                    print(f"  ! {name} output differs from the serializer path")
+                print(f"{name:<20} {per_sec:>8.1f} requests/sec")
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,133 @@
+"""
+Benchmarks the list-discovery phase against a local stand-in for the IMDb
+search page, comparing a fresh unfiltered Chromium per job (the old
+behaviour) with the shared, resource-blocking browser pool.
+
+    python benchmarks/list_phase.py --jobs 5 --limit 200
+"""
+import argparse
+import asyncio
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'imdb_scrapper.settings')
+
+import django  # noqa: E402
+
+django.setup()
+
+from scraper.browser import BrowserPool  # noqa: E402
+from scripts.management.commands.scraper import IMDBScraper  # noqa: E402
+
+ASSET_DELAY = 0.05
+ITEMS_PER_BATCH = 50
+
+ITEM_TEMPLATE = (
+    '<li><img src="/img/{n}.jpg" width="67" height="98">'
+    '<a class="ipc-title-link-wrapper" href="/title/tt{n:07d}/"><h3>{n}. Movie {n}</h3></a></li>'
+)
+
+SEARCH_PAGE = """<!DOCTYPE html>
+<html><head>
+<link rel="stylesheet" href="/static/site.css">
+<link rel="preload" as="font" href="/static/font.woff2" crossorigin>
+</head><body>
+<ul class="ipc-metadata-list">{items}</ul>
+<button class="ipc-see-more__button"><span class="ipc-see-more__text">50 more</span></button>
+<script>
+let next = {batch};
+document.querySelector('.ipc-see-more__text').addEventListener('click', () => {{
+    fetch('/more?start=' + next).then(r => r.text()).then(html => {{
+        document.querySelector('ul.ipc-metadata-list').insertAdjacentHTML('beforeend', html);
+        next += {batch};
+    }});
+}});
+</script>
+</body></html>"""
+
+
+def render_items(start):
+    return ''.join(ITEM_TEMPLATE.format(n=n) for n in range(start, start + ITEMS_PER_BATCH))
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.startswith('/search'):
+            body = SEARCH_PAGE.format(items=render_items(0), batch=ITEMS_PER_BATCH).encode()
+            content_type = 'text/html'
+        elif self.path.startswith('/more'):
+            body = render_items(int(self.path.split('=')[1])).encode()
+            content_type = 'text/html'
+        else:
+            # Images, fonts and stylesheets: slow and heavy like a CDN asset
+            time.sleep(ASSET_DELAY)
+            body = b'\0' * 64 * 1024
+            content_type = 'application/octet-stream'
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+async def discover(url, limit, pool):
+    scraper = IMDBScraper('genre', 'bench', limit, status=None, browser_pool=pool)
+    found = 0
+    async for batch in scraper.iter_movie_links(url):
+        found += len(batch)
+    return found
+
+
+async def bench_fresh_browser(url, jobs, limit):
+    started = time.perf_counter()
+    for _ in range(jobs):
+        pool = BrowserPool(size=1, block_resources=False)
+        try:
+            await discover(url, limit, pool)
+        finally:
+            await pool.close()
+    return time.perf_counter() - started
+
+
+async def bench_pooled_browser(url, jobs, limit):
+    pool = BrowserPool(size=1, block_resources=True)
+    try:
+        await pool.start()
+        started = time.perf_counter()
+        for _ in range(jobs):
+            await discover(url, limit, pool)
+        return time.perf_counter() - started
+    finally:
+        await pool.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--jobs', type=int, default=5)
+    parser.add_argument('--limit', type=int, default=200)
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StandInHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f'http://127.0.0.1:{server.server_port}/search'
+
+    try:
+        for name, bench in (('fresh browser, no blocking', bench_fresh_browser),
+                            ('pooled browser, blocking', bench_pooled_browser)):
+            elapsed = asyncio.run(bench(url, args.jobs, args.limit))
+            print(f"{name:<28} {args.jobs} jobs x {args.limit} links: "
+                  f"{elapsed:.2f}s total, {elapsed / args.jobs:.2f}s per job")
+    finally:
+        server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
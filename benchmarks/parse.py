@@ -0,0 +1,73 @@
+"""
+Benchmarks title-page parsing over a saved corpus of IMDb title pages,
+reporting pages/sec and peak traced memory for every parser backend, with
+and without hero-only parsing, plus the embedded-JSON fast path.
+
+    python benchmarks/parse.py path/to/corpus --repeat 3
+
+The corpus is a directory of saved title pages (*.html), e.g. collected with
+`curl -A Mozilla/5.0 -o tt1375666.html https://www.imdb.com/title/tt1375666/`.
+"""
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'imdb_scrapper.settings')
+
+import django  # noqa: E402
+
+django.setup()
+
+from scraper.extract import extract_structured_fields, parse_dom_fields  # noqa: E402
+from scraper.parsers import available_backends, make_soup  # noqa: E402
+
+
+def measure(pages, parse, repeat):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        results = [parse(html) for html in pages]
+    elapsed = time.perf_counter() - started
+
+    # Memory is traced in a separate pass so tracing overhead does not skew timings
+    tracemalloc.start()
+    for html in pages:
+        parse(html)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return len(pages) * repeat / elapsed, peak, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('corpus', type=Path)
+    parser.add_argument('--repeat', type=int, default=1)
+    args = parser.parse_args()
+
+    pages = [path.read_text(encoding='utf-8') for path in sorted(args.corpus.glob('*.html'))]
+    if not pages:
+        parser.error(f"No *.html pages found in {args.corpus}")
+
+    variants = [('embedded JSON', extract_structured_fields)]
+    for backend in available_backends():
+        for hero_only in (False, True):
+            name = f"{backend}{' hero-only' if hero_only else ''}"
+            variants.append((name, lambda html, b=backend, h=hero_only: parse_dom_fields(make_soup(html, b, h))))
+
+    reference = None
+    print(f"{len(pages)} pages x {args.repeat}")
+    for name, parse in variants:
+        pages_per_sec, peak, results = measure(pages, parse, args.repeat)
+        if name != 'embedded JSON':
+            if reference is None:
+                reference = results
+            elif results != reference:
+                print(f"  ! {name} output differs from {variants[1][0]}")
+        print(f"{name:<24} {pages_per_sec:>9.1f} pages/sec  peak {peak / 1024 / 1024:>7.2f} MiB")
+
+
+if __name__ == '__main__':
+    main()
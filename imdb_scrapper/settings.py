@@ -129,3 +129,38 @@ STATIC_URL = 'static/'
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 TEST_RUNNER = 'django.test.runner.DiscoverRunner'
+
+# Scraper
+# Headless Chromium contexts kept open per worker process for list discovery,
+# and whether images, fonts, stylesheets and trackers are blocked on those pages.
+SCRAPER_BROWSER_POOL_SIZE = 2
+SCRAPER_BLOCK_RESOURCES = True
+
+# BeautifulSoup backend for title-page DOM fallbacks ('lxml' when installed,
+# otherwise 'html.parser'), and whether only the hero section is parsed.
+SCRAPER_HTML_PARSER = None
+SCRAPER_PARSE_HERO_ONLY = True
+
+# Movies API
+# Responses and page counts are cached until movies are next written (or these
+# many seconds pass; 0 disables). Writers bump a version counter in the default
+# cache, so the scraper workers and the API must share a cache backend for the
+# API to see new scrapes. The default per-process LocMemCache does not, which
+# is why whole responses (served with a 304 for as long as the version holds)
+# are only cached once CACHES points at Redis or Memcached, e.g.:
+#
+# CACHES = {
+#     'default': {
+#         'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+#         'LOCATION': 'redis://127.0.0.1:6379',
+#     }
+# }
+# SCRAPER_API_CACHE_SECONDS = 300
+#
+# Counts are only ever this many seconds stale, so they are cached either way.
+SCRAPER_API_CACHE_SECONDS = 0
+SCRAPER_API_COUNT_CACHE_SECONDS = 60
+
+# Build list responses from .values() rows instead of Movie instances and the
+# serializer (same bytes, less CPU); JSON is encoded with orjson when installed.
+SCRAPER_API_FAST_PATH = True
@@ -1,7 +1,7 @@
 from django.contrib import admin
-from .models import Movie, ScraperStatus
-from django.core.management import call_command
-import threading
+from django.db.models import Prefetch
+from .models import Credit, Movie, ScraperStatus
+from .jobs import enqueue_job
 from django.utils.html import format_html
 from django_admin_listfilter_dropdown.filters import DropdownFilter
 
@@ -15,48 +15,42 @@ class MovieAdmin(admin.ModelAdmin):
     ordering = ('-year', '-rating')
     list_per_page = 25
 
-    def short_directors(self, obj):
-        if obj.directors:
-            return ", ".join(obj.directors.split(",")[:2]) + ("..." if obj.directors.count(",") > 1 else "")
+    def get_queryset(self, request):
+        credits = Credit.objects.select_related('person').order_by('order')
+        return super().get_queryset(request).prefetch_related(Prefetch('credits', queryset=credits))
+
+    def short_credits(self, obj, role):
+        names = [credit.person.name for credit in obj.credits.all() if credit.role == role]
+        if names:
+            return ", ".join(names[:2]) + ("..." if len(names) > 2 else "")
         return "-"
+
+    def short_directors(self, obj):
+        return self.short_credits(obj, Credit.DIRECTOR)
     short_directors.short_description = "Directors"
 
     def short_cast(self, obj):
-        if obj.cast:
-            return ", ".join(obj.cast.split(",")[:2]) + ("..." if obj.cast.count(",") > 1 else "")
-        return "-"
+        return self.short_credits(obj, Credit.CAST)
     short_cast.short_description = "Cast"
 
 
 @admin.register(ScraperStatus)
 class ScraperStatusAdmin(admin.ModelAdmin):
-    list_display = ('job_id', 'status', 'scraped_movies', 'error_message', 'run_now_link')
-    readonly_fields = ('job_id', 'started_at', 'updated_at', 'scraped_movies', 'status', 'error_message')
+    list_display = ('job_id', 'mode', 'status', 'scraped_movies', 'error_message', 'run_now_link')
+    readonly_fields = ('job_id', 'started_at', 'updated_at', 'total_movies', 'scraped_movies', 'status', 'error_message', 'stats',
+                       'lease_owner', 'heartbeat_at', 'attempts')
 
-    fields = ('job_id', 'search_type', 'search_value', 'limit', 'status', 'scraped_movies', 'error_message', 'started_at', 'updated_at')
+    fields = ('job_id', 'search_type', 'search_value', 'queries', 'limit', 'mode', 'status', 'total_movies', 'scraped_movies', 'error_message', 'stats',
+              'lease_owner', 'heartbeat_at', 'attempts', 'started_at', 'updated_at')
 
     def get_queryset(self, request):
         return super().get_queryset(request).order_by('-started_at')
 
     def save_model(self, request, obj, form, change):
+        # Saving queues the job; a `manage.py scraper_worker` process claims and runs it
+        enqueue_job(obj)
         super().save_model(request, obj, form, change)
 
-        def run_scraper():
-            try:
-                call_command(
-                    'scraper',
-                    type=obj.search_type,
-                    value=obj.search_value,
-                    limit=obj.limit,
-                    job_id=str(obj.job_id)
-                )
-            except Exception as e:
-                obj.status = 'error'
-                obj.error_message = str(e)
-                obj.save(update_fields=["status", "error_message"])
-
-        threading.Thread(target=run_scraper).start()
-
     def run_now_link(self, obj):
         return format_html('<a class="button" href="/admin/scraper/scraperstatus/{}/change/">View</a>', obj.pk)
     run_now_link.short_description = 'Manage'
@@ -1,6 +1,15 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_delete, post_save
 
 
 class ScraperConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'scraper'
+
+    def ready(self):
+        from scraper.catalog import movie_changed
+        from scraper.credits import movie_saved
+
+        post_save.connect(movie_changed, sender='scraper.Movie', dispatch_uid='movie-catalog-save')
+        post_delete.connect(movie_changed, sender='scraper.Movie', dispatch_uid='movie-catalog-delete')
+        post_save.connect(movie_saved, sender='scraper.Movie', dispatch_uid='movie-credits-save')
@@ -0,0 +1,94 @@
+import gzip
+import os
+import socket
+import threading
+import time
+from pathlib import Path
+
+from scraper.extract import parse_movie_page
+
+DEFAULT_SEGMENT_BYTES = 256 * 1024 ** 2
+
+
+class ArchivedPage:
+    def __init__(self, imdb_id, url, segment, offset, length, fetched_at):
+        self.imdb_id = imdb_id
+        self.url = url
+        self.segment = segment
+        self.offset = offset
+        self.length = length
+        self.fetched_at = fetched_at
+
+    def read(self):
+        with open(self.segment, 'rb') as f:
+            f.seek(self.offset)
+            return gzip.decompress(f.read(self.length))
+
+
+class PageArchive:
+    """
+    Append-only archive of fetched title pages. Pages go into segment files
+    as one gzip member each; a tab-separated index next to every segment maps
+    IMDb id, URL, offset, length and fetch time. Each process appends to its
+    own segments, so several workers can share one archive directory, and an
+    index line is only written once its page is on disk. When a title was
+    archived more than once, the latest copy wins.
+    """
+
+    def __init__(self, archive_dir, segment_bytes=DEFAULT_SEGMENT_BYTES):
+        self.archive_dir = Path(archive_dir)
+        self.archive_dir.mkdir(parents=True, exist_ok=True)
+        self.segment_bytes = segment_bytes
+        self.lock = threading.Lock()
+        self.segment = None
+        self.data_file = None
+        self.index_file = None
+
+    def open_segment(self):
+        self.close()
+        name = f"{time.strftime('%Y%m%d%H%M%S')}-{socket.gethostname()}-{os.getpid()}-{time.monotonic_ns()}"
+        self.segment = self.archive_dir / f'{name}.pages'
+        self.data_file = open(self.segment, 'ab')
+        self.index_file = open(self.segment.with_suffix('.idx'), 'a', encoding='utf-8')
+
+    def append(self, imdb_id, url, html):
+        if isinstance(html, str):
+            html = html.encode()
+        frame = gzip.compress(html)
+        with self.lock:
+            if self.data_file is None or self.data_file.tell() >= self.segment_bytes:
+                self.open_segment()
+            offset = self.data_file.tell()
+            self.data_file.write(frame)
+            self.data_file.flush()
+            self.index_file.write(f"{imdb_id}\t{offset}\t{len(frame)}\t{time.time():.3f}\t{url}\n")
+            self.index_file.flush()
+
+    def close(self):
+        for f in (self.data_file, self.index_file):
+            if f is not None:
+                f.close()
+        self.data_file = self.index_file = None
+
+    def latest_pages(self, imdb_ids=None):
+        """The newest archived copy of every title (or of `imdb_ids`), ordered by IMDb id."""
+        latest = {}
+        for index in sorted(self.archive_dir.glob('*.idx')):
+            segment = index.with_suffix('.pages')
+            with open(index, encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        imdb_id, offset, length, fetched_at, url = line.rstrip('\n').split('\t', 4)
+                        page = ArchivedPage(imdb_id, url, segment, int(offset), int(length), float(fetched_at))
+                    except ValueError:
+                        continue  # a line cut short by a crash
+                    if imdb_ids is not None and imdb_id not in imdb_ids:
+                        continue
+                    if imdb_id not in latest or page.fetched_at >= latest[imdb_id].fetched_at:
+                        latest[imdb_id] = page
+        return [latest[imdb_id] for imdb_id in sorted(latest)]
+
+
+def parse_archived_page(page, backend=None, hero_only=None):
+    """Reads and parses one archived page; runs in the reparse process pool."""
+    return parse_movie_page(page.read(), page.url, backend, hero_only)
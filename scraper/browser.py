@@ -0,0 +1,149 @@
+import asyncio
+import logging
+import weakref
+from contextlib import asynccontextmanager
+
+from django.conf import settings
+from playwright.async_api import Error as PlaywrightError, async_playwright
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_POOL_SIZE = 2
+BLOCKED_RESOURCE_TYPES = ('image', 'media', 'font', 'stylesheet', 'websocket', 'manifest')
+BLOCKED_URL_PARTS = (
+    'amazon-adsystem.com',
+    'doubleclick.net',
+    'google-analytics.com',
+    'googletagmanager.com',
+    'scorecardresearch.com',
+)
+
+_pools = weakref.WeakKeyDictionary()
+
+
+class BrowserPool:
+    """
+    One headless Chromium shared by every job running on an event loop.
+    Browser contexts are created lazily up to `size` and handed back to the
+    pool after each use, so jobs skip the browser launch entirely. A context
+    that breaks is closed and its slot freed, and a browser that disconnected
+    (e.g. Chromium crashed) is relaunched by the next acquire.
+    """
+
+    def __init__(self, size=DEFAULT_POOL_SIZE, block_resources=True, headers=None):
+        self.size = size
+        self.block_resources = block_resources
+        self.headers = headers or {}
+        self.playwright = None
+        self.browser = None
+        # Idle contexts; `slots` counts the ones idle or in use against `size`
+        self.contexts = asyncio.Queue()
+        self.slots = asyncio.Semaphore(size)
+        self.lock = asyncio.Lock()
+
+    async def start(self):
+        async with self.lock:
+            if self.browser is not None and not self.browser.is_connected():
+                logger.warning("Pooled Chromium browser disconnected, relaunching it")
+                # The idle contexts went down with it
+                while not self.contexts.empty():
+                    self.contexts.get_nowait()
+                self.browser = None
+            if self.playwright is None:
+                self.playwright = await async_playwright().start()
+            if self.browser is None:
+                self.browser = await self.playwright.chromium.launch(headless=True)
+                logger.info("Launched pooled Chromium browser")
+
+    async def close(self):
+        async with self.lock:
+            while not self.contexts.empty():
+                await self.close_context(self.contexts.get_nowait())
+            if self.browser is not None:
+                await self.browser.close()
+                self.browser = None
+            if self.playwright is not None:
+                await self.playwright.stop()
+                self.playwright = None
+
+    @asynccontextmanager
+    async def page(self):
+        context = await self.acquire_context()
+        try:
+            page = await context.new_page()
+        except BaseException:
+            await self.discard_context(context)
+            raise
+        try:
+            yield page
+        finally:
+            try:
+                await page.close()
+            except BaseException:
+                await self.discard_context(context)
+                raise
+            self.release_context(context)
+
+    async def acquire_context(self):
+        await self.slots.acquire()
+        context = None
+        try:
+            await self.start()
+            if not self.contexts.empty():
+                return self.contexts.get_nowait()
+            context = await self.browser.new_context(extra_http_headers=self.headers)
+            if self.block_resources:
+                await context.route('**/*', self.filter_request)
+            return context
+        except BaseException:
+            # Without its slot back, `size` failures would leave every later acquire waiting forever
+            self.slots.release()
+            if context is not None:
+                await self.close_context(context)
+            raise
+
+    def release_context(self, context):
+        self.contexts.put_nowait(context)
+        self.slots.release()
+
+    async def discard_context(self, context):
+        self.slots.release()
+        await self.close_context(context)
+
+    @staticmethod
+    async def close_context(context):
+        try:
+            await context.close()
+        except PlaywrightError:
+            # Already gone with its browser
+            pass
+
+    async def filter_request(self, route):
+        request = route.request
+        if request.resource_type in BLOCKED_RESOURCE_TYPES or any(part in request.url for part in BLOCKED_URL_PARTS):
+            await route.abort()
+        else:
+            await route.continue_()
+
+
+def get_browser_pool(headers=None):
+    """
+    Returns the browser pool of the running event loop, creating it from the
+    SCRAPER_BROWSER_POOL_SIZE and SCRAPER_BLOCK_RESOURCES settings.
+    """
+    loop = asyncio.get_running_loop()
+    pool = _pools.get(loop)
+    if pool is None:
+        pool = BrowserPool(
+            size=getattr(settings, 'SCRAPER_BROWSER_POOL_SIZE', DEFAULT_POOL_SIZE),
+            block_resources=getattr(settings, 'SCRAPER_BLOCK_RESOURCES', True),
+            headers=headers,
+        )
+        _pools[loop] = pool
+    return pool
+
+
+async def close_browser_pool():
+    pool = _pools.pop(asyncio.get_running_loop(), None)
+    if pool is not None:
+        await pool.close()
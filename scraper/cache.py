@@ -0,0 +1,121 @@
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import Counter, OrderedDict
+from pathlib import Path
+
+DEFAULT_MAX_BYTES = 1024 ** 3
+DEFAULT_TTL = 12 * 60 * 60
+
+
+class CacheEntry:
+    def __init__(self, meta, body, ttl):
+        self.url = meta['url']
+        self.etag = meta.get('etag')
+        self.last_modified = meta.get('last_modified')
+        self.fetched_at = meta['fetched_at']
+        self.body = body
+        self.fresh = time.time() - self.fetched_at < ttl
+
+    def conditional_headers(self):
+        headers = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+
+class ResponseCache:
+    """
+    Size-bounded on-disk cache of response bodies keyed by a hash of the URL.
+    Each entry is a single file: one JSON line with the URL, ETag,
+    Last-Modified and fetch time, followed by the gzip-compressed body.
+    Least recently used entries are evicted once `max_bytes` is exceeded.
+    """
+
+    def __init__(self, cache_dir, max_bytes=DEFAULT_MAX_BYTES, ttl=DEFAULT_TTL):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.stats = Counter()
+        self.lock = threading.Lock()
+        self.entries = OrderedDict()
+        self.total_bytes = 0
+
+        files = sorted(self.cache_dir.glob('*/*.cache'), key=lambda path: path.stat().st_mtime)
+        for path in files:
+            size = path.stat().st_size
+            self.entries[path.stem] = size
+            self.total_bytes += size
+
+    def key(self, url):
+        return hashlib.sha256(url.encode()).hexdigest()
+
+    def path(self, key):
+        return self.cache_dir / key[:2] / f'{key}.cache'
+
+    def get(self, url):
+        key = self.key(url)
+        path = self.path(key)
+        try:
+            with open(path, 'rb') as f:
+                meta = json.loads(f.readline())
+                body = gzip.decompress(f.read())
+        except (OSError, ValueError, EOFError):
+            return None
+        if meta.get('url') != url:
+            return None
+
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        with self.lock:
+            if key in self.entries:
+                self.entries.move_to_end(key)
+        return CacheEntry(meta, body, self.ttl)
+
+    def put(self, url, body, etag=None, last_modified=None, compressed=None):
+        key = self.key(url)
+        path = self.path(key)
+        meta = {'url': url, 'etag': etag, 'last_modified': last_modified, 'fetched_at': time.time()}
+        data = json.dumps(meta).encode() + b'\n' + (compressed or gzip.compress(body))
+
+        path.parent.mkdir(exist_ok=True)
+        tmp_path = path.with_suffix(f'.{os.getpid()}.{threading.get_ident()}.tmp')
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, path)
+
+        with self.lock:
+            self.total_bytes += len(data) - self.entries.pop(key, 0)
+            self.entries[key] = len(data)
+            return self.evict()
+
+    def touch(self, entry):
+        """Marks a revalidated entry as fresh again without recompressing it."""
+        try:
+            with open(self.path(self.key(entry.url)), 'rb') as f:
+                f.readline()
+                compressed = f.read()
+        except OSError:
+            compressed = None
+        return self.put(entry.url, entry.body, entry.etag, entry.last_modified, compressed=compressed)
+
+    def evict(self):
+        """Drops least recently used entries until the cache fits; returns how many went."""
+        evicted = 0
+        while self.total_bytes > self.max_bytes and len(self.entries) > 1:
+            key, size = self.entries.popitem(last=False)
+            self.total_bytes -= size
+            self.stats['evictions'] += 1
+            evicted += 1
+            try:
+                self.path(key).unlink()
+            except FileNotFoundError:
+                pass
+        return evicted
@@ -0,0 +1,98 @@
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+CATALOG_VERSION_KEY = 'movie-catalog-version'
+STATS_KEY = 'movie-api-cache:{}'
+STAT_NAMES = ('hits', 'misses', 'not_modified')
+RESPONSE_CACHE_SECONDS = 0
+
+
+def catalog_version():
+    """
+    Counter bumped whenever movies are written. Cached API responses and
+    counts are keyed on it, so a write invalidates them all at once. A
+    missing counter (evicted, or a fresh cache) restarts from the clock so
+    it never returns to a value an older entry was stored under. It is
+    stored without a timeout, unlike the entries keyed on it.
+    """
+    version = cache.get(CATALOG_VERSION_KEY)
+    if version is None:
+        cache.add(CATALOG_VERSION_KEY, time.time_ns(), timeout=None)
+        version = cache.get(CATALOG_VERSION_KEY, 0)
+    return version
+
+
+def bump_catalog_version(**kwargs):
+    try:
+        cache.incr(CATALOG_VERSION_KEY)
+    except ValueError:
+        cache.add(CATALOG_VERSION_KEY, time.time_ns(), timeout=None)
+
+
+def movie_changed(sender, **kwargs):
+    """post_save/post_delete receiver for single-movie edits, e.g. from the admin."""
+    transaction.on_commit(bump_catalog_version)
+
+
+def normalized_query(params):
+    """Query parameters as a canonical string: sorted by name, blank values dropped."""
+    return '&'.join(
+        f'{name}={value}'
+        for name in sorted(params)
+        for value in params.getlist(name)
+        if value != ''
+    )
+
+
+def count_stat(name):
+    try:
+        cache.incr(STATS_KEY.format(name))
+    except ValueError:
+        cache.add(STATS_KEY.format(name), 1, timeout=None)
+
+
+def response_cache_stats():
+    stats = {name: cache.get(STATS_KEY.format(name), 0) for name in STAT_NAMES}
+    served = sum(stats.values())
+    stats['hit_ratio'] = round((stats['hits'] + stats['not_modified']) / served, 3) if served else 0.0
+    return stats
+
+
+def reset_response_cache_stats():
+    cache.delete_many([STATS_KEY.format(name) for name in STAT_NAMES])
+
+
+class CachedResponse:
+    """
+    Cache entry for one API request: `key` covers the catalog version, the
+    normalized query string, the host (links in the payload are absolute)
+    and the negotiated format, and `etag` is a strong validator derived
+    from it, so it can be checked before anything is queried.
+    """
+
+    def __init__(self, request, prefix):
+        key = '|'.join([
+            prefix,
+            str(catalog_version()),
+            request.get_host(),
+            request.accepted_renderer.format,
+            normalized_query(request.query_params),
+        ])
+        digest = hashlib.sha256(key.encode()).hexdigest()
+        self.key = f'{prefix}:{digest}'
+        self.etag = f'"{digest[:32]}"'
+        self.timeout = getattr(settings, 'SCRAPER_API_CACHE_SECONDS', RESPONSE_CACHE_SECONDS)
+
+    def not_modified(self, request):
+        if_none_match = request.headers.get('If-None-Match', '')
+        return self.etag in [tag.strip() for tag in if_none_match.split(',')] or if_none_match.strip() == '*'
+
+    def get(self):
+        return cache.get(self.key)
+
+    def set(self, data):
+        cache.set(self.key, data, self.timeout)
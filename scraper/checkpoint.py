@@ -0,0 +1,45 @@
+from scraper.extract import title_url
+from scraper.models import ScrapeJobItem, ScraperStatus
+
+
+class JobCheckpoint:
+    """
+    Progress of a scrape job kept in ScrapeJobItem rows: every discovered
+    IMDb id and whether it was scraped or failed. Lets a re-run of the job skip
+    discovery once it has completed, and skip titles that are already done.
+    """
+
+    def __init__(self, job):
+        self.job = job
+        self.done = set()
+
+    def load(self):
+        self.done = set(self.job.items.filter(state='done').values_list('imdb_id', flat=True))
+        return self.done
+
+    def remaining_links(self):
+        imdb_ids = self.job.items.exclude(state='done').order_by('pk').values_list('imdb_id', flat=True)
+        return [title_url(imdb_id) for imdb_id in imdb_ids]
+
+    def record_discovered(self, imdb_ids):
+        ScrapeJobItem.objects.bulk_create(
+            [ScrapeJobItem(job=self.job, imdb_id=imdb_id) for imdb_id in imdb_ids],
+            ignore_conflicts=True,
+        )
+
+    def mark_discovery_complete(self):
+        self.job.discovery_complete = True
+        ScraperStatus.objects.filter(pk=self.job.pk).update(discovery_complete=True)
+
+    def mark(self, done_ids=(), failed_ids=()):
+        """Called inside the writer's transaction, so items flip to done together with their movie rows."""
+        if done_ids:
+            self.job.items.filter(imdb_id__in=done_ids).update(state='done')
+            self.done.update(done_ids)
+        if failed_ids:
+            self.job.items.filter(imdb_id__in=failed_ids).update(state='failed')
+
+    def reset(self):
+        self.job.items.all().delete()
+        self.job.discovery_complete = False
+        self.done = set()
@@ -0,0 +1,43 @@
+from scraper.models import Credit, Person
+
+# Movie fields that are mirrored into Credit rows, and the role they become
+CREDIT_FIELDS = {'directors': Credit.DIRECTOR, 'cast': Credit.CAST}
+NAME_LENGTH = Person._meta.get_field('name').max_length
+
+
+def split_names(value):
+    """Names from a comma-joined directors/cast field, in billing order without repeats."""
+    if not value:
+        return []
+    return list(dict.fromkeys(name.strip()[:NAME_LENGTH] for name in value.split(',') if name.strip()))
+
+
+def sync_credits(movies, fields=CREDIT_FIELDS):
+    """
+    Replaces the credits of saved `movies` for the credit fields among
+    `fields`, so a write that leaves directors/cast alone leaves their
+    credits alone too. People are created in bulk and never deleted.
+    """
+    roles = {field: role for field, role in CREDIT_FIELDS.items() if field in fields}
+    if not roles or not movies:
+        return
+    credits = [
+        (movie.pk, role, name, order)
+        for movie in movies
+        for field, role in roles.items()
+        for order, name in enumerate(split_names(getattr(movie, field)))
+    ]
+    names = {name for _, _, name, _ in credits}
+    Person.objects.bulk_create([Person(name=name) for name in names], ignore_conflicts=True)
+    person_ids = dict(Person.objects.filter(name__in=names).values_list('name', 'id'))
+
+    Credit.objects.filter(movie__in=[movie.pk for movie in movies], role__in=roles.values()).delete()
+    Credit.objects.bulk_create([
+        Credit(movie_id=movie_id, person_id=person_ids[name], role=role, order=order)
+        for movie_id, role, name, order in credits
+    ])
+
+
+def movie_saved(sender, instance, update_fields=None, **kwargs):
+    """post_save receiver keeping credits in step with single-movie saves, e.g. from the admin."""
+    sync_credits([instance], CREDIT_FIELDS if update_fields is None else update_fields)
@@ -0,0 +1,128 @@
+import asyncio
+import logging
+import weakref
+from datetime import timedelta
+
+from asgiref.sync import sync_to_async
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from scraper.jobs import worker_name
+from scraper.models import Movie, TitleLease
+
+logger = logging.getLogger(__name__)
+
+FRESHNESS_WINDOW = 6 * 60 * 60
+TITLE_LEASE_SECONDS = 120
+LEASE_POLL_INTERVAL = 0.5
+
+_flights = weakref.WeakKeyDictionary()
+
+
+def fresh_imdb_ids(imdb_ids, window):
+    """IMDb ids whose title page was scraped within the last `window` seconds."""
+    if not window or not imdb_ids:
+        return set()
+    cutoff = timezone.now() - timedelta(seconds=window)
+    return set(Movie.objects.filter(imdb_id__in=imdb_ids, last_scraped__gte=cutoff).values_list('imdb_id', flat=True))
+
+
+def scraped_since(imdb_id, since):
+    return Movie.objects.filter(imdb_id=imdb_id, last_scraped__gte=since).exists()
+
+
+def acquire_title_lease(imdb_id, owner, lease_seconds=TITLE_LEASE_SECONDS):
+    """
+    Takes the cross-worker lease on a title. Fails while another worker
+    holds an unexpired lease; our own leases can always be taken again.
+    """
+    now = timezone.now()
+    expires_at = now + timedelta(seconds=lease_seconds)
+    try:
+        with transaction.atomic():
+            TitleLease.objects.create(imdb_id=imdb_id, owner=owner, expires_at=expires_at)
+        return True
+    except IntegrityError:
+        return bool(TitleLease.objects.filter(
+            Q(expires_at__lt=now) | Q(owner=owner), imdb_id=imdb_id
+        ).update(owner=owner, expires_at=expires_at))
+
+
+def release_title_leases(imdb_ids, owner):
+    if imdb_ids:
+        TitleLease.objects.filter(imdb_id__in=imdb_ids, owner=owner).delete()
+
+
+class TitleFlights:
+    """
+    Single-flight registry for title pages. Within the process, callers
+    asking for a title that is already being scraped await the same result.
+    Across workers, a TitleLease row is held from the fetch until the movie
+    is written (MovieWriter releases it in the same transaction); a worker
+    finding the title leased waits for it and then uses the stored row.
+    """
+
+    def __init__(self, owner=None, lease_seconds=TITLE_LEASE_SECONDS):
+        self.owner = owner or worker_name()
+        self.lease_seconds = lease_seconds
+        self.flights = {}
+
+    async def run(self, imdb_id, scrape, stats):
+        """
+        Returns what `scrape()` returned for this title, or None when another
+        worker scraped it while we waited for its lease.
+        """
+        while True:
+            flight = self.flights.get(imdb_id)
+            if flight is None:
+                break
+            stats['joined'] += 1
+            try:
+                return await asyncio.shield(flight)
+            except asyncio.CancelledError:
+                if not flight.cancelled():
+                    raise
+                # The job that owned the flight was cancelled; take over
+
+        flight = asyncio.get_running_loop().create_future()
+        self.flights[imdb_id] = flight
+        try:
+            if not await self.claim(imdb_id, stats):
+                flight.set_result(None)
+                return None
+            try:
+                result = await scrape()
+            except BaseException:
+                await sync_to_async(release_title_leases)([imdb_id], self.owner)
+                raise
+            flight.set_result(result)
+            return result
+        finally:
+            if not flight.done():
+                flight.cancel()
+            del self.flights[imdb_id]
+
+    async def claim(self, imdb_id, stats):
+        started = timezone.now()
+        waited = False
+        while not await sync_to_async(acquire_title_lease)(imdb_id, self.owner, self.lease_seconds):
+            if not waited:
+                stats['lease_waits'] += 1
+                waited = True
+            await asyncio.sleep(LEASE_POLL_INTERVAL)
+
+        if waited and await sync_to_async(scraped_since)(imdb_id, started):
+            await sync_to_async(release_title_leases)([imdb_id], self.owner)
+            stats['remote'] += 1
+            return False
+        return True
+
+
+def get_title_flights():
+    """Jobs sharing an event loop (e.g. one scraper_worker) share one registry."""
+    loop = asyncio.get_running_loop()
+    flights = _flights.get(loop)
+    if flights is None:
+        flights = _flights[loop] = TitleFlights()
+    return flights
@@ -0,0 +1,66 @@
+import csv
+import json
+import zlib
+from datetime import datetime
+from decimal import Decimal
+
+EXPORT_FIELDS = ['id', 'imdb_id', 'title', 'year', 'rating', 'directors', 'cast', 'plot', 'updated']
+EXPORT_FORMATS = {'ndjson': 'application/x-ndjson', 'csv': 'text/csv'}
+CHUNK_SIZE = 2000
+FLUSH_BYTES = 64 * 1024
+
+
+def export_value(value):
+    # Same text as the list API: decimals as strings, datetimes in ISO 8601
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+class Echo:
+    """File-like object for csv.writer that hands each row back instead of storing it."""
+
+    def write(self, value):
+        return value
+
+
+def ndjson_lines(rows):
+    for row in rows:
+        yield json.dumps(dict(zip(EXPORT_FIELDS, map(export_value, row))), ensure_ascii=False) + '\n'
+
+
+def csv_lines(rows):
+    writer = csv.writer(Echo())
+    yield writer.writerow(EXPORT_FIELDS)
+    for row in rows:
+        yield writer.writerow([export_value(value) for value in row])
+
+
+def export_chunks(queryset, file_format='ndjson', compress=False, chunk_size=CHUNK_SIZE):
+    """
+    Streams `queryset` as NDJSON or CSV bytes, optionally gzipped. Rows come
+    from a database iterator `chunk_size` at a time and leave in ~64KB
+    pieces, so memory use does not grow with the size of the export.
+    """
+    rows = queryset.values_list(*EXPORT_FIELDS).iterator(chunk_size=chunk_size)
+    lines = csv_lines(rows) if file_format == 'csv' else ndjson_lines(rows)
+    # wbits=31 writes a gzip header and trailer around the deflate stream
+    compressor = zlib.compressobj(wbits=31) if compress else None
+
+    buffer, size = [], 0
+    for line in lines:
+        buffer.append(line)
+        size += len(line)
+        if size >= FLUSH_BYTES:
+            data = ''.join(buffer).encode()
+            buffer, size = [], 0
+            data = compressor.compress(data) if compressor else data
+            if data:
+                yield data
+    data = ''.join(buffer).encode()
+    if compressor:
+        data = compressor.compress(data) + compressor.flush()
+    if data:
+        yield data
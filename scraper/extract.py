@@ -0,0 +1,225 @@
+import hashlib
+import html as html_lib
+import json
+import re
+
+from scraper.parsers import make_soup
+
+MOVIE_FIELDS = ('title', 'year', 'rating', 'directors', 'cast', 'plot')
+
+NEXT_DATA_RE = re.compile(r'<script[^>]*\bid="__NEXT_DATA__"[^>]*>')
+LD_JSON_RE = re.compile(r'<script[^>]*\btype="application/ld\+json"[^>]*>')
+IMDB_ID_RE = re.compile(r'/title/(tt\d+)')
+CARD_RANK_RE = re.compile(r'^\d+\.\s+')
+YEAR_RE = re.compile(r'\d{4}')
+
+
+def imdb_id_from_url(url):
+    match = IMDB_ID_RE.search(url)
+    return match.group(1) if match else None
+
+
+def title_url(imdb_id):
+    return f"https://www.imdb.com/title/{imdb_id}/"
+
+
+def fields_from_card(card):
+    """
+    Normalizes the raw text scraped from a search result card into movie
+    fields. Cards carry title, year, rating and usually the plot, but never
+    directors or cast, which are left as None.
+    """
+    title = CARD_RANK_RE.sub('', card.get('title') or '').strip()
+    year = YEAR_RE.search(card.get('year') or '')
+    try:
+        rating = float(card.get('rating') or '')
+    except ValueError:
+        rating = None
+    url = card['url']
+    return {
+        'url': url,
+        'imdb_id': imdb_id_from_url(url),
+        'title': title or None,
+        'year': int(year.group()) if year else None,
+        'rating': rating,
+        'directors': None,
+        'cast': None,
+        'plot': (card.get('plot') or '').strip() or None,
+    }
+
+
+def content_hash(fields):
+    """Fingerprint of a movie's scraped fields, used to skip rewriting rows that did not change."""
+    values = [fields.get(field) for field in MOVIE_FIELDS]
+    return hashlib.sha256(json.dumps(values, default=str).encode()).hexdigest()
+
+
+def slice_json_script(html, opening_tag_re):
+    """
+    Parses the JSON body of the first <script> matching `opening_tag_re`
+    straight out of the page source, without building a DOM.
+    """
+    match = opening_tag_re.search(html)
+    if not match:
+        return None
+    end = html.find('</script>', match.end())
+    if end == -1:
+        return None
+    try:
+        return json.loads(html[match.end():end])
+    except ValueError:
+        return None
+
+
+def join_names(names):
+    names = [name for name in names if name]
+    return ", ".join(names) if names else None
+
+
+def dig(data, *keys):
+    for key in keys:
+        if not isinstance(data, dict):
+            return None
+        data = data.get(key)
+    return data
+
+
+def fields_from_next_data(next_data):
+    above_the_fold = dig(next_data, 'props', 'pageProps', 'aboveTheFoldData')
+    if not isinstance(above_the_fold, dict):
+        return {}
+
+    year = dig(above_the_fold, 'releaseYear', 'year')
+    rating = dig(above_the_fold, 'ratingsSummary', 'aggregateRating')
+    fields = {
+        'title': dig(above_the_fold, 'titleText', 'text'),
+        'year': str(year) if year else None,
+        'rating': str(rating) if rating else None,
+        'plot': dig(above_the_fold, 'plot', 'plotText', 'plainText'),
+    }
+
+    principal_credits = above_the_fold.get('principalCredits')
+    if isinstance(principal_credits, list):
+        credits = {}
+        for group in principal_credits:
+            category = dig(group, 'category', 'id') or (dig(group, 'category', 'text') or '').lower().rstrip('s')
+            names = [dig(credit, 'name', 'nameText', 'text') for credit in group.get('credits') or []]
+            credits[category] = join_names(names)
+        fields['directors'] = credits.get('director') or credits.get('creator')
+        fields['cast'] = credits.get('cast') or credits.get('star')
+    return fields
+
+
+def ld_names(people, person_only=False):
+    if isinstance(people, dict):
+        people = [people]
+    if not isinstance(people, list):
+        return None
+    return join_names([
+        html_lib.unescape(person.get('name') or '') for person in people
+        if isinstance(person, dict) and (not person_only or person.get('@type') == 'Person')
+    ])
+
+
+def fields_from_ld_json(ld_json):
+    if not isinstance(ld_json, dict) or ld_json.get('@type') not in ('Movie', 'TVSeries', 'TVMiniSeries', 'TVEpisode', 'TVMovie'):
+        return {}
+
+    date_published = ld_json.get('datePublished') or ''
+    rating = dig(ld_json, 'aggregateRating', 'ratingValue')
+    fields = {
+        'title': html_lib.unescape(ld_json['name']) if ld_json.get('name') else None,
+        'year': date_published[:4] if re.match(r'\d{4}', date_published) else None,
+        'rating': str(rating) if rating else None,
+        'plot': html_lib.unescape(ld_json['description']) if ld_json.get('description') else None,
+    }
+    if 'director' in ld_json or 'creator' in ld_json:
+        fields['directors'] = ld_names(ld_json.get('director')) or ld_names(ld_json.get('creator'), person_only=True)
+    if 'actor' in ld_json:
+        fields['cast'] = ld_names(ld_json['actor'])
+    return fields
+
+
+def extract_structured_fields(html):
+    """
+    Reads movie fields from the __NEXT_DATA__ and JSON-LD blobs embedded in a
+    title page. Only fields the blobs actually give a value for are returned,
+    so the caller can fall back to DOM parsing for the rest.
+    """
+    fields = {}
+    for found in (fields_from_ld_json(slice_json_script(html, LD_JSON_RE)),
+                  fields_from_next_data(slice_json_script(html, NEXT_DATA_RE))):
+        for key, value in found.items():
+            if value:
+                fields[key] = value
+    return fields
+
+
+def parse_dom_fields(soup):
+    title = soup.find('h1', {'data-testid': 'hero__pageTitle'})
+    title = title.get_text(strip=True) if title else None
+
+    year_element = soup.find('ul', {'class': 'ipc-inline-list ipc-inline-list--show-dividers'})
+    li_tags = year_element.find_all('li') if year_element else []
+    release_year = next((re.search(r'\d{4}', tag.text.strip()).group() for tag in li_tags if re.search(r'\d{4}', tag.text.strip())), None)
+
+    rating_el = soup.find('div', {'data-testid': 'hero-rating-bar__aggregate-rating__score'})
+    imdb_rating = rating_el.find('span').get_text(strip=True) if rating_el else None
+
+    director_el = soup.find('span', string=lambda s: s in ['Director', 'Directors'] if s else False)
+    directors = None
+    if director_el:
+        principal_li = director_el.find_parent('li')
+        if principal_li:
+            a_tags = principal_li.select('ul li a')
+            names = [a.get_text(strip=True) for a in a_tags]
+            directors = ", ".join(names) if names else None
+
+    plot_el = soup.find('span', {'data-testid': 'plot-xl'})
+    plot_summary = plot_el.get_text(strip=True) if plot_el else None
+
+    cast = get_credits_details(soup, 'Stars')
+    if not directors:
+        for i in ['Creator', 'Creators']:
+            directors = get_credits_details(soup, i)
+            if directors:
+                break
+
+    return {
+        'title': title,
+        'year': release_year,
+        'rating': imdb_rating,
+        'directors': directors,
+        'cast': cast,
+        'plot': plot_summary,
+    }
+
+
+def get_credits_details(soup, key):
+    credits_section = soup.find('a', {'aria-label': 'See full cast and crew'}, href=True, string=key)
+    credits_list = []
+    if credits_section:
+        credits_ul = credits_section.find_next('ul')
+        if credits_ul:
+            credits_list = [a.text for a in credits_ul.find_all('a')]
+    return ", ".join(credits_list) if credits_list else None
+
+
+def parse_movie_page(html, movie_url, backend=None, hero_only=None):
+    """
+    Extracts the movie fields of a title page, using the embedded JSON first
+    and the DOM only for missing fields. Runs in parse worker processes, so it
+    takes raw bytes and returns plain data: the movie dict and the list of
+    fields that needed the DOM fallback.
+    """
+    if isinstance(html, bytes):
+        html = html.decode('utf-8', errors='replace')
+    movie_data = extract_structured_fields(html)
+    missing = [field for field in MOVIE_FIELDS if movie_data.get(field) is None]
+    if missing:
+        dom_fields = parse_dom_fields(make_soup(html, backend, hero_only))
+        for field in missing:
+            movie_data[field] = dom_fields[field]
+    movie_data['url'] = movie_url
+    movie_data['imdb_id'] = imdb_id_from_url(movie_url)
+    return movie_data, missing
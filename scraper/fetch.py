@@ -0,0 +1,143 @@
+import asyncio
+import logging
+from collections import Counter
+
+import aiohttp
+
+from scraper.throttle import DEFAULT_RETRIES, ERROR, OK, THROTTLED, backoff_delay, retry_after_seconds
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CONCURRENCY = 50
+DEFAULT_PER_HOST = 50
+DEFAULT_TIMEOUT = 30
+KEEPALIVE_TIMEOUT = 60
+
+FETCH_ERRORS = (aiohttp.ClientError, asyncio.TimeoutError)
+THROTTLE_STATUSES = {429, 503}
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class AsyncFetcher:
+    """
+    Pooled aiohttp session used for every detail request of a job.
+    Connections are kept alive between requests and capped per host.
+    Throttled, timed out and 5xx requests are retried with jittered
+    backoff; with a `limiter`, each request holds one of its slots.
+    `on_download(url, body)` is awaited for every body that came off the
+    network, but not for cache hits or 304 revalidations.
+    """
+
+    def __init__(self, concurrency=DEFAULT_CONCURRENCY, per_host=DEFAULT_PER_HOST,
+                 timeout=DEFAULT_TIMEOUT, headers=None, cache=None, limiter=None, retries=DEFAULT_RETRIES,
+                 on_download=None):
+        self.concurrency = concurrency
+        self.per_host = per_host
+        self.timeout = timeout
+        self.headers = headers or {}
+        self.cache = cache
+        self.limiter = limiter
+        self.retries = retries
+        self.on_download = on_download
+        self.stats = Counter()
+        # Cache counters live on the fetcher: a worker shares one cache across jobs, each with its own fetcher
+        self.cache_stats = Counter()
+        self.session = None
+
+    async def __aenter__(self):
+        connector = aiohttp.TCPConnector(
+            limit=self.concurrency,
+            limit_per_host=self.per_host,
+            keepalive_timeout=KEEPALIVE_TIMEOUT,
+        )
+        self.session = aiohttp.ClientSession(
+            connector=connector,
+            headers=self.headers,
+            timeout=aiohttp.ClientTimeout(total=self.timeout),
+        )
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.session.close()
+        self.session = None
+
+    async def fetch(self, url):
+        cache = self.cache
+        entry = None
+        if cache:
+            entry = await asyncio.to_thread(cache.get, url)
+            if entry and entry.fresh:
+                self.cache_stats['hits'] += 1
+                self.cache_stats['bytes_saved'] += len(entry.body)
+                return entry.body
+
+        attempt = 0
+        while True:
+            try:
+                body, downloaded = await self.request(url, entry)
+                break
+            except FETCH_ERRORS as e:
+                status = getattr(e, 'status', None)
+                if attempt >= self.retries or (status is not None and status not in RETRY_STATUSES):
+                    if attempt:
+                        self.stats['gave_up'] += 1
+                    raise
+                retry_after = retry_after_seconds(e.headers.get('Retry-After')) if getattr(e, 'headers', None) else None
+                delay = backoff_delay(attempt, retry_after)
+                logger.debug(f"Retrying {url} in {delay:.2f}s after {e!r}")
+            attempt += 1
+            self.stats['retries'] += 1
+            await asyncio.sleep(delay)
+        # Outside request(), so archiving does not hold a limiter slot or count towards latency
+        if downloaded and self.on_download:
+            await self.on_download(url, body)
+        return body
+
+    async def request(self, url, entry=None):
+        started = await self.limiter.acquire() if self.limiter else None
+        outcome = None
+        try:
+            result = await self.get(url, entry)
+            outcome = OK
+            return result
+        except asyncio.TimeoutError:
+            outcome = THROTTLED
+            self.stats['timeouts'] += 1
+            raise
+        except aiohttp.ClientResponseError as e:
+            if e.status in THROTTLE_STATUSES:
+                outcome = THROTTLED
+                self.stats['throttled'] += 1
+            else:
+                # A 404 is a healthy answer; only server errors count against the error rate
+                outcome = ERROR if e.status >= 500 else OK
+            raise
+        except aiohttp.ClientError:
+            outcome = ERROR
+            raise
+        finally:
+            if self.limiter:
+                await self.limiter.release(started, outcome)
+
+    async def get(self, url, entry=None):
+        if not self.cache:
+            async with self.session.get(url) as response:
+                response.raise_for_status()
+                return await response.read(), True
+
+        cache = self.cache
+        headers = entry.conditional_headers() if entry else {}
+        async with self.session.get(url, headers=headers) as response:
+            if entry and response.status == 304:
+                self.cache_stats['revalidated'] += 1
+                self.cache_stats['bytes_saved'] += len(entry.body)
+                self.cache_stats['evictions'] += await asyncio.to_thread(cache.touch, entry)
+                return entry.body, False
+
+            response.raise_for_status()
+            body = await response.read()
+            self.cache_stats['misses'] += 1
+            self.cache_stats['evictions'] += await asyncio.to_thread(
+                cache.put, url, body, response.headers.get('ETag'), response.headers.get('Last-Modified')
+            )
+            return body, True
@@ -0,0 +1,118 @@
+from django.db import connections
+from django.db.models.expressions import RawSQL
+from django_filters import rest_framework as filters
+from rest_framework.filters import OrderingFilter, SearchFilter
+from rest_framework.settings import api_settings
+
+from scraper.models import Credit, Movie
+
+MOVIE_FTS_TABLE = 'scraper_movie_fts'
+TRIGRAM_LENGTH = 3
+
+_fts_available = {}
+
+
+def movie_fts_available(alias):
+    if alias not in _fts_available:
+        with connections[alias].cursor() as cursor:
+            cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = %s", [MOVIE_FTS_TABLE])
+            _fts_available[alias] = cursor.fetchone() is not None
+    return _fts_available[alias]
+
+
+def fts_phrase(term):
+    return '"' + term.replace('"', '""') + '"'
+
+
+class MovieOrderingFilter(OrderingFilter):
+    """
+    OrderingFilter that breaks ties on id in the direction of the leading
+    field, so pages are stable and `-rating` is one backward walk of the
+    (rating, id) index rather than an index scan plus a sort on id.
+    """
+
+    def get_ordering(self, request, queryset, view):
+        ordering = list(super().get_ordering(request, queryset, view) or [])
+        if ordering and not any(field.lstrip('-') in ('id', 'pk') for field in ordering):
+            ordering.append('-id' if ordering[0].startswith('-') else 'id')
+        return ordering
+
+
+class MovieSearchFilter(SearchFilter):
+    """
+    SearchFilter backed by the full-text index from migration 0013. The
+    usual icontains predicates still decide what matches, so results are
+    the same as with SearchFilter; the index only narrows the rows they are
+    checked against. On SQLite an FTS5 trigram lookup picks the candidate
+    rows (terms shorter than a trigram can only be checked by the
+    predicates); on PostgreSQL pg_trgm indexes serve the predicates
+    directly. Without an explicit ?ordering= results are ranked by
+    relevance: bm25 on SQLite, ts_rank on PostgreSQL.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        queryset = super().filter_queryset(request, queryset, view)
+        terms = self.get_search_terms(request)
+        if not terms or not self.get_search_fields(view, request):
+            return queryset
+
+        vendor = connections[queryset.db].vendor
+        if vendor == 'sqlite' and movie_fts_available(queryset.db):
+            queryset, rank, descending = self.sqlite_search(queryset, terms)
+        elif vendor == 'postgresql':
+            queryset, rank, descending = self.postgres_search(queryset, terms, view, request)
+        else:
+            return queryset
+
+        if rank is None or request.query_params.get(api_settings.ORDERING_PARAM):
+            return queryset
+        queryset = queryset.annotate(search_rank=rank)
+        return queryset.order_by('-search_rank' if descending else 'search_rank', '-id')
+
+    def sqlite_search(self, queryset, terms):
+        indexed = [fts_phrase(term) for term in terms if len(term) >= TRIGRAM_LENGTH]
+        if not indexed:
+            return queryset, None, False
+        match = ' AND '.join(indexed)
+        table = queryset.model._meta.db_table
+        queryset = queryset.filter(
+            pk__in=RawSQL(f"SELECT rowid FROM {MOVIE_FTS_TABLE} WHERE {MOVIE_FTS_TABLE} MATCH %s", [match])
+        )
+        rank = RawSQL(
+            f"SELECT rank FROM {MOVIE_FTS_TABLE} WHERE {MOVIE_FTS_TABLE} MATCH %s AND rowid = {table}.id", [match]
+        )
+        # FTS5 ranks better matches with more negative bm25 scores
+        return queryset, rank, False
+
+    def postgres_search(self, queryset, terms, view, request):
+        from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+
+        vector = SearchVector(*self.get_search_fields(view, request), config='simple')
+        rank = SearchRank(vector, SearchQuery(' '.join(terms), config='simple'))
+        return queryset, rank, True
+
+
+class MovieFilter(filters.FilterSet):
+    """
+    ?director= and ?cast= take an exact person name and go through the
+    Credit table: a unique-index seek on Person.name, then the
+    (person, role, movie) index, instead of a substring scan of the
+    comma-joined fields.
+    """
+
+    director = filters.CharFilter(method='filter_credit')
+    cast = filters.CharFilter(method='filter_credit')
+
+    class Meta:
+        model = Movie
+        fields = {
+            'year': ['exact', 'gte', 'lte', 'range'],
+            'rating': ['exact', 'gte', 'lte', 'range'],
+            # Incremental pulls: everything written since the last export
+            'updated': ['gt'],
+        }
+
+    def filter_credit(self, queryset, name, value):
+        role = Credit.DIRECTOR if name == 'director' else Credit.CAST
+        credits = Credit.objects.filter(role=role, person__name=value.strip())
+        return queryset.filter(pk__in=credits.values('movie_id'))
@@ -0,0 +1,133 @@
+import logging
+import os
+import socket
+from datetime import timedelta
+
+from django.db import connection, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from scraper.checkpoint import JobCheckpoint
+from scraper.models import ScraperStatus
+
+logger = logging.getLogger(__name__)
+
+LEASE_SECONDS = 60
+MAX_ATTEMPTS = 3
+CLAIM_CANDIDATES = 10
+
+
+def worker_name():
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def enqueue_job(job):
+    """Queues a job for the scraper_worker processes. Jobs holding a live lease are left alone."""
+    if job.status == 'running' and job.lease_expires_at and job.lease_expires_at > timezone.now():
+        return False
+    if job.pk and job.status == 'completed':
+        # Re-running a finished job starts over; failed or interrupted jobs resume from their checkpoint
+        JobCheckpoint(job).reset()
+    job.status = 'pending'
+    job.error_message = None
+    job.lease_owner = None
+    job.lease_expires_at = None
+    job.attempts = 0
+    return True
+
+
+def claimable_jobs(now):
+    expired = Q(status='running', lease_expires_at__lt=now)
+    return ScraperStatus.objects.filter(
+        Q(status='pending') | expired, attempts__lt=MAX_ATTEMPTS
+    ).order_by('started_at')
+
+
+def fail_exhausted_jobs(now):
+    """Gives up on jobs whose worker died holding the lease MAX_ATTEMPTS times."""
+    return ScraperStatus.objects.filter(
+        status='running', lease_expires_at__lt=now, attempts__gte=MAX_ATTEMPTS
+    ).update(
+        status='error',
+        error_message=f"Worker lease expired {MAX_ATTEMPTS} times",
+        lease_owner=None,
+        lease_expires_at=None,
+        updated_at=now,
+    )
+
+
+def claim_job(owner, lease_seconds=LEASE_SECONDS):
+    """
+    Leases the oldest pending job, or a running job whose worker stopped
+    heartbeating, to `owner`. Uses SELECT ... FOR UPDATE SKIP LOCKED where the
+    database supports it, and a compare-and-swap UPDATE on the current lease
+    otherwise (SQLite), so two workers can never claim the same job.
+    """
+    now = timezone.now()
+    fail_exhausted_jobs(now)
+    lease = {
+        'status': 'running',
+        'lease_owner': owner,
+        'lease_expires_at': now + timedelta(seconds=lease_seconds),
+        'heartbeat_at': now,
+        'attempts': F('attempts') + 1,
+        'updated_at': now,
+    }
+
+    if connection.features.has_select_for_update_skip_locked:
+        with transaction.atomic():
+            job = claimable_jobs(now).select_for_update(skip_locked=True).first()
+            if job is None:
+                return None
+            ScraperStatus.objects.filter(pk=job.pk).update(**lease)
+    else:
+        for job in claimable_jobs(now)[:CLAIM_CANDIDATES]:
+            claimed = ScraperStatus.objects.filter(
+                pk=job.pk,
+                status=job.status,
+                lease_owner=job.lease_owner,
+                lease_expires_at=job.lease_expires_at,
+            ).update(**lease)
+            if claimed:
+                break
+        else:
+            return None
+
+    job.refresh_from_db()
+    logger.info(f"{owner} claimed job {job.job_id} (attempt {job.attempts})")
+    return job
+
+
+def take_job(job):
+    """
+    Marks an existing job running for a process outside the worker queue
+    (manage.py scraper --job_id). A job a worker holds a live lease on is
+    refused; otherwise the lease is cleared in the same UPDATE, so a worker
+    cannot claim the job from under the caller.
+    """
+    now = timezone.now()
+    live_lease = Q(status='running', lease_expires_at__gt=now)
+    taken = ScraperStatus.objects.filter(pk=job.pk).exclude(live_lease).update(
+        status='running',
+        lease_owner=None,
+        lease_expires_at=None,
+        updated_at=now,
+    )
+    job.refresh_from_db()
+    return bool(taken)
+
+
+def renew_lease(job, owner, lease_seconds=LEASE_SECONDS):
+    """Extends the lease; returns False when another worker has taken the job over."""
+    now = timezone.now()
+    return bool(ScraperStatus.objects.filter(pk=job.pk, lease_owner=owner).update(
+        lease_expires_at=now + timedelta(seconds=lease_seconds),
+        heartbeat_at=now,
+    ))
+
+
+def release_job(job, owner):
+    ScraperStatus.objects.filter(pk=job.pk, lease_owner=owner).update(
+        lease_owner=None,
+        lease_expires_at=None,
+    )
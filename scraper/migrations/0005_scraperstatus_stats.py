@@ -0,0 +1,18 @@
+# Generated by Django 5.2.1 on 2026-10-18 04:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scraper', '0004_alter_scraperstatus_options_scraperstatus_limit_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='scraperstatus',
+            name='stats',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.1 on 2026-10-18 04:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scraper', '0005_scraperstatus_stats'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='movie',
+            name='imdb_id',
+            field=models.CharField(max_length=16, null=True, unique=True),
+        ),
+        migrations.AlterField(
+            model_name='movie',
+            name='title',
+            field=models.CharField(db_index=True, max_length=255),
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 5.2.1 on 2026-10-18 04:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scraper', '0006_movie_imdb_id_alter_movie_title'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='scraperstatus',
+            name='attempts',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='scraperstatus',
+            name='heartbeat_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='scraperstatus',
+            name='lease_expires_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='scraperstatus',
+            name='lease_owner',
+            field=models.CharField(blank=True, max_length=255, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='scraperstatus',
+            index=models.Index(fields=['status', 'started_at'], name='scraper_scr_status_17d018_idx'),
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.1 on 2026-10-18 04:13
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scraper', '0007_scraperstatus_attempts_scraperstatus_heartbeat_at_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='scraperstatus',
+            name='discovery_complete',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.CreateModel(
+            name='ScrapeJobItem',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('imdb_id', models.CharField(max_length=16)),
+                ('state', models.CharField(choices=[('pending', 'Pending'), ('done', 'Done'), ('failed', 'Failed')], default='pending', max_length=10)),
+                ('job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='items', to='scraper.scraperstatus')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['job', 'state'], name='scraper_scr_job_id_5152cf_idx')],
+                'constraints': [models.UniqueConstraint(fields=('job', 'imdb_id'), name='unique_job_item')],
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.1 on 2026-10-18 04:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scraper', '0008_scraperstatus_discovery_complete_scrapejobitem'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='scraperstatus',
+            name='mode',
+            field=models.CharField(choices=[('full', 'Full'), ('list-only', 'List only'), ('hybrid', 'Hybrid')], default='full', max_length=10),
+        ),
+    ]
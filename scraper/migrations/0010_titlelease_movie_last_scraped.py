@@ -0,0 +1,27 @@
+# Generated by Django 5.2.1 on 2026-10-18 04:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scraper', '0009_scraperstatus_mode'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TitleLease',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('imdb_id', models.CharField(max_length=16, unique=True)),
+                ('owner', models.CharField(max_length=255)),
+                ('expires_at', models.DateTimeField()),
+            ],
+        ),
+        migrations.AddField(
+            model_name='movie',
+            name='last_scraped',
+            field=models.DateTimeField(blank=True, db_index=True, null=True),
+        ),
+    ]
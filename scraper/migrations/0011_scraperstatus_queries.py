@@ -0,0 +1,18 @@
+# Generated by Django 5.2.1 on 2026-10-18 04:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scraper', '0010_titlelease_movie_last_scraped'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='scraperstatus',
+            name='queries',
+            field=models.JSONField(blank=True, default=list),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.1 on 2026-10-18 04:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scraper', '0011_scraperstatus_queries'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='movie',
+            name='content_hash',
+            field=models.CharField(blank=True, max_length=64, null=True),
+        ),
+    ]
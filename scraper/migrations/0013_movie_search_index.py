@@ -0,0 +1,74 @@
+from django.db import migrations
+
+SEARCH_COLUMNS = ['title', 'directors', 'cast', 'plot', 'year']
+
+SQLITE_FTS_COLUMNS = 'title, directors, "cast", plot, year'
+SQLITE_NEW_VALUES = 'new.id, new.title, new.directors, new."cast", new.plot, new.year'
+SQLITE_OLD_VALUES = 'old.id, old.title, old.directors, old."cast", old.plot, old.year'
+
+SQLITE_CREATE = [
+    f"""CREATE VIRTUAL TABLE scraper_movie_fts USING fts5(
+        {SQLITE_FTS_COLUMNS}, content='scraper_movie', content_rowid='id', tokenize='trigram'
+    )""",
+    f"""CREATE TRIGGER scraper_movie_fts_insert AFTER INSERT ON scraper_movie BEGIN
+        INSERT INTO scraper_movie_fts(rowid, {SQLITE_FTS_COLUMNS}) VALUES ({SQLITE_NEW_VALUES});
+    END""",
+    f"""CREATE TRIGGER scraper_movie_fts_delete AFTER DELETE ON scraper_movie BEGIN
+        INSERT INTO scraper_movie_fts(scraper_movie_fts, rowid, {SQLITE_FTS_COLUMNS})
+        VALUES ('delete', {SQLITE_OLD_VALUES});
+    END""",
+    # Only searchable columns re-index a row, so touching last_scraped stays cheap
+    f"""CREATE TRIGGER scraper_movie_fts_update AFTER UPDATE OF {SQLITE_FTS_COLUMNS} ON scraper_movie BEGIN
+        INSERT INTO scraper_movie_fts(scraper_movie_fts, rowid, {SQLITE_FTS_COLUMNS})
+        VALUES ('delete', {SQLITE_OLD_VALUES});
+        INSERT INTO scraper_movie_fts(rowid, {SQLITE_FTS_COLUMNS}) VALUES ({SQLITE_NEW_VALUES});
+    END""",
+    "INSERT INTO scraper_movie_fts(scraper_movie_fts) VALUES ('rebuild')",
+]
+SQLITE_DROP = [
+    "DROP TRIGGER IF EXISTS scraper_movie_fts_insert",
+    "DROP TRIGGER IF EXISTS scraper_movie_fts_delete",
+    "DROP TRIGGER IF EXISTS scraper_movie_fts_update",
+    "DROP TABLE IF EXISTS scraper_movie_fts",
+]
+
+# icontains compiles to UPPER(col::text) LIKE UPPER(%s) on PostgreSQL; indexing
+# that exact expression lets the planner use pg_trgm for it
+POSTGRES_CREATE = ["CREATE EXTENSION IF NOT EXISTS pg_trgm"] + [
+    f'CREATE INDEX IF NOT EXISTS scraper_movie_{column}_trgm '
+    f'ON scraper_movie USING gin (UPPER("{column}"::text) gin_trgm_ops)'
+    for column in SEARCH_COLUMNS
+]
+POSTGRES_DROP = [f'DROP INDEX IF EXISTS scraper_movie_{column}_trgm' for column in SEARCH_COLUMNS]
+
+
+def sqlite_has_trigram_fts(connection):
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT sqlite_version(), sqlite_compileoption_used('ENABLE_FTS5')")
+        version, fts5 = cursor.fetchone()
+    return bool(fts5) and tuple(map(int, version.split('.'))) >= (3, 34)
+
+
+def run_for_vendor(statements):
+    def run(apps, schema_editor):
+        connection = schema_editor.connection
+        # Without FTS5 trigram support search keeps working, just without the index
+        if connection.vendor == 'sqlite' and not sqlite_has_trigram_fts(connection):
+            return
+        for statement in statements.get(connection.vendor, []):
+            schema_editor.execute(statement)
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scraper', '0012_movie_content_hash'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            run_for_vendor({'sqlite': SQLITE_CREATE, 'postgresql': POSTGRES_CREATE}),
+            run_for_vendor({'sqlite': SQLITE_DROP, 'postgresql': POSTGRES_DROP}),
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.1 on 2026-10-18 04:31
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scraper', '0013_movie_search_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Person',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=255, unique=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='Credit',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('role', models.CharField(choices=[('director', 'Director'), ('cast', 'Cast')], max_length=10)),
+                ('order', models.PositiveSmallIntegerField(default=0)),
+                ('movie', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='credits', to='scraper.movie')),
+                ('person', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='credits', to='scraper.person')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['person', 'role', 'movie'], name='scraper_cre_person__2a47e4_idx')],
+                'constraints': [models.UniqueConstraint(fields=('movie', 'role', 'person'), name='unique_movie_role_person')],
+            },
+        ),
+    ]
@@ -0,0 +1,52 @@
+from django.db import migrations
+
+CHUNK_SIZE = 2000
+ROLES = {'directors': 'director', 'cast': 'cast'}
+
+
+def split_names(value):
+    if not value:
+        return []
+    return list(dict.fromkeys(name.strip()[:255] for name in value.split(',') if name.strip()))
+
+
+def backfill_credits(apps, schema_editor):
+    """Builds credits for existing movies in primary-key chunks, so memory stays flat on large tables."""
+    Movie = apps.get_model('scraper', 'Movie')
+    Person = apps.get_model('scraper', 'Person')
+    Credit = apps.get_model('scraper', 'Credit')
+
+    last_id = 0
+    while True:
+        movies = list(
+            Movie.objects.filter(pk__gt=last_id).order_by('pk').values_list('pk', 'directors', 'cast')[:CHUNK_SIZE]
+        )
+        if not movies:
+            break
+        last_id = movies[-1][0]
+
+        credits = [
+            (movie_id, role, name, order)
+            for movie_id, directors, cast in movies
+            for role, value in ((ROLES['directors'], directors), (ROLES['cast'], cast))
+            for order, name in enumerate(split_names(value))
+        ]
+        names = {name for _, _, name, _ in credits}
+        Person.objects.bulk_create([Person(name=name) for name in names], ignore_conflicts=True)
+        person_ids = dict(Person.objects.filter(name__in=names).values_list('name', 'id'))
+        Credit.objects.bulk_create(
+            [Credit(movie_id=movie_id, person_id=person_ids[name], role=role, order=order)
+             for movie_id, role, name, order in credits],
+            ignore_conflicts=True,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scraper', '0014_person_credit'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_credits, migrations.RunPython.noop),
+    ]
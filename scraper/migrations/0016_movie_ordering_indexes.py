@@ -0,0 +1,29 @@
+# Generated by Django 5.2.1 on 2026-10-18 04:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scraper', '0015_backfill_credits'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='movie',
+            index=models.Index(fields=['year', 'id'], name='scraper_mov_year_8cb187_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='movie',
+            index=models.Index(fields=['rating', 'id'], name='scraper_mov_rating_8e1f29_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='movie',
+            index=models.Index(fields=['created', 'id'], name='scraper_mov_created_bdae1c_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='movie',
+            index=models.Index(fields=['year', 'rating', 'id'], name='scraper_mov_year_089b65_idx'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+from django.db import migrations
+from django.db.models import Exists, OuterRef
+
+
+def remove_legacy_duplicates(apps, schema_editor):
+    """
+    Re-scrapes before legacy rows were adopted inserted a keyed copy next to
+    each movie saved without an imdb_id; the keyed copy is the current one.
+    """
+    Movie = apps.get_model('scraper', 'Movie')
+    keyed_twin = Movie.objects.filter(imdb_id__isnull=False, title=OuterRef('title'), year=OuterRef('year'))
+    Movie.objects.filter(imdb_id__isnull=True).filter(Exists(keyed_twin)).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scraper', '0016_movie_ordering_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(remove_legacy_duplicates, migrations.RunPython.noop),
+    ]
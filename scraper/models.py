@@ -3,7 +3,8 @@ from django.db import models
 
 
 class Movie(models.Model):
-    title = models.CharField(max_length=255,unique=True)
+    imdb_id = models.CharField(max_length=16, unique=True, null=True)
+    title = models.CharField(max_length=255, db_index=True)
     year = models.IntegerField(null=True)
     rating = models.DecimalField(max_digits=3, decimal_places=1, null=True)
     directors = models.TextField(null=True)
@@ -11,11 +12,57 @@ class Movie(models.Model):
     plot = models.TextField(null=True)
     created = models.DateTimeField(auto_now_add=True)
     updated = models.DateTimeField(auto_now=True)
+    last_scraped = models.DateTimeField(null=True, blank=True, db_index=True)
+    content_hash = models.CharField(max_length=64, null=True, blank=True)
+
+    class Meta:
+        # One per API ordering (with the id tiebreaker) and the admin's -year, -rating;
+        # their leading columns also serve the year/rating filters
+        indexes = [
+            models.Index(fields=['year', 'id']),
+            models.Index(fields=['rating', 'id']),
+            models.Index(fields=['created', 'id']),
+            models.Index(fields=['year', 'rating', 'id']),
+        ]
 
     def __str__(self):
         return f"{self.title} ({self.year})"
 
 
+class Person(models.Model):
+    name = models.CharField(max_length=255, unique=True)
+
+    def __str__(self):
+        return self.name
+
+
+class Credit(models.Model):
+    """One person credited on a movie; mirrors Movie.directors / Movie.cast in billing order."""
+
+    DIRECTOR = 'director'
+    CAST = 'cast'
+    ROLE_CHOICES = [
+        (DIRECTOR, 'Director'),
+        (CAST, 'Cast'),
+    ]
+    movie = models.ForeignKey(Movie, on_delete=models.CASCADE, related_name='credits')
+    person = models.ForeignKey(Person, on_delete=models.CASCADE, related_name='credits')
+    role = models.CharField(max_length=10, choices=ROLE_CHOICES)
+    order = models.PositiveSmallIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['movie', 'role', 'person'], name='unique_movie_role_person'),
+        ]
+        indexes = [
+            # "Movies with this person" goes person -> credits without touching scraper_movie
+            models.Index(fields=['person', 'role', 'movie']),
+        ]
+
+    def __str__(self):
+        return f"{self.person} ({self.role}) in {self.movie}"
+
+
 class ScraperStatus(models.Model):
     job_id = models.UUIDField(default=uuid.uuid4, unique=True, editable=False)
     started_at = models.DateTimeField(auto_now_add=True)
@@ -29,8 +76,17 @@ class ScraperStatus(models.Model):
     ]
     search_type = models.CharField(max_length=10, choices=SEARCH_TYPE_CHOICES)
     search_value = models.CharField(max_length=255)
+    # Extra queries of a multi-query sweep, as [{"type": "genre", "value": "action"}, ...]
+    queries = models.JSONField(default=list, blank=True)
     limit = models.IntegerField(default=50)
 
+    MODE_CHOICES = [
+        ('full', 'Full'),
+        ('list-only', 'List only'),
+        ('hybrid', 'Hybrid'),
+    ]
+    mode = models.CharField(max_length=10, choices=MODE_CHOICES, default='full')
+
     status = models.CharField(max_length=20, choices=[
         ("pending", "Pending"),
         ("running", "Running"),
@@ -38,7 +94,54 @@ class ScraperStatus(models.Model):
         ("error", "Error")
     ], default="pending")
     error_message = models.TextField(blank=True, null=True)
+    stats = models.JSONField(default=dict, blank=True)
+
+    lease_owner = models.CharField(max_length=255, blank=True, null=True)
+    lease_expires_at = models.DateTimeField(blank=True, null=True)
+    heartbeat_at = models.DateTimeField(blank=True, null=True)
+    attempts = models.IntegerField(default=0)
+    discovery_complete = models.BooleanField(default=False)
 
     class Meta:
         verbose_name = "New Scrape Job"
         verbose_name_plural = "Scrape Jobs"
+        indexes = [
+            models.Index(fields=['status', 'started_at']),
+        ]
+
+    def search_queries(self):
+        """The job's own search_type/search_value followed by its extra queries, without repeats."""
+        queries = [(self.search_type, self.search_value)]
+        queries += [(query['type'], query['value']) for query in self.queries]
+        return list(dict.fromkeys(queries))
+
+
+class ScrapeJobItem(models.Model):
+    STATE_CHOICES = [
+        ('pending', 'Pending'),
+        ('done', 'Done'),
+        ('failed', 'Failed'),
+    ]
+    job = models.ForeignKey(ScraperStatus, on_delete=models.CASCADE, related_name='items')
+    imdb_id = models.CharField(max_length=16)
+    state = models.CharField(max_length=10, choices=STATE_CHOICES, default='pending')
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['job', 'imdb_id'], name='unique_job_item'),
+        ]
+        indexes = [
+            models.Index(fields=['job', 'state']),
+        ]
+
+    def __str__(self):
+        return f"{self.imdb_id} ({self.state})"
+
+
+class TitleLease(models.Model):
+    imdb_id = models.CharField(max_length=16, unique=True)
+    owner = models.CharField(max_length=255)
+    expires_at = models.DateTimeField()
+
+    def __str__(self):
+        return f"{self.imdb_id} ({self.owner})"
@@ -0,0 +1,188 @@
+import base64
+import hashlib
+import json
+from functools import cached_property, partial
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+from scraper.catalog import catalog_version
+
+COUNT_CACHE_SECONDS = 60
+
+
+class CachedCountPaginator(Paginator):
+    """
+    Remembers the COUNT(*) of each distinct filtered query for
+    SCRAPER_API_COUNT_CACHE_SECONDS, or until movies are next written.
+    """
+
+    @cached_property
+    def count(self):
+        timeout = getattr(settings, 'SCRAPER_API_COUNT_CACHE_SECONDS', COUNT_CACHE_SECONDS)
+        if not timeout or not hasattr(self.object_list, 'query'):
+            return super().count
+        sql, params = self.object_list.query.sql_with_params()
+        key = 'movie-count:' + hashlib.sha256(repr((catalog_version(), sql, params)).encode()).hexdigest()
+        count = cache.get(key)
+        if count is None:
+            count = self.object_list.count()
+            cache.set(key, count, timeout)
+        return count
+
+
+class KeysetPagination(BasePagination):
+    """
+    Cursor pagination on the queryset's own ordering, with `id` appended as
+    a tiebreaker. The cursor holds the ordering values of the last row
+    shown (or the first, for the previous page), and the next page is
+    whatever sorts after them, so deep pages cost the same as the first
+    and nothing is counted. NULLs are placed the way the database orders
+    them (connection.features.nulls_order_largest).
+    """
+
+    cursor_query_param = 'cursor'
+    page_size = 10
+    page_size_query_param = 'per_page'
+    max_page_size = 100
+    display_page_controls = False
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.ordering = self.get_ordering(queryset)
+        self.nulls_largest = connections[queryset.db].features.nulls_order_largest
+
+        cursor = self.decode_cursor(request)
+        reverse = bool(cursor and cursor['reverse'])
+        ordering = [self.flip(field) for field in self.ordering] if reverse else self.ordering
+        try:
+            if cursor:
+                queryset = queryset.filter(self.after(cursor['values'], reverse))
+            rows = list(queryset.order_by(*ordering)[:self.page_size + 1])
+        except (TypeError, ValueError, ValidationError):
+            # A tampered cursor whose values do not fit the ordering's fields
+            raise NotFound('Invalid cursor')
+
+        has_more = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+        if reverse:
+            rows.reverse()
+        self.has_next = has_more if not reverse else True
+        self.has_previous = has_more if reverse else cursor is not None
+        self.page = rows
+        return rows
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return min(size, self.max_page_size) if size > 0 else self.page_size
+
+    def get_ordering(self, queryset):
+        ordering = [field for field in queryset.query.order_by if isinstance(field, str)]
+        ordering = ordering or list(queryset.model._meta.ordering)
+        if not any(field.lstrip('-') in ('id', 'pk') for field in ordering):
+            ordering.append('id')
+        return ordering
+
+    @staticmethod
+    def flip(field):
+        return field[1:] if field.startswith('-') else f'-{field}'
+
+    def after(self, values, reverse=False):
+        """Rows sorting strictly after `values`: equal on a prefix of the ordering, then past it."""
+        condition = Q(pk__in=[])
+        equal = Q()
+        for field, value in zip(self.ordering, values):
+            descending = field.startswith('-') != reverse
+            name = field.lstrip('-')
+            nulls_last = self.nulls_largest != descending
+            if value is None:
+                # Past a NULL there are only non-NULLs, and only if NULLs sort first
+                past = Q(pk__in=[]) if nulls_last else Q(**{f'{name}__isnull': False})
+                same = Q(**{f'{name}__isnull': True})
+            else:
+                past = Q(**{f"{name}__{'lt' if descending else 'gt'}": value})
+                if nulls_last:
+                    past |= Q(**{f'{name}__isnull': True})
+                same = Q(**{name: value})
+            condition |= equal & past
+            equal &= same
+        return condition
+
+    def encode_cursor(self, row, reverse):
+        get = row.get if isinstance(row, dict) else partial(getattr, row)
+        values = [get(field.lstrip('-')) for field in self.ordering]
+        data = json.dumps({'values': values, 'reverse': reverse}, default=str, separators=(',', ':'))
+        return base64.urlsafe_b64encode(data.encode()).decode()
+
+    def decode_cursor(self, request):
+        token = request.query_params.get(self.cursor_query_param)
+        if not token:
+            return None
+        try:
+            cursor = json.loads(base64.urlsafe_b64decode(token.encode()))
+            if len(cursor['values']) != len(self.ordering):
+                raise ValueError
+        except (TypeError, ValueError, KeyError):
+            raise NotFound('Invalid cursor')
+        return cursor
+
+    def get_link(self, row, reverse):
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(row, reverse))
+
+    def get_next_link(self):
+        return self.get_link(self.page[-1], False) if self.has_next and self.page else None
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if not self.page:
+            return remove_query_param(self.request.build_absolute_uri(), self.cursor_query_param)
+        return self.get_link(self.page[0], True)
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        })
+
+
+class CustomPageSizePagination(PageNumberPagination):
+    """
+    Page-number pagination with a cached count. `?pagination=cursor` (or a
+    `cursor` from a previous response) switches to KeysetPagination, which
+    never counts and has no OFFSET.
+    """
+
+    page_size = 10  # default
+    page_size_query_param = 'per_page'
+    max_page_size = 100
+    django_paginator_class = CachedCountPaginator
+    mode_query_param = 'pagination'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.keyset = None
+        params = request.query_params
+        if params.get(self.mode_query_param) == 'cursor' or KeysetPagination.cursor_query_param in params:
+            self.keyset = KeysetPagination()
+            self.display_page_controls = False
+            return self.keyset.paginate_queryset(queryset, request, view)
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.keyset:
+            return self.keyset.get_paginated_response(data)
+        return super().get_paginated_response(data)
@@ -0,0 +1,60 @@
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+
+from bs4 import BeautifulSoup, SoupStrainer
+from django.conf import settings
+
+HERO_STRAINER = SoupStrainer(attrs={'data-testid': 'hero-parent'})
+
+_parse_pool = None
+
+
+def available_backends():
+    backends = ['html.parser']
+    try:
+        import lxml  # noqa: F401
+        backends.append('lxml')
+    except ImportError:
+        pass
+    return backends
+
+
+def default_backend():
+    return getattr(settings, 'SCRAPER_HTML_PARSER', None) or available_backends()[-1]
+
+
+def make_soup(html, backend=None, hero_only=None):
+    """
+    Builds the BeautifulSoup tree used for DOM fallbacks. With `hero_only`
+    only the title hero section (title, metadata, rating, plot and principal
+    credits) is materialized; pages without that section are parsed in full.
+    """
+    backend = backend or default_backend()
+    if hero_only is None:
+        hero_only = getattr(settings, 'SCRAPER_PARSE_HERO_ONLY', True)
+
+    if hero_only:
+        soup = BeautifulSoup(html, backend, parse_only=HERO_STRAINER)
+        if soup.contents:
+            return soup
+    return BeautifulSoup(html, backend)
+
+
+def get_parse_pool(workers):
+    """
+    Returns the process-wide pool of `workers` spawned processes that parse
+    title pages, starting it on first use. Every job of a scraper_worker
+    shares it, so the interpreters and their bs4/lxml imports are paid once
+    per worker process rather than once per job.
+    """
+    global _parse_pool
+    if _parse_pool is None:
+        _parse_pool = ProcessPoolExecutor(max_workers=workers, mp_context=get_context('spawn'))
+    return _parse_pool
+
+
+def close_parse_pool():
+    global _parse_pool
+    pool, _parse_pool = _parse_pool, None
+    if pool is not None:
+        pool.shutdown(cancel_futures=True)
@@ -0,0 +1,55 @@
+import heapq
+import math
+from datetime import timedelta
+
+from django.db.models import Q
+from django.utils import timezone
+
+from scraper.models import Movie
+
+DEFAULT_BUDGET = 1000
+
+# Years since release -> how long a scrape stays good. Ratings of new and
+# upcoming titles move daily; year, directors and plot of old ones hardly ever.
+REFRESH_INTERVALS = [
+    (1, timedelta(days=1)),
+    (5, timedelta(days=7)),
+    (None, timedelta(days=30)),
+]
+UNKNOWN_YEAR_INTERVAL = timedelta(days=1)
+
+
+def refresh_interval(year, today):
+    if year is None:
+        return UNKNOWN_YEAR_INTERVAL
+    for max_age, interval in REFRESH_INTERVALS:
+        if max_age is None or today.year - year <= max_age:
+            return interval
+
+
+def refresh_candidates(budget=DEFAULT_BUDGET, now=None):
+    """
+    Picks at most `budget` titles that are due for a refresh, most overdue
+    first. A title is due once the time since its last scrape exceeds the
+    interval for its release year; never scraped titles come first and ties
+    go to the most recent release. Returns {imdb_id: content_hash}.
+    """
+    now = now or timezone.now()
+    shortest = min([interval for _, interval in REFRESH_INTERVALS] + [UNKNOWN_YEAR_INTERVAL])
+    rows = Movie.objects.filter(
+        Q(last_scraped__isnull=True) | Q(last_scraped__lt=now - shortest),
+        imdb_id__isnull=False,
+    ).values_list('imdb_id', 'year', 'last_scraped', 'content_hash')
+
+    def due(rows):
+        for imdb_id, year, last_scraped, digest in rows.iterator():
+            if last_scraped is None:
+                overdue = math.inf
+            else:
+                overdue = (now - last_scraped) / refresh_interval(year, now)
+                if overdue < 1:
+                    continue
+            yield overdue, year or 0, imdb_id, digest
+
+    ranked = heapq.nlargest(budget, due(rows), key=lambda row: (row[0], row[1]))
+    return {imdb_id: digest for _, _, imdb_id, digest in ranked}
@@ -0,0 +1,39 @@
+import json
+
+from rest_framework.renderers import JSONRenderer
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def dumps(data):
+    """
+    JSON bytes exactly as DRF's default JSONRenderer writes plain data
+    (compact, unescaped UTF-8, U+2028/U+2029 escaped), via orjson when it
+    is installed.
+    """
+    if orjson is not None:
+        ret = orjson.dumps(data)
+    else:
+        ret = json.dumps(data, ensure_ascii=False, allow_nan=False, separators=(',', ':')).encode()
+    return ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer for views whose data is already plain dicts, lists,
+    strings, ints and None. Indented output and anything orjson cannot
+    encode go through the stock renderer.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        if self.get_indent(accepted_media_type, renderer_context or {}):
+            return super().render(data, accepted_media_type, renderer_context)
+        try:
+            return dumps(data)
+        except TypeError:
+            return super().render(data, accepted_media_type, renderer_context)
@@ -5,3 +5,32 @@ class MovieSerializer(serializers.ModelSerializer):
     class Meta:
         model = Movie
         fields = ['id', 'title', 'year', 'rating', 'directors', 'cast', 'plot']
+
+
+class RowConverter:
+    """
+    Turns `.values(*converter.sources)` rows into the dicts
+    `serializer_class(many=True).data` would hold, without model
+    instances. Fields whose to_representation returns database values
+    unchanged are copied; the rest (rating's Decimal quantizing) still go
+    through the serializer field, once per non-null value.
+    """
+
+    PASSTHROUGH = (serializers.CharField, serializers.IntegerField)
+
+    def __init__(self, serializer_class):
+        self.columns = []
+        for name, field in serializer_class().fields.items():
+            if field.write_only:
+                continue
+            if '.' in field.source or field.source == '*':
+                raise ValueError(f"{serializer_class.__name__}.{name} is not a plain model column")
+            convert = None if type(field) in self.PASSTHROUGH else field.to_representation
+            self.columns.append((name, field.source, convert))
+        self.sources = [source for _, source, _ in self.columns]
+
+    def __call__(self, row):
+        return {
+            name: row[source] if convert is None or row[source] is None else convert(row[source])
+            for name, source, convert in self.columns
+        }
@@ -1,15 +1,97 @@
-from unittest import IsolatedAsyncioTestCase
-from unittest.mock import patch, AsyncMock
+import asyncio
+import base64
+import csv
+import gzip
+import json
+import tempfile
+import time
+import uuid
+from importlib import import_module
+from collections import Counter
+from contextlib import asynccontextmanager
+from io import StringIO
+from pathlib import Path
+from unittest import IsolatedAsyncioTestCase, skipUnless
+from unittest.mock import patch, AsyncMock, MagicMock
+import aiohttp
+from aiohttp import web
+from playwright.async_api import Error as PlaywrightError, TimeoutError as PlaywrightTimeoutError
+from asgiref.sync import sync_to_async
+from django.apps import apps as django_apps
+from django.core.cache import cache
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.core.management import CommandError, call_command
 from django.urls import reverse
-from rest_framework.test import APITestCase
+from django.utils import timezone
+from datetime import timedelta
+from rest_framework.filters import SearchFilter
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory, APITestCase
 from rest_framework import status
 
-from scraper.models import Movie, ScraperStatus
+from scraper.browser import BrowserPool
+from scraper.archive import PageArchive
+from scraper.cache import ResponseCache
+from scraper.catalog import catalog_version, count_stat, response_cache_stats
+from scraper.dedup import TitleFlights, acquire_title_lease, release_title_leases
+from scraper.extract import extract_structured_fields, fields_from_card, parse_dom_fields, parse_movie_page
+from scraper.fetch import AsyncFetcher
+from scraper.filters import MovieSearchFilter
+from scraper.jobs import MAX_ATTEMPTS, claim_job, enqueue_job, release_job, renew_lease
+from scraper.parsers import available_backends, close_parse_pool, make_soup
+from scraper.refresh import refresh_candidates
+from scraper.throttle import THROTTLED, AdaptiveLimiter
+from scraper.writer import MOVIE_UPDATE_FIELDS, MovieWriter, upsert_movies
+from scraper.models import Credit, Movie, Person, ScrapeJobItem, ScraperStatus, TitleLease
+from scraper.views import MovieListAPIView
 from scripts.management.commands.scraper import IMDBScraper
 
+TITLE_PAGE_HTML = """
+<html><body>
+<div class="ipc-page-content-container"><a href="/chart/top/">Top 250</a></div>
+<section data-testid="hero-parent">
+<h1 data-testid="hero__pageTitle"><span>Inception</span></h1>
+<ul class="ipc-inline-list ipc-inline-list--show-dividers"><li>2010</li><li>PG-13</li></ul>
+<div data-testid="hero-rating-bar__aggregate-rating__score"><span>8.8</span><span>/10</span></div>
+<span data-testid="plot-xl">Dreams inside dreams.</span>
+<ul>
+  <li><span>Director</span><div><ul><li><a href="/name/nm0634240/">Christopher Nolan</a></li></ul></div></li>
+  <li><a aria-label="See full cast and crew" href="/title/tt1375666/fullcredits">Stars</a>
+    <div><ul><li><a href="/name/nm0000138/">Leonardo DiCaprio</a></li><li><a href="/name/nm0330687/">Joseph Gordon-Levitt</a></li></ul></div></li>
+</ul>
+</section>
+<section data-testid="MoreLikeThis"><ul><li><a href="/title/tt0816692/">Interstellar</a></li></ul></section>
+</body></html>
+"""
+
+STRUCTURED_TITLE_PAGE_HTML = """
+<html><head>
+<script type="application/ld+json">{"@type":"Movie","name":"Inception","datePublished":"2010-07-16",
+"aggregateRating":{"@type":"AggregateRating","ratingValue":8.8},
+"description":"A thief who steals corporate secrets through the use of dream-sharing technology.",
+"director":[{"@type":"Person","name":"Christopher Nolan"}],
+"actor":[{"@type":"Person","name":"Leonardo DiCaprio"},{"@type":"Person","name":"Joseph Gordon-Levitt"}]}</script>
+</head><body>
+<script id="__NEXT_DATA__" type="application/json">{"props":{"pageProps":{"aboveTheFoldData":{
+"titleText":{"text":"Inception"},"releaseYear":{"year":2010},"ratingsSummary":{"aggregateRating":8.8},
+"plot":{"plotText":{"plainText":"Dreams inside dreams."}},
+"principalCredits":[
+{"category":{"id":"director","text":"Director"},"credits":[{"name":{"nameText":{"text":"Christopher Nolan"}}}]},
+{"category":{"id":"cast","text":"Stars"},"credits":[{"name":{"nameText":{"text":"Leonardo DiCaprio"}}},
+{"name":{"nameText":{"text":"Joseph Gordon-Levitt"}}}]}]}}}}</script>
+</body></html>
+"""
+
+
+def written_count(movies, failed_ids=()):
+    return len(movies)
+
 
 class MovieListAPITests(APITestCase):
     def setUp(self):
+        cache.clear()
         Movie.objects.create(
             title="Inception",
             year=2010,
@@ -51,6 +133,129 @@ class MovieListAPITests(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertTrue(any(str(movie['year']) == "1999" for movie in response.data['results']))
 
+    def search_ids(self, search, backend=None):
+        request = Request(APIRequestFactory().get('/', {'search': search}))
+        view = MovieListAPIView()
+        backend = backend or MovieSearchFilter()
+        return {movie.id for movie in backend.filter_queryset(request, Movie.objects.all(), view)}
+
+    def test_full_text_search_matches_search_filter(self):
+        Movie.objects.create(title="Interstellar", year=2014, directors="Christopher Nolan",
+                             cast="Matthew McConaughey", plot="A wormhole near Saturn.")
+        for search in ['nolan', 'NOLAN reeves', 'ream', 'is', '201', 'keanu, real', '"christopher nolan"',
+                       'wormhole 2014', '100% real', 'no such movie']:
+            with self.subTest(search=search):
+                self.assertEqual(self.search_ids(search), self.search_ids(search, SearchFilter()))
+
+    def test_search_uses_index_and_ranks_results(self):
+        Movie.objects.create(title="Nolan", year=2020, directors="Nolan", plot="Nolan on Nolan.")
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('scraper-movie-list'), {'search': 'nolan'})
+        self.assertIn('scraper_movie_fts MATCH', queries.captured_queries[-1]['sql'])
+        self.assertEqual([movie['title'] for movie in response.data['results']], ['Nolan', 'Inception'])
+
+        response = self.client.get(reverse('scraper-movie-list'), {'search': 'nolan', 'ordering': 'year'})
+        self.assertEqual([movie['title'] for movie in response.data['results']], ['Inception', 'Nolan'])
+
+    def test_search_index_follows_updates_and_deletes(self):
+        matrix = Movie.objects.get(title="The Matrix")
+        matrix.plot = "Follow the white rabbit."
+        matrix.save()
+        self.assertEqual(self.search_ids('rabbit'), {matrix.id})
+        self.assertEqual(self.search_ids('what is real'), set())
+        matrix.delete()
+        self.assertEqual(self.search_ids('rabbit'), set())
+
+    def test_filter_by_credit(self):
+        Movie.objects.create(title="Tenet", year=2020, directors="Christopher Nolan", cast="John David Washington")
+        url = reverse('scraper-movie-list')
+        response = self.client.get(url, {'director': 'Christopher Nolan', 'ordering': 'year'})
+        self.assertEqual([m['title'] for m in response.data['results']], ['Inception', 'Tenet'])
+        response = self.client.get(url, {'director': 'Christopher Nolan', 'cast': 'Leonardo DiCaprio'})
+        self.assertEqual([m['title'] for m in response.data['results']], ['Inception'])
+        response = self.client.get(url, {'cast': 'Nolan'})
+        self.assertEqual(response.data['results'], [])
+
+    def test_range_filters(self):
+        url = reverse('scraper-movie-list')
+        response = self.client.get(url, {'year__gte': 2000})
+        self.assertEqual([m['title'] for m in response.data['results']], ['Inception'])
+        response = self.client.get(url, {'year__range': '1990,2010', 'rating__lte': 8.7})
+        self.assertEqual([m['title'] for m in response.data['results']], ['The Matrix'])
+
+    @skipUnless(connection.vendor == 'sqlite', 'EXPLAIN QUERY PLAN output is SQLite specific')
+    def test_common_requests_use_indexes(self):
+        for params in [{'ordering': '-rating'}, {'ordering': 'year'}, {'ordering': '-created'}, {'year': 2010},
+                       {'year__gte': 2000, 'ordering': 'year'}, {'rating__range': '8,9', 'ordering': '-rating'},
+                       {'cast': 'Keanu Reeves'}]:
+            with self.subTest(**params):
+                request = Request(APIRequestFactory().get('/', params))
+                view = MovieListAPIView(request=request, format_kwarg=None)
+                plan = view.filter_queryset(view.get_queryset()).explain()
+                self.assertRegex(plan, r'USING (COVERING )?INDEX')
+                self.assertNotRegex(plan, r'SCAN \w+$|SCAN \w+\n')  # a table scan without an index
+                self.assertNotIn('TEMP B-TREE', plan)
+
+    def export(self, params):
+        response = self.client.get(reverse('scraper-movie-export'), params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return b''.join(response.streaming_content)
+
+    def test_export_streams_filtered_movies(self):
+        rows = [json.loads(line) for line in self.export({'year__gte': 2000}).splitlines()]
+        self.assertEqual([(row['title'], row['rating'], row['year']) for row in rows], [('Inception', '8.8', 2010)])
+
+        with patch('scraper.export.FLUSH_BYTES', 10):
+            data = gzip.decompress(self.export({'file_format': 'csv', 'compression': 'gzip', 'ordering': 'year'}))
+        titles = [row['title'] for row in csv.DictReader(StringIO(data.decode()))]
+        self.assertEqual(titles, ['The Matrix', 'Inception'])
+
+        watermark = max(row['updated'] for row in map(json.loads, self.export({}).splitlines()))
+        self.assertEqual(self.export({'updated__gt': watermark}), b'')
+        response = self.client.get(reverse('scraper-movie-export'), {'file_format': 'xml'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_export_ignores_accept_header(self):
+        for file_format, accept in [('csv', 'text/csv'), ('ndjson', 'application/x-ndjson')]:
+            with self.subTest(accept=accept):
+                response = self.client.get(reverse('scraper-movie-export'), {'file_format': file_format},
+                                           HTTP_ACCEPT=accept)
+                self.assertEqual(response.status_code, status.HTTP_200_OK)
+                self.assertEqual(response['Content-Type'], accept)
+                self.assertIn(b'Inception', b''.join(response.streaming_content))
+        response = self.client.get(reverse('scraper-movie-export'), {'file_format': 'xml'}, HTTP_ACCEPT='text/csv')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response['Content-Type'], 'application/json')
+
+    def test_export_movies_command(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            output = Path(tmp) / 'movies.ndjson.gz'
+            call_command('export_movies', '--gzip', '--output', str(output), '--filter', 'search=matrix')
+            rows = [json.loads(line) for line in gzip.decompress(output.read_bytes()).splitlines()]
+        self.assertEqual([row['title'] for row in rows], ['The Matrix'])
+
+        out = StringIO()
+        call_command('export_movies', '--format', 'csv', '--filter', 'ordering=-rating', stdout=out)
+        self.assertEqual(out.getvalue().splitlines()[0], 'id,imdb_id,title,year,rating,directors,cast,plot,updated')
+        self.assertIn(',Inception,2010,8.8,', out.getvalue().splitlines()[1])
+        with self.assertRaises(CommandError):
+            call_command('export_movies', '--filter', 'year=abc', stdout=StringIO())
+
+    @override_settings(SCRAPER_API_CACHE_SECONDS=0, SCRAPER_API_COUNT_CACHE_SECONDS=0)
+    def test_fast_path_matches_serializer_bytes(self):
+        Movie.objects.create(title="Amélie \u2028 \"quoted\"\n", year=None, rating=None, directors="Jean-Pierre Jeunet",
+                             cast=None, plot="😀\x1f")
+        Movie.objects.create(title="Ten", year=2020, rating=10)
+        url = reverse('scraper-movie-list')
+        for params in [{}, {'per_page': 2, 'page': 2}, {'ordering': '-rating'}, {'search': 'jeunet'},
+                       {'pagination': 'cursor', 'per_page': 2, 'ordering': 'year'}, {'format': 'json'}]:
+            with self.subTest(**params):
+                with override_settings(SCRAPER_API_FAST_PATH=False):
+                    expected = self.client.get(url, params).content
+                self.assertEqual(self.client.get(url, params).content, expected)
+                with patch('scraper.renderers.orjson', None):
+                    self.assertEqual(self.client.get(url, params).content, expected)
+
     def test_pagination_custom_per_page(self):
         url = reverse('scraper-movie-list')
         response = self.client.get(url, {'per_page': 1})
@@ -58,6 +263,91 @@ class MovieListAPITests(APITestCase):
         self.assertEqual(response.data['count'], 2)
         self.assertEqual(len(response.data['results']), 1)
 
+    def walk_cursor(self, params):
+        pages, url = [], reverse('scraper-movie-list')
+        params = {'pagination': 'cursor', 'per_page': 2, **params}
+        while url:
+            response = self.client.get(url, params)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertNotIn('count', response.data)
+            pages.append(response.data)
+            url, params = response.data['next'], None
+        return pages
+
+    def test_cursor_pagination_follows_ordering(self):
+        for i in range(5):
+            Movie.objects.create(title=f"Sequel {i}", year=2010 if i % 2 else None,
+                                 rating=8.8 if i < 2 else None)
+        orderings = [{}, {'ordering': '-rating'}, {'ordering': 'rating'}, {'ordering': 'year'},
+                     {'ordering': '-year'}, {'ordering': 'title'}, {'search': 'sequel'}]
+        for params in orderings:
+            with self.subTest(**params):
+                expected = self.client.get(reverse('scraper-movie-list'), {'per_page': 100, **params})
+                pages = self.walk_cursor(params)
+                self.assertEqual([m['id'] for page in pages for m in page['results']],
+                                 [m['id'] for m in expected.data['results']])
+                self.assertIsNone(pages[0]['previous'])
+
+                # Stepping back from the last page lands on the page before it
+                back = self.client.get(pages[-1]['previous'])
+                self.assertEqual(back.data['results'], pages[-2]['results'])
+
+    def test_invalid_cursor_is_not_found(self):
+        response = self.client.get(reverse('scraper-movie-list'), {'cursor': 'garbage'})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+        # Well-formed cursors whose values do not fit the ordering field
+        Movie.objects.create(title="Inception", year=2010)
+        for ordering, values in [('year', ['abc', 1]), ('created', ['not a date', 1]), ('-rating', [[1], 1])]:
+            with self.subTest(ordering=ordering):
+                cursor = base64.urlsafe_b64encode(json.dumps({'values': values, 'reverse': False}).encode()).decode()
+                response = self.client.get(reverse('scraper-movie-list'), {'cursor': cursor, 'ordering': ordering})
+                self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    @override_settings(SCRAPER_API_CACHE_SECONDS=0)
+    def test_page_count_is_cached(self):
+        url = reverse('scraper-movie-list')
+        self.client.get(url, {'year': 1999})
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, {'year': 1999})
+        self.assertEqual(response.data['count'], 1)
+        self.assertFalse(any('COUNT(' in q['sql'] for q in queries.captured_queries))
+
+    @override_settings(SCRAPER_API_CACHE_SECONDS=300)
+    def test_responses_cached_per_catalog_version(self):
+        url = reverse('scraper-movie-list')
+        first = self.client.get(url, {'ordering': '-rating', 'per_page': 5, 'search': ''})
+        self.assertEqual(first['X-Cache'], 'MISS')
+        with self.assertNumQueries(0):
+            again = self.client.get(url, {'per_page': 5, 'ordering': '-rating'})
+            not_modified = self.client.get(url, {'per_page': 5, 'ordering': '-rating'},
+                                           HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(again['X-Cache'], 'HIT')
+        self.assertEqual(again.data, first.data)
+        self.assertEqual(not_modified.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(not_modified['ETag'], first['ETag'])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            upsert_movies([Movie(imdb_id='tt0133093', title='The Matrix Reloaded', rating=9.9)])
+        changed = self.client.get(url, {'per_page': 5, 'ordering': '-rating'}, HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(changed.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(changed['ETag'], first['ETag'])
+        self.assertEqual(changed.data['results'][0]['title'], 'The Matrix Reloaded')
+        self.assertEqual(changed.data['count'], 3)
+        self.assertEqual(response_cache_stats(), {'hits': 1, 'misses': 2, 'not_modified': 1, 'hit_ratio': 0.5})
+
+    def test_catalog_version_and_stats_do_not_expire(self):
+        version = catalog_version()
+        count_stat('hits')
+        with patch('django.core.cache.backends.locmem.time.time', return_value=time.time() + 86400):
+            self.assertEqual(catalog_version(), version)
+            self.assertEqual(response_cache_stats()['hits'], 1)
+
+    def test_responses_not_cached_by_default(self):
+        response = self.client.get(reverse('scraper-movie-list'))
+        self.assertNotIn('ETag', response)
+        self.assertEqual(response_cache_stats()['misses'], 0)
+
 
 # ✅ Scraper Command Tests
 class IMDBScraperTests(IsolatedAsyncioTestCase):
@@ -65,17 +355,907 @@ class IMDBScraperTests(IsolatedAsyncioTestCase):
         self.status = await ScraperStatus.objects.acreate(status='pending', total_movies=2)
         self.scraper = IMDBScraper(search_type='genre', search_value='comedy', limit=2, status=self.status)
 
-    @patch('scripts.management.commands.scraper.IMDBScraper.fetch_movie_list_page', new_callable=AsyncMock)
-    @patch('scripts.management.commands.scraper.IMDBScraper.scrape_details_concurrently', new_callable=AsyncMock)
+    @patch('scripts.management.commands.scraper.IMDBScraper.scrape_details_concurrently', new_callable=AsyncMock, return_value=2)
     @patch('scripts.management.commands.scraper.IMDBScraper.update_status', new_callable=AsyncMock)
-    async def test_run_success(self, mock_update_status, mock_scrape_concurrent, mock_fetch):
-        mock_fetch.return_value = ['url1', 'url2']
+    async def test_run_success(self, mock_update_status, mock_scrape_concurrent):
         await self.scraper.run()
-        mock_update_status.assert_called_with('completed', scraped_movies=2)
+        mock_update_status.assert_called_with('completed', total_movies=2)
 
-    @patch('scripts.management.commands.scraper.IMDBScraper.fetch_movie_list_page', new_callable=AsyncMock, side_effect=Exception("Fetch failed"))
     @patch('scripts.management.commands.scraper.IMDBScraper.update_status', new_callable=AsyncMock)
-    async def test_run_fetch_failure(self, mock_update_status, mock_fetch):
-        with self.assertRaises(Exception):
-            await self.scraper.run()
+    async def test_run_fetch_failure(self, mock_update_status):
+        async def failing_links(url):
+            raise Exception("Fetch failed")
+            yield
+
+        with patch.object(self.scraper, 'iter_movie_links', failing_links):
+            with self.assertRaises(Exception):
+                await self.scraper.run()
         mock_update_status.assert_called_with('error', error_message='Fetch failed')
+
+    @patch('scraper.writer.MovieWriter.write_batch', side_effect=written_count)
+    async def test_details_start_before_discovery_finishes(self, mock_bulk_insert):
+        first_detail_fetched = asyncio.Event()
+
+        async def links():
+            yield ['https://www.imdb.com/title/tt1/']
+            await asyncio.wait_for(first_detail_fetched.wait(), timeout=5)
+            yield ['https://www.imdb.com/title/tt2/']
+
+        async def fetch(url):
+            first_detail_fetched.set()
+            return TITLE_PAGE_HTML.encode()
+
+        with patch('scraper.fetch.AsyncFetcher.fetch', side_effect=fetch):
+            found = await self.scraper.scrape_details_concurrently(links())
+        self.assertEqual(found, 2)
+
+    @patch('scraper.writer.MovieWriter.write_batch', side_effect=written_count)
+    @patch('scraper.fetch.AsyncFetcher.fetch', new_callable=AsyncMock, return_value=TITLE_PAGE_HTML.encode())
+    async def test_scrape_details_concurrently_batches_parsed_movies(self, mock_fetch, mock_bulk_insert):
+        links = [f'https://www.imdb.com/title/tt{i}/' for i in range(5)]
+        await self.scraper.scrape_details_concurrently(links)
+        self.assertEqual(mock_fetch.await_count, 5)
+        inserted = [m for call in mock_bulk_insert.call_args_list for m, *_ in call.args[0]]
+        self.assertEqual(len(inserted), 5)
+        self.assertEqual(inserted[0].title, 'Inception')
+        self.assertEqual(inserted[0].directors, 'Christopher Nolan')
+        self.assertEqual(inserted[0].cast, 'Leonardo DiCaprio, Joseph Gordon-Levitt')
+
+    @patch('scraper.writer.MovieWriter.write_batch', side_effect=written_count)
+    @patch('scraper.fetch.AsyncFetcher.fetch', new_callable=AsyncMock, return_value=TITLE_PAGE_HTML.encode())
+    async def test_parse_in_process_pool(self, mock_fetch, mock_bulk_insert):
+        self.addCleanup(close_parse_pool)
+        self.scraper.parse_workers = 2
+        await self.scraper.scrape_details_concurrently(['https://www.imdb.com/title/tt1/', 'https://www.imdb.com/title/tt2/'])
+        inserted = [m for call in mock_bulk_insert.call_args_list for m, *_ in call.args[0]]
+        self.assertEqual([m.title for m in inserted], ['Inception', 'Inception'])
+        self.assertEqual(self.scraper.fallback_counts['cast'], 2)
+
+        # The next job of the process parses in the same pool
+        other = IMDBScraper('genre', 'drama', 1, status=None, parse_workers=2)
+        await other.scrape_details_concurrently(['https://www.imdb.com/title/tt3/'])
+        self.assertIs(other.parse_pool, self.scraper.parse_pool)
+        self.assertEqual(other.fallback_counts['cast'], 1)
+
+    async def test_scrape_movie_details_fetch_error_returns_empty(self):
+        fetcher = AsyncMock()
+        fetcher.fetch.side_effect = aiohttp.ClientError("boom")
+        self.assertEqual(await self.scraper.scrape_movie_details(fetcher, 'https://www.imdb.com/title/tt1/'), {})
+
+
+class BrowserPoolTests(IsolatedAsyncioTestCase):
+    def make_route(self, resource_type, url):
+        route = MagicMock()
+        route.request.resource_type = resource_type
+        route.request.url = url
+        route.abort = AsyncMock()
+        route.continue_ = AsyncMock()
+        return route
+
+    async def test_blocks_non_essential_resources(self):
+        pool = BrowserPool()
+        for resource_type, url in [('image', 'https://m.media-amazon.com/poster.jpg'),
+                                   ('font', 'https://m.media-amazon.com/font.woff2'),
+                                   ('script', 'https://www.googletagmanager.com/gtm.js')]:
+            route = self.make_route(resource_type, url)
+            await pool.filter_request(route)
+            route.abort.assert_awaited_once()
+            route.continue_.assert_not_awaited()
+
+    async def test_allows_documents_and_api_calls(self):
+        pool = BrowserPool()
+        for resource_type in ('document', 'script', 'fetch', 'xhr'):
+            route = self.make_route(resource_type, 'https://www.imdb.com/search/title/')
+            await pool.filter_request(route)
+            route.continue_.assert_awaited_once()
+            route.abort.assert_not_awaited()
+
+    def make_browser(self, fail_contexts=0, fail_pages=0):
+        browser = MagicMock()
+        browser.is_connected.return_value = True
+        failures = {'contexts': fail_contexts, 'pages': fail_pages}
+
+        async def new_page():
+            if failures['pages']:
+                failures['pages'] -= 1
+                raise PlaywrightError('Target page, context or browser has been closed')
+            return AsyncMock()
+
+        async def new_context(**kwargs):
+            if failures['contexts']:
+                failures['contexts'] -= 1
+                raise PlaywrightError('Browser has been closed')
+            context = AsyncMock()
+            context.new_page.side_effect = new_page
+            return context
+
+        browser.new_context.side_effect = new_context
+        return browser
+
+    async def test_failed_contexts_and_pages_free_their_slot(self):
+        pool = BrowserPool(size=2, block_resources=False)
+        pool.playwright, pool.browser = MagicMock(), self.make_browser(fail_contexts=2, fail_pages=2)
+        for _ in range(4):
+            with self.assertRaises(PlaywrightError):
+                async with pool.page():
+                    pass
+        async with asyncio.timeout(1):
+            async with pool.page() as page:
+                self.assertIsNotNone(page)
+            async with pool.page(), pool.page():
+                pass
+
+    async def test_relaunches_disconnected_browser(self):
+        pool = BrowserPool(size=1, block_resources=False)
+        dead = self.make_browser()
+        pool.playwright, pool.browser = MagicMock(), dead
+        async with pool.page():
+            pass
+        dead.is_connected.return_value = False
+        relaunched = self.make_browser()
+        pool.playwright.chromium.launch = AsyncMock(return_value=relaunched)
+        async with asyncio.timeout(1):
+            async with pool.page():
+                pass
+        self.assertIs(pool.browser, relaunched)
+        relaunched.new_context.assert_called_once()
+
+
+class FakeSeeMore:
+    def __init__(self, page):
+        self.page = page
+        self.first = self
+
+    async def count(self):
+        return int(self.page.has_more)
+
+    async def click(self, timeout=None):
+        self.page.clicks += 1
+        if not self.page.stalled:
+            self.page.rendered = min(self.page.rendered + self.page.batch, len(self.page.items))
+            self.page.has_more = self.page.rendered < len(self.page.items)
+
+
+class FakeSearchPage:
+    """Stand-in for a Playwright page showing `batch` more result cards per "See more" click."""
+
+    def __init__(self, total, batch=3, stalled=False):
+        self.items = [{'href': f'/title/tt{n}/', 'title': f'{n + 1}. Movie {n}', 'year': '2001', 'rating': '7.0',
+                       'plot': None} for n in range(total)]
+        self.batch = batch
+        self.rendered = min(batch, total)
+        self.has_more = total > batch
+        self.stalled = stalled
+        self.clicks = 0
+
+    async def goto(self, url, wait_until=None):
+        pass
+
+    async def wait_for_selector(self, selector, timeout=None):
+        pass
+
+    async def eval_on_selector_all(self, selector, script, start):
+        return self.items[start:self.rendered]
+
+    def locator(self, selector):
+        return FakeSeeMore(self)
+
+    async def wait_for_function(self, script, arg=None, timeout=None):
+        if self.rendered <= arg:
+            raise PlaywrightTimeoutError('Timeout exceeded')
+
+
+class FakeBrowserPool:
+    def __init__(self, page):
+        self.fake_page = page
+
+    @asynccontextmanager
+    async def page(self):
+        yield self.fake_page
+
+
+class ListDiscoveryTests(IsolatedAsyncioTestCase):
+    async def discover(self, page, limit):
+        scraper = IMDBScraper('genre', 'comedy', limit, status=None, browser_pool=FakeBrowserPool(page),
+                              list_stall_timeout=0.01)
+        return [[card['imdb_id'] for card in batch] async for batch in scraper.iter_movie_links('https://imdb/')]
+
+    async def test_stops_at_limit(self):
+        page = FakeSearchPage(total=20)
+        batches = await self.discover(page, limit=7)
+        self.assertEqual(batches, [['tt0', 'tt1', 'tt2'], ['tt3', 'tt4', 'tt5'], ['tt6']])
+        self.assertEqual(page.clicks, 2)
+
+    async def test_stops_when_see_more_is_gone(self):
+        page = FakeSearchPage(total=5)
+        batches = await self.discover(page, limit=50)
+        self.assertEqual(sum(batches, []), ['tt0', 'tt1', 'tt2', 'tt3', 'tt4'])
+        self.assertEqual(page.clicks, 1)
+
+    async def test_stops_when_results_stall(self):
+        page = FakeSearchPage(total=20, stalled=True)
+        batches = await self.discover(page, limit=50)
+        self.assertEqual(batches, [['tt0', 'tt1', 'tt2']])
+        self.assertEqual(page.clicks, 1)
+
+
+class StructuredExtractionTests(SimpleTestCase):
+    def test_extracts_all_fields_from_embedded_json(self):
+        fields = extract_structured_fields(STRUCTURED_TITLE_PAGE_HTML)
+        self.assertEqual(fields, {
+            'title': 'Inception',
+            'year': '2010',
+            'rating': '8.8',
+            'directors': 'Christopher Nolan',
+            'cast': 'Leonardo DiCaprio, Joseph Gordon-Levitt',
+            'plot': 'Dreams inside dreams.',
+        })
+
+    def test_ld_json_alone_is_unescaped(self):
+        html = (
+            '<script type="application/ld+json">{"@type":"Movie","name":"Amélie&apos;s World",'
+            '"datePublished":"2001-04-25","creator":[{"@type":"Organization","name":"Studio"},'
+            '{"@type":"Person","name":"Jean-Pierre Jeunet"}]}</script>'
+        )
+        fields = extract_structured_fields(html)
+        self.assertEqual(fields['title'], "Amélie's World")
+        self.assertEqual(fields['year'], '2001')
+        self.assertEqual(fields['directors'], 'Jean-Pierre Jeunet')
+        self.assertNotIn('cast', fields)
+
+    def test_dom_fallback_only_for_missing_fields(self):
+        movie, missing = parse_movie_page(STRUCTURED_TITLE_PAGE_HTML.encode(), 'https://www.imdb.com/title/tt1375666/')
+        self.assertEqual(movie['plot'], 'Dreams inside dreams.')
+        self.assertEqual(missing, [])
+
+        movie, missing = parse_movie_page(TITLE_PAGE_HTML, 'https://www.imdb.com/title/tt1375666/')
+        self.assertEqual(movie['directors'], 'Christopher Nolan')
+        self.assertEqual(missing, ['title', 'year', 'rating', 'directors', 'cast', 'plot'])
+
+    def test_partial_ld_json_falls_back_to_hero(self):
+        html = TITLE_PAGE_HTML.replace('<html>', (
+            '<html><script type="application/ld+json">{"@type":"Movie","name":"Inception",'
+            '"creator":[{"@type":"Organization","name":"Legendary"}]}</script>'
+        ), 1)
+        movie, missing = parse_movie_page(html, 'https://www.imdb.com/title/tt1375666/')
+        self.assertEqual(missing, ['year', 'rating', 'directors', 'cast', 'plot'])
+        self.assertEqual((movie['title'], movie['year'], movie['rating'], movie['plot']),
+                         ('Inception', '2010', '8.8', 'Dreams inside dreams.'))
+        self.assertEqual(movie['directors'], 'Christopher Nolan')
+
+
+class ParserBackendTests(SimpleTestCase):
+    def test_dom_fields_identical_across_backends(self):
+        expected = parse_dom_fields(make_soup(TITLE_PAGE_HTML, 'html.parser', hero_only=False))
+        self.assertEqual(expected['cast'], 'Leonardo DiCaprio, Joseph Gordon-Levitt')
+        for backend in available_backends():
+            for hero_only in (True, False):
+                with self.subTest(backend=backend, hero_only=hero_only):
+                    soup = make_soup(TITLE_PAGE_HTML, backend, hero_only=hero_only)
+                    self.assertEqual(parse_dom_fields(soup), expected)
+
+    def test_hero_only_skips_rest_of_page(self):
+        soup = make_soup(TITLE_PAGE_HTML, 'html.parser', hero_only=True)
+        self.assertIsNone(soup.find('section', {'data-testid': 'MoreLikeThis'}))
+
+    def test_hero_only_falls_back_to_full_parse(self):
+        soup = make_soup('<html><body><h1 data-testid="hero__pageTitle">Solo</h1></body></html>', 'html.parser', hero_only=True)
+        self.assertEqual(soup.find('h1').get_text(), 'Solo')
+
+
+class ResponseCacheTests(SimpleTestCase):
+    def setUp(self):
+        self.cache_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.cache_dir.cleanup)
+
+    def test_round_trip_and_freshness(self):
+        cache = ResponseCache(self.cache_dir.name, ttl=60)
+        cache.put('https://www.imdb.com/title/tt1/', b'<html>tt1</html>', etag='"abc"')
+        entry = cache.get('https://www.imdb.com/title/tt1/')
+        self.assertEqual(entry.body, b'<html>tt1</html>')
+        self.assertTrue(entry.fresh)
+        self.assertEqual(entry.conditional_headers(), {'If-None-Match': '"abc"'})
+        self.assertIsNone(cache.get('https://www.imdb.com/title/tt2/'))
+
+        self.assertFalse(ResponseCache(self.cache_dir.name, ttl=0).get('https://www.imdb.com/title/tt1/').fresh)
+
+    def test_evicts_least_recently_used(self):
+        cache = ResponseCache(self.cache_dir.name)
+        for i in range(3):
+            cache.put(f'https://www.imdb.com/title/tt{i}/', bytes(range(256)) * 8)
+        cache.get('https://www.imdb.com/title/tt0/')
+        cache.max_bytes = cache.total_bytes - 1
+        cache.evict()
+
+        self.assertIsNotNone(cache.get('https://www.imdb.com/title/tt0/'))
+        self.assertIsNone(cache.get('https://www.imdb.com/title/tt1/'))
+        self.assertEqual(cache.stats['evictions'], 1)
+        self.assertEqual(len(ResponseCache(self.cache_dir.name).entries), 2)
+
+
+class CachedFetchTests(IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.requests = []
+
+        async def title_page(request):
+            self.requests.append(request.headers.get('If-None-Match'))
+            if request.headers.get('If-None-Match') == '"v1"':
+                return web.Response(status=304)
+            return web.Response(body=b'<html>Inception</html>', headers={'ETag': '"v1"'})
+
+        app = web.Application()
+        app.router.add_get('/title/tt1375666/', title_page)
+        self.runner = web.AppRunner(app)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, '127.0.0.1', 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.url = f'http://127.0.0.1:{port}/title/tt1375666/'
+
+        self.cache_dir = tempfile.TemporaryDirectory()
+
+    async def asyncTearDown(self):
+        await self.runner.cleanup()
+        self.cache_dir.cleanup()
+
+    async def test_serves_fresh_entries_and_revalidates_stale_ones(self):
+        cache = ResponseCache(self.cache_dir.name, ttl=60)
+        async with AsyncFetcher(cache=cache) as fetcher:
+            self.assertEqual(await fetcher.fetch(self.url), b'<html>Inception</html>')
+            self.assertEqual(await fetcher.fetch(self.url), b'<html>Inception</html>')
+        self.assertEqual(self.requests, [None])
+        self.assertEqual(fetcher.cache_stats['misses'], 1)
+        self.assertEqual(fetcher.cache_stats['hits'], 1)
+
+        # A second job sharing the cache only counts its own lookups
+        cache.ttl = 0
+        async with AsyncFetcher(cache=cache) as fetcher:
+            self.assertEqual(await fetcher.fetch(self.url), b'<html>Inception</html>')
+        self.assertEqual(self.requests, [None, '"v1"'])
+        self.assertEqual(dict(fetcher.cache_stats), {'revalidated': 1, 'bytes_saved': len(b'<html>Inception</html>'),
+                                                     'evictions': 0})
+
+    async def test_reports_only_network_downloads(self):
+        downloads = []
+
+        async def on_download(url, body):
+            downloads.append(body)
+
+        cache = ResponseCache(self.cache_dir.name, ttl=60)
+        async with AsyncFetcher(cache=cache, on_download=on_download) as fetcher:
+            await fetcher.fetch(self.url)
+            await fetcher.fetch(self.url)
+            cache.ttl = 0
+            await fetcher.fetch(self.url)
+        self.assertEqual(self.requests, [None, '"v1"'])
+        self.assertEqual(downloads, [b'<html>Inception</html>'])
+
+
+class AdaptiveConcurrencyTests(IsolatedAsyncioTestCase):
+    async def test_grows_additively_and_halves_on_throttling(self):
+        limiter = AdaptiveLimiter(initial=4, maximum=8)
+        for _ in range(5):
+            await limiter.release(await limiter.acquire())
+        self.assertEqual(int(limiter.limit), 5)
+
+        await limiter.release(await limiter.acquire(), THROTTLED)
+        self.assertEqual(int(limiter.limit), 2)
+        self.assertEqual([point['limit'] for point in limiter.summary()['curve']], [4, 5, 2])
+
+    async def test_retries_throttled_requests_honouring_retry_after(self):
+        responses = [web.Response(status=429, headers={'Retry-After': '0'}), web.Response(status=503),
+                     web.Response(body=b'<html>Inception</html>')]
+
+        async def title_page(request):
+            return responses.pop(0)
+
+        app = web.Application()
+        app.router.add_get('/title/tt1375666/', title_page)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, '127.0.0.1', 0)
+        await site.start()
+        url = f'http://127.0.0.1:{site._server.sockets[0].getsockname()[1]}/title/tt1375666/'
+        self.addAsyncCleanup(runner.cleanup)
+
+        limiter = AdaptiveLimiter(initial=4, maximum=8)
+        with patch('scraper.fetch.backoff_delay', return_value=0) as mock_delay:
+            async with AsyncFetcher(limiter=limiter, retries=2) as fetcher:
+                self.assertEqual(await fetcher.fetch(url), b'<html>Inception</html>')
+                self.assertEqual(mock_delay.call_args_list[0].args, (0, 0.0))
+                self.assertEqual((fetcher.stats['retries'], fetcher.stats['throttled']), (2, 2))
+
+                responses.extend(web.Response(status=503) for _ in range(3))
+                with self.assertRaises(aiohttp.ClientResponseError):
+                    await fetcher.fetch(url)
+                self.assertEqual(fetcher.stats['gave_up'], 1)
+        self.assertLess(limiter.limit, 4)
+        self.assertEqual(limiter.in_flight, 0)
+
+
+class MovieWriterTests(TestCase):
+    def test_upsert_updates_existing_imdb_id(self):
+        upsert_movies([Movie(imdb_id='tt0133093', title='The Matrix', year=1999, rating=8.6)])
+        upsert_movies([
+            Movie(imdb_id='tt0133093', title='The Matrix', year=1999, rating=8.5),
+            Movie(imdb_id='tt0133093', title='The Matrix', year=1999, rating=8.7),
+        ])
+        movie = Movie.objects.get(imdb_id='tt0133093')
+        self.assertEqual(float(movie.rating), 8.7)
+        self.assertEqual(Movie.objects.count(), 1)
+
+    def test_remakes_with_same_title_are_kept_apart(self):
+        upsert_movies([
+            Movie(imdb_id='tt0077745', title='Dune', year=1984),
+            Movie(imdb_id='tt1160419', title='Dune', year=2021),
+        ])
+        self.assertEqual(Movie.objects.filter(title='Dune').count(), 2)
+
+    def test_upsert_adopts_rows_saved_without_imdb_id(self):
+        legacy = Movie.objects.create(title='Inception', year=2010)
+        other = Movie.objects.create(title='Inception', year=1999)
+        upsert_movies([Movie(imdb_id='tt1375666', title='Inception', year='2010', rating=8.8)])
+        legacy.refresh_from_db()
+        self.assertEqual((legacy.imdb_id, float(legacy.rating)), ('tt1375666', 8.8))
+        self.assertEqual(Movie.objects.filter(title='Inception').count(), 2)
+        self.assertIsNone(Movie.objects.get(pk=other.pk).imdb_id)
+
+    def test_migration_removes_legacy_duplicates(self):
+        cleanup = import_module('scraper.migrations.0017_remove_legacy_duplicate_movies')
+        Movie.objects.bulk_create([Movie(title='Inception', year=2010), Movie(title='Inception', year=1999),
+                                   Movie(imdb_id='tt1375666', title='Inception', year=2010)])
+        cleanup.remove_legacy_duplicates(django_apps, None)
+        self.assertEqual(sorted(Movie.objects.values_list('year', 'imdb_id')), [(1999, None), (2010, 'tt1375666')])
+
+    def test_upsert_replaces_credits_only_for_written_fields(self):
+        upsert_movies([Movie(imdb_id='tt0133093', title='The Matrix', directors='Lana Wachowski, Lilly Wachowski',
+                             cast='Keanu Reeves, Laurence Fishburne, Keanu Reeves')])
+        upsert_movies([Movie(imdb_id='tt0234215', title='The Matrix Reloaded', cast='Keanu Reeves')])
+        matrix = Movie.objects.get(imdb_id='tt0133093')
+        credits = lambda: list(matrix.credits.order_by('role', 'order').values_list('role', 'person__name'))
+        self.assertEqual(credits(), [('cast', 'Keanu Reeves'), ('cast', 'Laurence Fishburne'),
+                                     ('director', 'Lana Wachowski'), ('director', 'Lilly Wachowski')])
+        self.assertEqual(Person.objects.filter(name='Keanu Reeves').count(), 1)
+
+        upsert_movies([Movie(imdb_id='tt0133093', title='The Matrix', cast='Carrie-Anne Moss')],
+                      ['title', 'cast'])
+        self.assertEqual(credits(), [('cast', 'Carrie-Anne Moss'),
+                                     ('director', 'Lana Wachowski'), ('director', 'Lilly Wachowski')])
+
+    def test_backfill_migration_builds_credits_in_chunks(self):
+        backfill = import_module('scraper.migrations.0015_backfill_credits')
+        Movie.objects.bulk_create([Movie(title=f'Movie {i}', directors='Jane Doe', cast=f'Actor {i}, Jane Doe')
+                                   for i in range(5)])
+        with patch.object(backfill, 'CHUNK_SIZE', 2):
+            backfill.backfill_credits(django_apps, None)
+        self.assertEqual(Credit.objects.filter(person__name='Jane Doe').count(), 10)
+        self.assertEqual(Person.objects.count(), 6)
+
+    @patch('scraper.writer.MovieWriter.write_batch', side_effect=written_count)
+    @patch('scraper.fetch.AsyncFetcher.fetch', new_callable=AsyncMock, return_value=TITLE_PAGE_HTML.encode())
+    async def test_batches_flush_on_size(self, mock_fetch, mock_write_batch):
+        scraper = IMDBScraper('genre', 'comedy', 10, status=None, concurrency=1, batch_size=2)
+        await scraper.scrape_details_concurrently([f'https://www.imdb.com/title/tt{i}/' for i in range(5)])
+        batches = [[m.imdb_id for m, *_ in call.args[0]] for call in mock_write_batch.call_args_list]
+        self.assertEqual(batches, [['tt0', 'tt1'], ['tt2', 'tt3'], ['tt4']])
+
+    async def test_flushes_partial_batch_on_interval(self):
+        writer = MovieWriter(batch_size=100, flush_interval=0.01)
+        with patch.object(MovieWriter, 'write_batch', side_effect=written_count) as mock_write_batch:
+            writer.start()
+            await writer.put(Movie(imdb_id='tt1', title='One'))
+            await asyncio.sleep(0.1)
+            self.assertEqual(mock_write_batch.call_count, 1)
+            await writer.close()
+        self.assertEqual(writer.written, 1)
+
+    def test_write_batch_counts_progress_on_job(self):
+        status = ScraperStatus.objects.create(search_type='genre', search_value='comedy', scraped_movies=3)
+        MovieWriter(status).write_batch([
+            (Movie(imdb_id='tt1', title='One'), MOVIE_UPDATE_FIELDS, False),
+            (Movie(imdb_id='tt2', title='Two'), MOVIE_UPDATE_FIELDS, False),
+        ])
+        status.refresh_from_db()
+        self.assertEqual(status.scraped_movies, 5)
+
+    @patch('scraper.writer.MovieWriter.write_batch', side_effect=RuntimeError('database is locked'))
+    @patch('scraper.fetch.AsyncFetcher.fetch', new_callable=AsyncMock, return_value=TITLE_PAGE_HTML.encode())
+    async def test_write_failure_stops_pipeline(self, mock_fetch, mock_write_batch):
+        scraper = IMDBScraper('genre', 'comedy', 50, status=None, concurrency=2, batch_size=1)
+        with self.assertRaisesMessage(RuntimeError, 'database is locked'):
+            await asyncio.wait_for(
+                scraper.scrape_details_concurrently([f'https://www.imdb.com/title/tt{i}/' for i in range(50)]),
+                timeout=5,
+            )
+
+
+class JobQueueTests(TestCase):
+    def make_job(self, **fields):
+        return ScraperStatus.objects.create(search_type='genre', search_value='comedy', **fields)
+
+    def test_claims_oldest_pending_job_once(self):
+        first = self.make_job()
+        second = self.make_job()
+        self.assertEqual(claim_job('worker-a').pk, first.pk)
+        self.assertEqual(claim_job('worker-b').pk, second.pk)
+        self.assertIsNone(claim_job('worker-c'))
+
+        first.refresh_from_db()
+        self.assertEqual((first.status, first.lease_owner, first.attempts), ('running', 'worker-a', 1))
+
+    def test_reclaims_expired_lease(self):
+        job = self.make_job()
+        claim_job('crashed-worker', lease_seconds=60)
+        self.assertIsNone(claim_job('worker-b'))
+
+        ScraperStatus.objects.filter(pk=job.pk).update(lease_expires_at=timezone.now() - timedelta(seconds=1))
+        reclaimed = claim_job('worker-b')
+        self.assertEqual((reclaimed.pk, reclaimed.lease_owner, reclaimed.attempts), (job.pk, 'worker-b', 2))
+        self.assertFalse(renew_lease(job, 'crashed-worker'))
+        self.assertTrue(renew_lease(job, 'worker-b'))
+
+    def test_gives_up_after_max_attempts(self):
+        job = self.make_job(status='running', attempts=MAX_ATTEMPTS, lease_owner='dead',
+                            lease_expires_at=timezone.now() - timedelta(seconds=1))
+        self.assertIsNone(claim_job('worker-a'))
+        job.refresh_from_db()
+        self.assertEqual(job.status, 'error')
+
+    def test_enqueue_leaves_live_jobs_alone(self):
+        job = self.make_job()
+        claim_job('worker-a')
+        job.refresh_from_db()
+        self.assertFalse(enqueue_job(job))
+
+        release_job(job, 'worker-a')
+        job.refresh_from_db()
+        self.assertTrue(enqueue_job(job))
+        self.assertEqual((job.status, job.attempts), ('pending', 0))
+
+
+class ListModeTests(TestCase):
+    CARDS = [
+        {'url': 'https://www.imdb.com/title/tt1375666/?ref_=sr_t_1', 'title': '1. Inception',
+         'year': '2010', 'rating': '8.8', 'plot': 'A thief who steals corporate secrets.'},
+        {'url': 'https://www.imdb.com/title/tt0816692/?ref_=sr_t_2', 'title': '2. Interstellar',
+         'year': '2014', 'rating': None, 'plot': None},
+    ]
+
+    def test_card_fields_are_normalized(self):
+        self.assertEqual(fields_from_card(self.CARDS[0]), {
+            'url': self.CARDS[0]['url'], 'imdb_id': 'tt1375666', 'title': 'Inception', 'year': 2010,
+            'rating': 8.8, 'directors': None, 'cast': None, 'plot': 'A thief who steals corporate secrets.',
+        })
+
+    async def scrape(self, mode):
+        async def cards(url):
+            yield [fields_from_card(card) for card in self.CARDS]
+
+        scraper = IMDBScraper('genre', 'sci-fi', 10, status=None, concurrency=2, mode=mode)
+        with patch.object(scraper, 'iter_movie_links', cards), \
+                patch('scraper.fetch.AsyncFetcher.fetch', new_callable=AsyncMock,
+                      return_value=TITLE_PAGE_HTML.encode()) as mock_fetch:
+            found = await scraper.scrape_details_concurrently(scraper.iter_movie_links(''))
+        return found, mock_fetch.await_count
+
+    async def test_list_only_writes_cards_without_detail_requests(self):
+        await Movie.objects.acreate(imdb_id='tt0816692', title='Interstellar', directors='Christopher Nolan')
+        self.assertEqual(await self.scrape('list-only'), (2, 0))
+
+        inception = await Movie.objects.aget(imdb_id='tt1375666')
+        self.assertEqual((inception.title, inception.year, float(inception.rating)), ('Inception', 2010, 8.8))
+        interstellar = await Movie.objects.aget(imdb_id='tt0816692')
+        self.assertEqual((interstellar.year, interstellar.directors), (2014, 'Christopher Nolan'))
+
+    async def test_hybrid_fetches_only_missing_fields(self):
+        self.assertEqual(await self.scrape('hybrid'), (2, 2))
+
+        inception = await Movie.objects.aget(imdb_id='tt1375666')
+        self.assertEqual(inception.plot, 'A thief who steals corporate secrets.')
+        self.assertEqual(inception.directors, 'Christopher Nolan')
+        interstellar = await Movie.objects.aget(imdb_id='tt0816692')
+        # The detail page filled in what the card lacked, but kept the card's title and year
+        self.assertEqual((interstellar.title, interstellar.year, interstellar.plot),
+                         ('Interstellar', 2014, 'Dreams inside dreams.'))
+
+
+class TitleDedupTests(TestCase):
+    async def test_concurrent_jobs_fetch_each_title_once(self):
+        flights = TitleFlights(owner='worker-a')
+        links = [f'https://www.imdb.com/title/tt{i}/' for i in range(4)]
+
+        async def fetch(url):
+            await asyncio.sleep(0.05)
+            return TITLE_PAGE_HTML.encode()
+
+        scrapers = [IMDBScraper('genre', genre, 10, status=None, concurrency=4, title_flights=flights)
+                    for genre in ('action', 'thriller')]
+        with patch('scraper.fetch.AsyncFetcher.fetch', side_effect=fetch) as mock_fetch:
+            await asyncio.gather(*(scraper.scrape_details_concurrently(links) for scraper in scrapers))
+
+        self.assertEqual(mock_fetch.await_count, 4)
+        self.assertEqual(sum(scraper.dedup_stats['joined'] for scraper in scrapers), 4)
+        self.assertEqual(await Movie.objects.filter(last_scraped__isnull=False).acount(), 4)
+        self.assertFalse(await TitleLease.objects.aexists())
+
+    @patch('scraper.fetch.AsyncFetcher.fetch', new_callable=AsyncMock, return_value=TITLE_PAGE_HTML.encode())
+    async def test_skips_titles_scraped_within_freshness_window(self, mock_fetch):
+        await Movie.objects.acreate(imdb_id='tt1', title='Inception', last_scraped=timezone.now())
+        scraper = IMDBScraper('genre', 'comedy', 10, status=None, concurrency=1, fresh_within=60)
+        await scraper.scrape_details_concurrently(['https://www.imdb.com/title/tt1/', 'https://www.imdb.com/title/tt2/'])
+        self.assertEqual([call.args[0] for call in mock_fetch.await_args_list], ['https://www.imdb.com/title/tt2/'])
+        self.assertEqual(scraper.dedup_stats['fresh'], 1)
+
+    @patch('scraper.dedup.LEASE_POLL_INTERVAL', 0.01)
+    async def test_waits_for_title_leased_by_another_worker(self):
+        await sync_to_async(acquire_title_lease)('tt1', 'worker-b')
+        scrape = AsyncMock(return_value={'title': 'Inception'})
+        stats = Counter()
+        waiting = asyncio.create_task(TitleFlights(owner='worker-a').run('tt1', scrape, stats))
+        await asyncio.sleep(0.05)
+        self.assertFalse(waiting.done())
+
+        await Movie.objects.acreate(imdb_id='tt1', title='Inception', last_scraped=timezone.now())
+        await sync_to_async(release_title_leases)(['tt1'], 'worker-b')
+        self.assertIsNone(await asyncio.wait_for(waiting, timeout=5))
+        scrape.assert_not_awaited()
+        self.assertEqual((stats['lease_waits'], stats['remote']), (1, 1))
+
+
+class MultiQueryTests(TransactionTestCase):
+    @patch('scraper.fetch.AsyncFetcher.fetch', new_callable=AsyncMock, return_value=TITLE_PAGE_HTML.encode())
+    async def test_queries_share_one_frontier(self, mock_fetch):
+        results = {'action': ['tt1', 'tt2', 'tt3'], 'thriller': ['tt2', 'tt3', 'tt4']}
+
+        async def links(url):
+            yield [f'https://www.imdb.com/title/{imdb_id}/' for imdb_id in results[url.rsplit('=', 1)[1]]]
+
+        job = await ScraperStatus.objects.acreate(search_type='genre', search_value='action',
+                                                  queries=[{'type': 'genre', 'value': 'thriller'}])
+        scraper = IMDBScraper('genre', 'action', 10, status=job, concurrency=2, queries=job.search_queries())
+        with patch.object(scraper, 'iter_movie_links', links):
+            await scraper.run()
+
+        self.assertEqual(mock_fetch.await_count, 4)
+        await job.arefresh_from_db()
+        self.assertEqual(job.scraped_movies, 4)
+        queries = job.stats['queries']
+        self.assertEqual(queries['genre:action']['links'] + queries['genre:thriller']['links'], 6)
+        self.assertEqual(queries['genre:action']['new'] + queries['genre:thriller']['new'], 4)
+        self.assertEqual(queries['genre:action']['discovery_complete'], 1)
+
+    @patch('scripts.management.commands.scraper.run_scrape_job', new_callable=AsyncMock)
+    def test_command_accepts_repeated_queries(self, mock_run_scrape_job):
+        call_command('scraper', '--query', 'genre:action', '--query', 'keyword:heist movie', '--limit', '5')
+        job = mock_run_scrape_job.await_args.args[0]
+        job.refresh_from_db()
+        self.assertEqual((job.search_type, job.search_value), ('genre', 'action'))
+        self.assertEqual(job.search_queries(), [('genre', 'action'), ('keyword', 'heist movie')])
+
+        with self.assertRaises(CommandError):
+            call_command('scraper', '--limit', '5')
+
+    @patch('scripts.management.commands.scraper.run_scrape_job', new_callable=AsyncMock)
+    def test_resume_keeps_stored_job_config(self, mock_run_scrape_job):
+        job = ScraperStatus.objects.create(search_type='genre', search_value='action', limit=7, mode='hybrid',
+                                           queries=[{'type': 'keyword', 'value': 'heist'}], status='error')
+        call_command('scraper', '--job_id', str(job.job_id))
+        resumed = mock_run_scrape_job.await_args.args[0]
+        self.assertEqual(resumed.pk, job.pk)
+        self.assertEqual((resumed.limit, resumed.mode), (7, 'hybrid'))
+        self.assertEqual(resumed.search_queries(), [('genre', 'action'), ('keyword', 'heist')])
+
+        call_command('scraper', '--job_id', str(job.job_id), '--limit', '20')
+        job.refresh_from_db()
+        self.assertEqual((job.limit, job.mode, job.queries), (20, 'hybrid', [{'type': 'keyword', 'value': 'heist'}]))
+
+        with self.assertRaises(CommandError):
+            call_command('scraper', '--job_id', str(uuid.uuid4()))
+
+    @patch('scripts.management.commands.scraper.run_scrape_job', new_callable=AsyncMock)
+    def test_command_jobs_are_never_claimed_by_workers(self, mock_run_scrape_job):
+        async def check_unclaimable(status, **kwargs):
+            self.assertEqual(await ScraperStatus.objects.filter(pk=status.pk).values_list('status').aget(),
+                             ('running',))
+            self.assertIsNone(await sync_to_async(claim_job)('worker-a'))
+
+        mock_run_scrape_job.side_effect = check_unclaimable
+        call_command('scraper', '--type', 'genre', '--value', 'action')
+        job = ScraperStatus.objects.get()
+        call_command('scraper', '--job_id', str(job.job_id))
+        self.assertEqual(mock_run_scrape_job.await_count, 2)
+
+    @patch('scripts.management.commands.scraper.run_scrape_job', new_callable=AsyncMock)
+    def test_refuses_job_leased_by_a_worker(self, mock_run_scrape_job):
+        job = ScraperStatus.objects.create(search_type='genre', search_value='action')
+        claim_job('worker-a')
+        with self.assertRaisesMessage(CommandError, 'worker-a'):
+            call_command('scraper', '--job_id', str(job.job_id))
+        mock_run_scrape_job.assert_not_awaited()
+
+        # Once the worker's lease has lapsed the job can be taken over
+        ScraperStatus.objects.filter(pk=job.pk).update(lease_expires_at=timezone.now() - timedelta(seconds=1))
+        call_command('scraper', '--job_id', str(job.job_id))
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.lease_owner), ('running', None))
+        mock_run_scrape_job.assert_awaited_once()
+
+
+class RefreshTests(TestCase):
+    def test_candidates_ranked_by_how_overdue_they_are(self):
+        now = timezone.now()
+        Movie.objects.bulk_create([
+            Movie(imdb_id='tt1', title='Never scraped', year=1990),
+            Movie(imdb_id='tt2', title='New release', year=now.year, last_scraped=now - timedelta(days=2)),
+            Movie(imdb_id='tt3', title='Classic', year=1990, last_scraped=now - timedelta(days=10)),
+            Movie(imdb_id='tt4', title='Recent', year=now.year - 3, last_scraped=now - timedelta(days=14)),
+            Movie(imdb_id='tt5', title='Older', year=now.year - 3, last_scraped=now - timedelta(days=8)),
+        ])
+        self.assertEqual(list(refresh_candidates(budget=3, now=now)), ['tt1', 'tt2', 'tt4'])
+        self.assertEqual(list(refresh_candidates(budget=10, now=now)), ['tt1', 'tt2', 'tt4', 'tt5'])
+
+    @patch('scraper.fetch.AsyncFetcher.fetch', new_callable=AsyncMock, return_value=TITLE_PAGE_HTML.encode())
+    async def test_unchanged_titles_only_record_the_check(self, mock_fetch):
+        checked_at = timezone.now() - timedelta(days=3)
+        await Movie.objects.acreate(imdb_id='tt1375666', title='Inception', last_scraped=checked_at)
+        links = ['https://www.imdb.com/title/tt1375666/']
+
+        scraper = IMDBScraper(None, '', 1, status=None, known_hashes={'tt1375666': None}, fresh_within=0)
+        await scraper.scrape_details_concurrently(links)
+        movie = await Movie.objects.aget(imdb_id='tt1375666')
+        self.assertEqual((movie.directors, scraper.content_stats['changed']), ('Christopher Nolan', 1))
+
+        await Movie.objects.filter(pk=movie.pk).aupdate(last_scraped=checked_at, plot='Edited by hand')
+        scraper = IMDBScraper(None, '', 1, status=None, known_hashes={'tt1375666': movie.content_hash}, fresh_within=0)
+        await scraper.scrape_details_concurrently(links)
+        refreshed = await Movie.objects.aget(imdb_id='tt1375666')
+        self.assertEqual(scraper.content_stats['unchanged'], 1)
+        self.assertEqual((refreshed.plot, refreshed.updated), ('Edited by hand', movie.updated))
+        self.assertGreater(refreshed.last_scraped, checked_at)
+
+
+class PageArchiveTests(TestCase):
+    def setUp(self):
+        self.archive_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.archive_dir.cleanup)
+
+    def test_latest_copy_of_each_title_wins(self):
+        archive = PageArchive(self.archive_dir.name, segment_bytes=1)
+        archive.append('tt1', 'https://www.imdb.com/title/tt1/', b'<html>old</html>')
+        archive.append('tt2', 'https://www.imdb.com/title/tt2/', '<html>other</html>')
+        archive.append('tt1', 'https://www.imdb.com/title/tt1/', b'<html>new</html>')
+        archive.close()
+        with open(next(Path(self.archive_dir.name).glob('*.idx')), 'a') as f:
+            f.write('tt3\t0\t')
+
+        pages = PageArchive(self.archive_dir.name).latest_pages()
+        self.assertEqual([(page.imdb_id, page.read()) for page in pages],
+                         [('tt1', b'<html>new</html>'), ('tt2', b'<html>other</html>')])
+        self.assertEqual(len(list(Path(self.archive_dir.name).glob('*.pages'))), 3)
+
+    @patch('scraper.fetch.AsyncFetcher.fetch', new_callable=AsyncMock, return_value=TITLE_PAGE_HTML.encode())
+    async def test_reparse_rebuilds_movies_from_archive(self, mock_fetch):
+        archive = PageArchive(self.archive_dir.name)
+        scraper = IMDBScraper('genre', 'sci-fi', 1, status=None, archive=archive)
+        await scraper.scrape_details_concurrently(['https://www.imdb.com/title/tt1375666/'])
+        # fetch() is mocked, so hand the page to the download hook the fetcher would call
+        await scraper.archive_page('https://www.imdb.com/title/tt1375666/', TITLE_PAGE_HTML.encode())
+        archive.close()
+        await Movie.objects.filter(imdb_id='tt1375666').aupdate(directors='Broken parser', content_hash=None)
+
+        out = StringIO()
+        await sync_to_async(call_command)('reparse', '--archive-dir', self.archive_dir.name, '--workers', '0', stdout=out)
+        movie = await Movie.objects.aget(imdb_id='tt1375666')
+        self.assertEqual(movie.directors, 'Christopher Nolan')
+        self.assertIn('1 changed', out.getvalue())
+
+        out = StringIO()
+        await sync_to_async(call_command)('reparse', '--archive-dir', self.archive_dir.name, '--workers', '0', stdout=out)
+        self.assertIn('0 changed, 1 unchanged', out.getvalue())
+        self.assertEqual(mock_fetch.await_count, 1)
+
+
+class JobCheckpointTests(TestCase):
+    def make_job(self, **fields):
+        return ScraperStatus.objects.create(search_type='genre', search_value='comedy', limit=10, **fields)
+
+    @patch('scraper.fetch.AsyncFetcher.fetch', new_callable=AsyncMock, return_value=TITLE_PAGE_HTML.encode())
+    async def test_resume_skips_discovery_and_done_titles(self, mock_fetch):
+        job = await sync_to_async(self.make_job)(discovery_complete=True)
+        await ScrapeJobItem.objects.abulk_create([
+            ScrapeJobItem(job=job, imdb_id='tt1', state='done'),
+            ScrapeJobItem(job=job, imdb_id='tt2'),
+            ScrapeJobItem(job=job, imdb_id='tt3', state='failed'),
+        ])
+        scraper = IMDBScraper('genre', 'comedy', 10, status=job, concurrency=1)
+        with patch.object(scraper, 'iter_movie_links', side_effect=AssertionError('discovery re-ran')):
+            await scraper.run()
+
+        fetched = [call.args[0] for call in mock_fetch.await_args_list]
+        self.assertEqual(fetched, ['https://www.imdb.com/title/tt2/', 'https://www.imdb.com/title/tt3/'])
+        await job.arefresh_from_db()
+        self.assertEqual((job.status, job.scraped_movies), ('completed', 3))
+        self.assertFalse(await job.items.exclude(state='done').aexists())
+
+    async def test_records_discovered_and_failed_titles(self):
+        job = await sync_to_async(self.make_job)()
+
+        async def links(url):
+            yield ['https://www.imdb.com/title/tt1/', 'https://www.imdb.com/title/tt2/']
+
+        async def fetch(url):
+            if 'tt2' in url:
+                raise aiohttp.ClientError('boom')
+            return TITLE_PAGE_HTML.encode()
+
+        scraper = IMDBScraper('genre', 'comedy', 10, status=job, concurrency=1, retries=0)
+        with patch.object(scraper, 'iter_movie_links', links), \
+                patch('scraper.fetch.AsyncFetcher.fetch', side_effect=fetch):
+            await scraper.run()
+
+        await job.arefresh_from_db()
+        self.assertTrue(job.discovery_complete)
+        states = {item.imdb_id: item.state async for item in job.items.all()}
+        self.assertEqual(states, {'tt1': 'done', 'tt2': 'failed'})
+        # Discovered titles, and the ones actually written
+        self.assertEqual((job.status, job.total_movies, job.scraped_movies), ('completed', 2, 1))
+
+        await sync_to_async(enqueue_job)(job)
+        self.assertFalse(job.discovery_complete)
+        self.assertFalse(await job.items.aexists())
+
+    async def test_malformed_page_fails_only_its_title(self):
+        self.addCleanup(close_parse_pool)
+        links = [f'https://www.imdb.com/title/tt{i}/' for i in range(1, 6)]
+        # A rating without its <span> makes the DOM fallback raise AttributeError
+        broken = ('<html><body><h1 data-testid="hero__pageTitle">Broken</h1>'
+                  '<div data-testid="hero-rating-bar__aggregate-rating__score">8.1</div></body></html>')
+
+        async def discovered(url):
+            yield links
+
+        async def fetch(url):
+            return (broken if 'tt3' in url else TITLE_PAGE_HTML).encode()
+
+        for parse_workers in (0, 2):
+            with self.subTest(parse_workers=parse_workers):
+                job = await sync_to_async(self.make_job)()
+                scraper = IMDBScraper('genre', 'comedy', 10, status=job, concurrency=2, parse_workers=parse_workers,
+                                      fresh_within=0)
+                with patch.object(scraper, 'iter_movie_links', discovered), \
+                        patch('scraper.fetch.AsyncFetcher.fetch', side_effect=fetch):
+                    await scraper.run()
+
+                states = {item.imdb_id: item.state async for item in job.items.all()}
+                self.assertEqual(states, {'tt1': 'done', 'tt2': 'done', 'tt3': 'failed', 'tt4': 'done', 'tt5': 'done'})
+                self.assertEqual(await Movie.objects.filter(imdb_id__in=['tt1', 'tt2', 'tt4', 'tt5']).acount(), 4)
+
+    async def test_page_without_title_fails_only_its_title(self):
+        job = await sync_to_async(self.make_job)()
+
+        async def links(url):
+            yield ['https://www.imdb.com/title/tt1/', 'https://www.imdb.com/title/tt2/']
+
+        async def fetch(url):
+            return b'<html><body>Are you a robot?</body></html>' if 'tt2' in url else TITLE_PAGE_HTML.encode()
+
+        scraper = IMDBScraper('genre', 'comedy', 10, status=job, concurrency=1, fresh_within=0)
+        with patch.object(scraper, 'iter_movie_links', links), \
+                patch('scraper.fetch.AsyncFetcher.fetch', side_effect=fetch):
+            await scraper.run()
+
+        states = {item.imdb_id: item.state async for item in job.items.all()}
+        self.assertEqual(states, {'tt1': 'done', 'tt2': 'failed'})
+        self.assertEqual([movie.imdb_id async for movie in Movie.objects.all()], ['tt1'])
+
+
+class ScraperWorkerTests(TransactionTestCase):
+    @patch('scripts.management.commands.scraper_worker.run_scrape_job', new_callable=AsyncMock)
+    def test_worker_runs_queued_jobs(self, mock_run_scrape_job):
+        jobs = [ScraperStatus.objects.create(search_type='genre', search_value=value) for value in ('comedy', 'drama')]
+        call_command('scraper_worker', '--concurrency', '2', '--once', '--poll-interval', '0.01')
+
+        self.assertEqual(sorted(call.args[0].pk for call in mock_run_scrape_job.await_args_list), [j.pk for j in jobs])
+        for job in jobs:
+            job.refresh_from_db()
+            self.assertIsNone(job.lease_owner)
@@ -0,0 +1,150 @@
+import asyncio
+import random
+import time
+from collections import Counter
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+INITIAL_CONCURRENCY = 10
+MIN_CONCURRENCY = 1
+BACKOFF_FACTOR = 0.5
+LATENCY_TOLERANCE = 2.0
+LATENCY_SLACK = 0.05
+MAX_ERROR_RATE = 0.05
+LATENCY_SMOOTHING = 0.2
+MAX_CURVE_POINTS = 200
+
+DEFAULT_RETRIES = 4
+RETRY_BACKOFF_BASE = 0.5
+RETRY_BACKOFF_MAX = 30
+MAX_RETRY_AFTER = 300
+
+OK = 'ok'
+THROTTLED = 'throttled'
+ERROR = 'error'
+
+
+class AdaptiveLimiter:
+    """
+    AIMD limit on in-flight requests. Each healthy response adds 1/limit to
+    the limit, so it grows by about one per round trip of requests. A
+    throttling signal (429, 503, timeout) multiplies it by `backoff`, at most
+    once per round trip. Growth stops while the smoothed latency exceeds
+    `latency_tolerance` times the fastest latency seen (plus a little slack
+    for jitter on very fast responses), or while the recent
+    error rate is above `max_error_rate`.
+    """
+
+    def __init__(self, initial=INITIAL_CONCURRENCY, maximum=None, minimum=MIN_CONCURRENCY,
+                 backoff=BACKOFF_FACTOR, latency_tolerance=LATENCY_TOLERANCE, max_error_rate=MAX_ERROR_RATE):
+        self.maximum = maximum or initial
+        self.minimum = minimum
+        self.initial = max(minimum, min(initial, self.maximum))
+        self.limit = float(self.initial)
+        self.backoff = backoff
+        self.latency_tolerance = latency_tolerance
+        self.max_error_rate = max_error_rate
+
+        self.in_flight = 0
+        self.changed = asyncio.Condition()
+        self.latency = None
+        self.min_latency = None
+        self.error_rate = 0.0
+        self.last_cut = 0.0
+        self.peak = self.initial
+        self.stats = Counter()
+        self.started = time.monotonic()
+        self.curve = []
+        self.record()
+
+    async def acquire(self):
+        async with self.changed:
+            await self.changed.wait_for(lambda: self.in_flight < int(self.limit))
+            self.in_flight += 1
+        return time.monotonic()
+
+    async def release(self, started, outcome=OK):
+        now = time.monotonic()
+        async with self.changed:
+            self.in_flight -= 1
+            self.changed.notify_all()
+            if outcome is None:
+                # Cancelled requests say nothing about the server
+                return
+            self.stats[outcome] += 1
+            previous = int(self.limit)
+            if outcome == THROTTLED:
+                self.decrease(now)
+            else:
+                self.error_rate += LATENCY_SMOOTHING * ((outcome == ERROR) - self.error_rate)
+                if outcome == OK:
+                    self.observe(now - started)
+                    if self.healthy():
+                        self.limit = min(self.maximum, self.limit + 1 / self.limit)
+            if int(self.limit) != previous:
+                self.peak = max(self.peak, int(self.limit))
+                self.record()
+                self.changed.notify_all()
+
+    def observe(self, latency):
+        self.min_latency = latency if self.min_latency is None else min(self.min_latency, latency)
+        if self.latency is None:
+            self.latency = latency
+        else:
+            self.latency += LATENCY_SMOOTHING * (latency - self.latency)
+
+    def healthy(self):
+        return (self.error_rate <= self.max_error_rate
+                and self.latency <= self.min_latency * self.latency_tolerance + LATENCY_SLACK)
+
+    def decrease(self, now):
+        # Requests in flight when the server pushed back report it too; cut once per round trip
+        if now - self.last_cut < (self.latency or 0):
+            return
+        self.last_cut = now
+        self.limit = max(self.minimum, self.limit * self.backoff)
+        self.stats['cuts'] += 1
+
+    def record(self):
+        self.curve.append({
+            't': round(time.monotonic() - self.started, 2),
+            'limit': int(self.limit),
+            'latency_ms': round(self.latency * 1000) if self.latency is not None else None,
+        })
+        if len(self.curve) > MAX_CURVE_POINTS:
+            self.curve = self.curve[::2]
+
+    def summary(self):
+        return {
+            'initial': self.initial,
+            'peak': self.peak,
+            'final': int(self.limit),
+            'latency_ms': round(self.latency * 1000) if self.latency is not None else None,
+            'responses': dict(self.stats),
+            'curve': self.curve,
+        }
+
+
+def retry_after_seconds(value):
+    """Parses a Retry-After header given either as seconds or as an HTTP date."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+def backoff_delay(attempt, retry_after=None, base=RETRY_BACKOFF_BASE, cap=RETRY_BACKOFF_MAX):
+    """Full-jitter exponential backoff, never shorter than the server's Retry-After."""
+    delay = random.uniform(0, min(cap, base * 2 ** attempt))
+    if retry_after is not None:
+        delay = max(delay, min(retry_after, MAX_RETRY_AFTER))
+    return delay
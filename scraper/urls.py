@@ -1,9 +1,10 @@
 
 from django.urls import path
-from .views import MovieListAPIView
+from .views import MovieExportView, MovieListAPIView
 
 
 urlpatterns = [
     path('movies/', MovieListAPIView.as_view(), name='scraper-movie-list'),
+    path('movies/export/', MovieExportView.as_view(), name='scraper-movie-export'),
 ]
 
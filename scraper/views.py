@@ -1,22 +1,96 @@
+from django.conf import settings
+from django.http import StreamingHttpResponse
+from rest_framework import status
+from rest_framework.exceptions import ValidationError
+from rest_framework.renderers import BrowsableAPIRenderer
 from rest_framework.generics import ListAPIView
-from rest_framework.filters import SearchFilter, OrderingFilter
+from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
+from .catalog import CachedResponse, count_stat
+from .export import EXPORT_FORMATS, export_chunks
+from .filters import MovieFilter, MovieOrderingFilter, MovieSearchFilter
 from .models import Movie
-from .serializers import MovieSerializer
-from rest_framework.pagination import PageNumberPagination
-
-class CustomPageSizePagination(PageNumberPagination):
-    page_size = 10  # default
-    page_size_query_param = 'per_page'
-    max_page_size = 100
+from .pagination import CustomPageSizePagination
+from .renderers import FastJSONRenderer
+from .serializers import MovieSerializer, RowConverter
 
 class MovieListAPIView(ListAPIView):
     serializer_class = MovieSerializer
     queryset = Movie.objects.all().order_by('-id')
     pagination_class = CustomPageSizePagination
+    renderer_classes = [FastJSONRenderer, BrowsableAPIRenderer]
+    row_converter = RowConverter(MovieSerializer)
 
-    filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
+    # Search runs after ordering so it can rank results when no ?ordering= is given
+    filter_backends = [DjangoFilterBackend, MovieOrderingFilter, MovieSearchFilter]
     search_fields = ['title', 'directors', 'cast', 'plot', 'year']
-    filterset_fields = ['year', 'rating']
+    filterset_class = MovieFilter
     ordering_fields = ['title', 'year', 'rating', 'created']
     ordering = ['-id']
+
+    def list(self, request, *args, **kwargs):
+        # Responses only change when movies are written, so they are cached per catalog version
+        cached = CachedResponse(request, 'movie-list')
+        if not cached.timeout:
+            return self.list_movies(request)
+        if cached.not_modified(request):
+            count_stat('not_modified')
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            data = cached.get()
+            if data is None:
+                count_stat('misses')
+                response = self.list_movies(request)
+                cached.set(response.data)
+            else:
+                count_stat('hits')
+                response = Response(data)
+            response['X-Cache'] = 'HIT' if data is not None else 'MISS'
+        response['ETag'] = cached.etag
+        return response
+
+    def list_movies(self, request):
+        """
+        The list response. With SCRAPER_API_FAST_PATH rows are fetched with
+        .values() and converted straight to the serializer's output, so no
+        Movie instances or per-field serializer calls are needed; the
+        payload is identical either way.
+        """
+        if not getattr(settings, 'SCRAPER_API_FAST_PATH', True):
+            return super().list(request)
+        queryset = self.filter_queryset(self.get_queryset())
+        # Ordering columns ride along for keyset cursors and are dropped by the converter
+        ordering = [field.lstrip('-') for field in queryset.query.order_by if isinstance(field, str)]
+        rows = queryset.values(*dict.fromkeys(self.row_converter.sources + ordering))
+
+        page = self.paginate_queryset(rows)
+        data = [self.row_converter(row) for row in (rows if page is None else page)]
+        return self.get_paginated_response(data) if page is not None else Response(data)
+
+
+class MovieExportView(MovieListAPIView):
+    """
+    Every movie matching the list view's filters, streamed unpaginated as
+    ?file_format=ndjson (default) or csv; ?compression=gzip gzips it.
+    """
+
+    def perform_content_negotiation(self, request, force=False):
+        # The format comes from ?file_format=, so clients asking for text/csv or
+        # application/x-ndjson are not refused; errors are rendered as JSON
+        renderer = self.get_renderers()[0]
+        return renderer, renderer.media_type
+
+    def get(self, request, *args, **kwargs):
+        file_format = request.query_params.get('file_format', 'ndjson')
+        if file_format not in EXPORT_FORMATS:
+            raise ValidationError({'file_format': [f"Choose one of: {', '.join(EXPORT_FORMATS)}."]})
+        compress = request.query_params.get('compression') == 'gzip'
+
+        queryset = self.filter_queryset(self.get_queryset())
+        filename = f"movies.{file_format}{'.gz' if compress else ''}"
+        response = StreamingHttpResponse(
+            export_chunks(queryset, file_format, compress),
+            content_type='application/gzip' if compress else EXPORT_FORMATS[file_format],
+        )
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        return response
@@ -0,0 +1,167 @@
+import asyncio
+import logging
+import time
+
+from asgiref.sync import sync_to_async
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from scraper.catalog import bump_catalog_version
+from scraper.credits import CREDIT_FIELDS, sync_credits
+from scraper.dedup import release_title_leases
+from scraper.models import Movie, ScraperStatus
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 500
+FLUSH_INTERVAL = 5
+MOVIE_UPDATE_FIELDS = ['title', 'year', 'rating', 'directors', 'cast', 'plot', 'updated', 'last_scraped',
+                       'content_hash']
+
+
+def as_year(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def adopt_legacy_rows(movies):
+    """
+    Rows saved before movies were keyed on imdb_id have none. Before a batch
+    is upserted, each title missing from the table takes over the legacy row
+    with the same title and year, so re-scraping updates it instead of
+    listing the movie twice.
+    """
+    if not Movie.objects.filter(imdb_id__isnull=True).exists():
+        return
+    known = set(Movie.objects.filter(imdb_id__in=[m.imdb_id for m in movies]).values_list('imdb_id', flat=True))
+    unmatched = [m for m in movies if m.imdb_id not in known and m.title]
+    if not unmatched:
+        return
+    legacy = {}
+    rows = Movie.objects.filter(imdb_id__isnull=True, title__in={m.title for m in unmatched}).order_by('id')
+    for pk, title, year in rows.values_list('id', 'title', 'year'):
+        legacy.setdefault((title, year), []).append(pk)
+
+    adopted = []
+    for movie in unmatched:
+        pks = legacy.get((movie.title, as_year(movie.year)))
+        if pks:
+            adopted.append(Movie(pk=pks.pop(0), imdb_id=movie.imdb_id))
+    if adopted:
+        Movie.objects.bulk_update(adopted, ['imdb_id'])
+
+
+def upsert_movies(movies, update_fields=MOVIE_UPDATE_FIELDS):
+    # A batch may hold the same title twice; Postgres rejects an upsert touching a row twice
+    unique_movies = list({m.imdb_id: m for m in movies}.values())
+    adopt_legacy_rows(unique_movies)
+    Movie.objects.bulk_create(
+        unique_movies,
+        update_conflicts=True,
+        unique_fields=['imdb_id'],
+        update_fields=update_fields,
+    )
+    if CREDIT_FIELDS.keys() & set(update_fields):
+        # Conflicting rows don't get their primary key back on every backend
+        ids = dict(Movie.objects.filter(imdb_id__in=[m.imdb_id for m in unique_movies]).values_list('imdb_id', 'id'))
+        for movie in unique_movies:
+            movie.pk = ids[movie.imdb_id]
+        sync_credits(unique_movies, update_fields)
+    transaction.on_commit(bump_catalog_version)
+    return unique_movies
+
+
+class MovieWriter:
+    """
+    Database stage of the scrape pipeline. Parsed movies are pushed onto a
+    bounded queue and written by a single task in batches of `batch_size`,
+    or whatever has arrived after `flush_interval` seconds. Each batch is
+    upserted and counted on the job in one transaction. A full queue blocks
+    producers, so fetching slows down when the database falls behind.
+
+    Rows may be put with their own `update_fields`, e.g. detail pages that
+    only fill in what a search result card lacked; a batch is upserted once
+    per distinct set of fields. `partial` rows are written but not
+    checkpointed as done, since more of the title is still to come.
+    Title leases held by `lease_owner` are released with the batch that
+    writes or fails the title.
+    """
+
+    def __init__(self, status=None, batch_size=BATCH_SIZE, flush_interval=FLUSH_INTERVAL, queue_size=None,
+                 checkpoint=None, lease_owner=None):
+        self.status = status
+        self.checkpoint = checkpoint
+        self.lease_owner = lease_owner
+        self.failed = []
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.queue = asyncio.Queue(maxsize=queue_size or batch_size * 2)
+        self.task = None
+        self.written = 0
+
+    def start(self):
+        self.task = asyncio.create_task(self.run())
+        return self.task
+
+    async def put(self, movie, update_fields=MOVIE_UPDATE_FIELDS, partial=False):
+        await self.queue.put((movie, update_fields, partial))
+
+    def mark_failed(self, imdb_id):
+        """Failed titles are checkpointed with the next batch rather than written one by one."""
+        self.failed.append(imdb_id)
+
+    async def close(self):
+        await self.queue.put(None)
+        await self.task
+
+    async def run(self):
+        batch = []
+        deadline = time.monotonic() + self.flush_interval
+        while True:
+            try:
+                row = await asyncio.wait_for(self.queue.get(), max(0, deadline - time.monotonic()))
+            except asyncio.TimeoutError:
+                row = False
+
+            if row:
+                batch.append(row)
+            if row is None or len(batch) >= self.batch_size or time.monotonic() >= deadline:
+                if batch or self.failed:
+                    await self.flush(batch)
+                    batch = []
+                deadline = time.monotonic() + self.flush_interval
+            if row is None:
+                return
+
+    async def flush(self, rows):
+        started = time.monotonic()
+        failed, self.failed = self.failed, []
+        written = await sync_to_async(self.write_batch)(rows, failed)
+        self.written += written
+        logger.debug(f"Wrote {written} movies in {time.monotonic() - started:.3f}s")
+
+    def write_batch(self, rows, failed_ids=()):
+        groups = {}
+        for movie, update_fields, partial in rows:
+            groups.setdefault(tuple(update_fields), []).append(movie)
+
+        # Only complete titles count as scraped; a card row and its detail row are one title
+        done_ids = list(dict.fromkeys(movie.imdb_id for movie, _, partial in rows if not partial))
+        written = len(done_ids)
+        with transaction.atomic():
+            # Groups keep arrival order, so a card row lands before the detail row completing it
+            for update_fields, movies in groups.items():
+                upsert_movies(movies, list(update_fields))
+            if self.checkpoint is not None:
+                self.checkpoint.mark(done_ids, failed_ids)
+            if self.lease_owner is not None:
+                release_title_leases([*done_ids, *failed_ids], self.lease_owner)
+            if self.status is not None and written:
+                ScraperStatus.objects.filter(pk=self.status.pk).update(
+                    scraped_movies=F('scraped_movies') + written,
+                    updated_at=timezone.now(),
+                )
+        return written
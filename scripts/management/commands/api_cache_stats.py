@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from scraper.catalog import catalog_version, reset_response_cache_stats, response_cache_stats
+
+
+class Command(BaseCommand):
+    help = 'Shows how often the movies API was answered from its response cache'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--reset', action='store_true', help='Zero the counters after printing them')
+
+    def handle(self, *args, **options):
+        stats = response_cache_stats()
+        self.stdout.write(
+            f"Catalog version {catalog_version()}: {stats['hits']} hits, {stats['not_modified']} not modified, "
+            f"{stats['misses']} misses (hit ratio {stats['hit_ratio']:.1%})"
+        )
+        if options['reset']:
+            reset_response_cache_stats()
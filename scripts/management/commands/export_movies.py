@@ -0,0 +1,62 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.http import HttpRequest, QueryDict
+from rest_framework.exceptions import ValidationError
+from rest_framework.request import Request
+
+from scraper.export import CHUNK_SIZE, EXPORT_FORMATS, export_chunks
+from scraper.views import MovieListAPIView
+
+
+def parse_filter(value):
+    name, sep, filter_value = value.partition('=')
+    if not sep or not name:
+        raise ValueError(value)
+    return name, filter_value
+
+
+def filtered_movies(params):
+    """The movies the list API returns for query `params` (a QueryDict), unpaginated."""
+    http_request = HttpRequest()
+    http_request.GET = params
+    view = MovieListAPIView(request=Request(http_request), format_kwarg=None)
+    return view.filter_queryset(view.get_queryset())
+
+
+class Command(BaseCommand):
+    help = 'Streams the movie catalog, or the part matching API filters, to NDJSON or CSV'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--format', choices=list(EXPORT_FORMATS), default='ndjson',
+                            help='Output format')
+        parser.add_argument('--output', type=str, default='-',
+                            help='File to write, "-" for stdout')
+        parser.add_argument('--gzip', action='store_true',
+                            help='Gzip the output (needs --output)')
+        parser.add_argument('--updated-after', type=str,
+                            help='Only movies written after this ISO 8601 time, for incremental exports')
+        parser.add_argument('--filter', dest='filters', type=parse_filter, action='append', default=[],
+                            help='List API filter as NAME=VALUE, e.g. year__gte=2000 or search=nolan; repeatable')
+        parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE,
+                            help='Rows fetched from the database at a time')
+
+    def handle(self, *args, **options):
+        if options['gzip'] and options['output'] == '-':
+            raise CommandError('--gzip writes binary output; pass --output as well.')
+
+        params = QueryDict(mutable=True)
+        for name, value in options['filters']:
+            params.appendlist(name, value)
+        if options['updated_after']:
+            params['updated__gt'] = options['updated_after']
+        try:
+            queryset = filtered_movies(params)
+            chunks = export_chunks(queryset, options['format'], options['gzip'], options['chunk_size'])
+            if options['output'] == '-':
+                for chunk in chunks:
+                    self.stdout.write(chunk.decode(), ending='')
+                return
+            with open(options['output'], 'wb') as f:
+                for chunk in chunks:
+                    f.write(chunk)
+        except ValidationError as e:
+            raise CommandError(f'Invalid filter: {e.detail}')
@@ -0,0 +1,50 @@
+import asyncio
+import logging
+
+from asgiref.sync import sync_to_async
+from django.core.management.base import BaseCommand
+
+from scraper.extract import title_url
+from scraper.parsers import close_parse_pool
+from scraper.refresh import DEFAULT_BUDGET, refresh_candidates
+from scripts.management.commands.scraper import IMDBScraper, add_scraper_arguments, scraper_options
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = 'Re-scrapes the movies most overdue for a refresh, up to a number of titles per run'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--max-titles', '--budget', dest='max_titles', type=int, default=DEFAULT_BUDGET,
+                            help='Maximum number of titles to refresh in this run; each may take up to '
+                                 '--retries + 1 requests')
+        parser.add_argument('--dry-run', action='store_true',
+                            help='Only list the titles that would be refreshed')
+        add_scraper_arguments(parser)
+
+    def handle(self, *args, **options):
+        asyncio.run(self.run(options))
+
+    async def run(self, options):
+        candidates = await sync_to_async(refresh_candidates)(options['max_titles'])
+        if options['dry_run']:
+            for imdb_id in candidates:
+                self.stdout.write(imdb_id)
+            return
+        if not candidates:
+            logger.info("No movies are due for a refresh.")
+            return
+
+        kwargs = scraper_options(options)
+        # Every candidate is stale by definition
+        kwargs['fresh_within'] = 0
+        scraper = IMDBScraper(None, '', len(candidates), status=None, known_hashes=candidates, **kwargs)
+        try:
+            await scraper.scrape_details_concurrently([title_url(imdb_id) for imdb_id in candidates])
+        finally:
+            close_parse_pool()
+        logger.info(
+            f"Refreshed {len(candidates)} movies: {scraper.content_stats['changed']} changed, "
+            f"{scraper.content_stats['unchanged']} unchanged; requests: {dict(scraper.request_stats)}"
+        )
@@ -0,0 +1,86 @@
+import os
+import time
+from collections import Counter
+from functools import partial
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from scraper.archive import PageArchive, parse_archived_page
+from scraper.extract import content_hash
+from scraper.models import Movie
+from scraper.parsers import close_parse_pool, default_backend, get_parse_pool
+from scraper.writer import BATCH_SIZE, upsert_movies
+from scripts.management.commands.scraper import movie_from_data
+
+# last_scraped records fetches, and reparsing fetches nothing
+REPARSE_UPDATE_FIELDS = ['title', 'year', 'rating', 'directors', 'cast', 'plot', 'updated', 'content_hash']
+PAGES_PER_WORKER = 256
+
+
+class Command(BaseCommand):
+    help = 'Re-parses archived title pages with the current extractor and upserts the results, without network access'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--archive-dir', type=str, required=True,
+                            help='Archive written by the scraper with --archive-dir')
+        parser.add_argument('--workers', type=int, default=os.cpu_count(),
+                            help='Processes parsing pages, 0 parses in this process')
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE,
+                            help='Movies written per upsert')
+        parser.add_argument('--imdb-id', dest='imdb_ids', action='append', default=[],
+                            help='Only reparse this title; repeat for several')
+
+    def handle(self, *args, **options):
+        if not os.path.isdir(options['archive_dir']):
+            raise CommandError(f"Archive directory {options['archive_dir']} does not exist.")
+        archive = PageArchive(options['archive_dir'])
+        pages = archive.latest_pages(set(options['imdb_ids']) or None)
+        parse = partial(
+            parse_archived_page,
+            backend=default_backend(),
+            hero_only=getattr(settings, 'SCRAPER_PARSE_HERO_ONLY', True),
+        )
+
+        started = time.monotonic()
+        self.counts = Counter()
+        workers = options['workers']
+        executor = get_parse_pool(workers) if workers else None
+        try:
+            # Bounded windows keep parsed pages from piling up while the database catches up
+            window = max(1, workers) * PAGES_PER_WORKER
+            batch = []
+            for start in range(0, len(pages), window):
+                chunk = pages[start:start + window]
+                results = executor.map(parse, chunk, chunksize=32) if executor else map(parse, chunk)
+                for movie_data, _ in results:
+                    if not movie_data.get('title') or not movie_data.get('imdb_id'):
+                        self.counts['unparsed'] += 1
+                        continue
+                    movie = movie_from_data(movie_data)
+                    movie.content_hash = content_hash(vars(movie))
+                    batch.append(movie)
+                    if len(batch) >= options['batch_size']:
+                        self.write_batch(batch)
+                        batch = []
+            if batch:
+                self.write_batch(batch)
+        finally:
+            close_parse_pool()
+
+        elapsed = time.monotonic() - started
+        self.stdout.write(
+            f"Reparsed {len(pages)} pages in {elapsed:.1f}s ({len(pages) / max(elapsed, 1e-9):.0f} pages/s): "
+            f"{self.counts['changed']} changed, {self.counts['unchanged']} unchanged, "
+            f"{self.counts['unparsed']} without a title"
+        )
+
+    def write_batch(self, movies):
+        stored = dict(Movie.objects.filter(imdb_id__in=[m.imdb_id for m in movies]).values_list('imdb_id', 'content_hash'))
+        changed = [m for m in movies if m.imdb_id not in stored or stored[m.imdb_id] != m.content_hash]
+        self.counts['unchanged'] += len(movies) - len(changed)
+        self.counts['changed'] += len(changed)
+        if changed:
+            with transaction.atomic():
+                upsert_movies(changed, REPARSE_UPDATE_FIELDS)
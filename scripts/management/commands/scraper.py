@@ -1,19 +1,32 @@
 
+import argparse
 import asyncio
 import logging
-import re
+import os
 import sys
-import requests
-import math
+import time
 import uuid
+from collections import Counter
+from concurrent.futures import BrokenExecutor
 
-from bs4 import BeautifulSoup
+from django.conf import settings
 from django.core.management.base import BaseCommand, CommandError
-from playwright.async_api import async_playwright, TimeoutError, Error as PlaywrightError
+from django.utils import timezone
+from playwright.async_api import TimeoutError, Error as PlaywrightError
 from asgiref.sync import sync_to_async
 from tqdm.asyncio import tqdm
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from scraper.archive import PageArchive
+from scraper.browser import get_browser_pool, close_browser_pool
+from scraper.cache import ResponseCache, DEFAULT_MAX_BYTES, DEFAULT_TTL
+from scraper.checkpoint import JobCheckpoint
+from scraper.dedup import FRESHNESS_WINDOW, fresh_imdb_ids, get_title_flights
+from scraper.extract import MOVIE_FIELDS, content_hash, fields_from_card, imdb_id_from_url, parse_movie_page
+from scraper.fetch import AsyncFetcher, FETCH_ERRORS, DEFAULT_CONCURRENCY, DEFAULT_PER_HOST, DEFAULT_TIMEOUT
+from scraper.jobs import take_job
 from scraper.models import ScraperStatus, Movie
+from scraper.parsers import close_parse_pool, default_backend, get_parse_pool
+from scraper.throttle import AdaptiveLimiter, DEFAULT_RETRIES, INITIAL_CONCURRENCY
+from scraper.writer import MovieWriter, BATCH_SIZE, FLUSH_INTERVAL, MOVIE_UPDATE_FIELDS
 
 logger = logging.getLogger(__name__)
 logging.basicConfig(
@@ -28,37 +41,167 @@ logging.basicConfig(
 HEADERS = {'User-Agent': 'Mozilla/5.0'}
 IMDB_PAGE_SIZE = 50
 SEARCH_CHOICES = ['genre', 'keyword']
-BATCH_SIZE = 2
+
+RESULT_ITEM_SELECTOR = 'ul.ipc-metadata-list > li'
+RESULT_CARDS_SCRIPT = """(items, start) => items.slice(start).map(li => {
+    const text = selector => {
+        const element = li.querySelector(selector);
+        return element ? element.textContent.trim() : null;
+    };
+    const link = li.querySelector('a.ipc-title-link-wrapper');
+    return {
+        href: link ? link.getAttribute('href') : null,
+        title: text('h3.ipc-title__text'),
+        year: text('.dli-title-metadata-item'),
+        rating: text('.ipc-rating-star--rating'),
+        plot: text('.ipc-html-content-inner-div'),
+    };
+})"""
+ITEMS_GREW_SCRIPT = f"count => document.querySelectorAll('{RESULT_ITEM_SELECTOR}').length > count"
+SEE_MORE_SELECTOR = '.ipc-see-more__text'
+LIST_STALL_TIMEOUT = 10
+MODE_CHOICES = ['full', 'list-only', 'hybrid']
+
+
+def movie_from_data(data):
+    return Movie(
+        imdb_id=data['imdb_id'],
+        title=data['title'],
+        year=data['year'],
+        rating=float(data['rating']) if data['rating'] else None,
+        directors=data['directors'],
+        cast=data['cast'],
+        plot=data['plot'],
+    )
+
+
+def query_label(query):
+    return ':'.join(query)
+
+
+def parse_query(value):
+    search_type, _, search_value = value.partition(':')
+    if search_type not in SEARCH_CHOICES or not search_value.strip():
+        raise argparse.ArgumentTypeError(f"expected {' or '.join(SEARCH_CHOICES)}:<value>, got '{value}'")
+    return search_type, search_value.strip()
+
+
+def as_card(link):
+    """Resumed jobs and tests feed bare links; the pipeline passes cards around."""
+    return link if isinstance(link, dict) else {'url': link}
+
+
+def card_update_fields(card):
+    # Never overwrite what an earlier detail scrape stored with a field the card lacks
+    return [field for field in MOVIE_FIELDS if card.get(field) is not None] + ['updated']
 
 
 class IMDBScraper:
-    def __init__(self, search_type, search_value, limit, status):
+    def __init__(self, search_type, search_value, limit, status, concurrency=DEFAULT_CONCURRENCY,
+                 per_host=DEFAULT_PER_HOST, timeout=DEFAULT_TIMEOUT, list_stall_timeout=LIST_STALL_TIMEOUT,
+                 browser_pool=None, parse_workers=0, cache=None, batch_size=BATCH_SIZE,
+                 flush_interval=FLUSH_INTERVAL, initial_concurrency=INITIAL_CONCURRENCY, retries=DEFAULT_RETRIES,
+                 mode='full', fresh_within=FRESHNESS_WINDOW, title_flights=None, queries=None,
+                 known_hashes=None, archive=None):
         self.search_type = search_type
         self.search_value = search_value.strip().replace(" ", "-")
+        # Jobs fed a list of links (refresh_movies) have no search query
+        self.queries = [
+            (query_type, query_value.strip().replace(" ", "-"))
+            for query_type, query_value in queries or ([(search_type, search_value)] if search_type else [])
+        ]
+        self.query_stats = {query_label(query): Counter() for query in self.queries}
         self.limit = limit
         self.status = status
-        self.movie_instances = []
+        self.mode = mode
+        self.concurrency = concurrency
+        self.initial_concurrency = initial_concurrency
+        self.retries = retries
+        self.limiter = None
+        self.request_stats = Counter()
+        self.cache_stats = Counter()
+        self.per_host = per_host
+        self.timeout = timeout
+        self.list_stall_timeout = list_stall_timeout
+        self.browser_pool = browser_pool
+        self.parse_workers = parse_workers
+        self.cache = cache
+        self.archive = archive
+        self.parse_pool = None
+        self.parser_backend = default_backend()
+        self.parse_hero_only = getattr(settings, 'SCRAPER_PARSE_HERO_ONLY', True)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.checkpoint = JobCheckpoint(status) if status is not None and status.pk else None
+        self.fresh_within = fresh_within
+        self.title_flights = title_flights
+        self.dedup_stats = Counter()
+        self.known_hashes = known_hashes or {}
+        self.content_stats = Counter()
+        self.fallback_counts = Counter()
 
     async def run(self):
-        url = self.get_search_url()
+        resumed = 0
+        if self.checkpoint:
+            resumed = len(await sync_to_async(self.checkpoint.load)())
+            self.status.scraped_movies = resumed
+            await sync_to_async(self.status.save)(update_fields=['scraped_movies'])
+
         try:
-            movie_links = await self.fetch_movie_list_page(url)
+            if self.checkpoint and self.status.discovery_complete:
+                movie_links = await sync_to_async(self.checkpoint.remaining_links)()
+                logger.info(f"Resuming job {self.status.job_id}: {resumed} done, {len(movie_links)} remaining")
+            else:
+                movie_links = self.iter_frontier()
+            found = await self.scrape_details_concurrently(movie_links) + resumed
         except Exception as e:
-            logger.exception("Failed to fetch movie list")
             await self.update_status('error', error_message=str(e))
             raise
 
-        logger.info(f"Total movies found: {len(movie_links)}")
-        await self.scrape_details_concurrently(movie_links)
-
-        if not movie_links:
+        logger.info(f"Total movies found: {found}")
+        if self.limiter:
+            summary = self.limiter.summary()
+            logger.info(
+                f"Request concurrency: started at {summary['initial']}, peaked at {summary['peak']}, "
+                f"ended at {summary['final']}; requests: {dict(self.request_stats)}"
+            )
+        if self.dedup_stats:
+            logger.info(f"Titles not fetched because another job had them: {dict(self.dedup_stats)}")
+        if self.fallback_counts:
+            logger.info(f"DOM fallback used for missing fields: {dict(self.fallback_counts)}")
+        await self.save_stats()
+        if not found:
             await self.update_status('error', error_message="No movies found")
         else:
-            await self.update_status('completed', scraped_movies=len(movie_links))
+            # The writer raised scraped_movies as batches committed; `found` also counts failed and fresh titles
+            await self.status.arefresh_from_db(fields=['scraped_movies'])
+            await self.update_status('completed', total_movies=found)
 
-    def get_search_url(self):
+    def get_search_url(self, query=None):
+        search_type, search_value = query or (self.search_type, self.search_value)
         base = "https://www.imdb.com/search/title/"
-        return f"{base}?{'genres' if self.search_type == 'genre' else 'keywords'}={self.search_value}"
+        return f"{base}?{'genres' if search_type == 'genre' else 'keywords'}={search_value}"
+
+    def get_browser_pool(self):
+        return self.browser_pool or get_browser_pool(headers=HEADERS)
+
+    def collect_stats(self):
+        stats = {'dom_fallbacks': dict(self.fallback_counts)}
+        if len(self.queries) > 1:
+            stats['queries'] = {label: dict(counts) for label, counts in self.query_stats.items()}
+        if self.cache:
+            stats['cache'] = dict(self.cache_stats)
+        if self.limiter:
+            stats['concurrency'] = self.limiter.summary()
+        stats['requests'] = dict(self.request_stats)
+        stats['dedup'] = dict(self.dedup_stats)
+        if self.known_hashes:
+            stats['content'] = dict(self.content_stats)
+        return stats
+
+    async def save_stats(self):
+        self.status.stats = {**self.status.stats, **self.collect_stats()}
+        await sync_to_async(self.status.save)(update_fields=['stats'])
 
     async def update_status(self, new_status, **fields):
         fields['status'] = new_status
@@ -66,202 +209,433 @@ class IMDBScraper:
             setattr(self.status, key, value)
         await sync_to_async(self.status.save)(update_fields=list(fields.keys()))
 
-    async def fetch_movie_list_page(self, url):
+    async def iter_movie_links(self, url):
+        """
+        Yields lists of search result cards (see fields_from_card) as each
+        batch of results is rendered, so detail scraping can start before the
+        whole result list is loaded.
+        """
+        yielded = 0
+        seen_items = 0
+        stall_timeout_ms = self.list_stall_timeout * 1000
         try:
-            all_links = []
-            async with async_playwright() as p:
-                browser = await p.chromium.launch(headless=True)
-                page = await browser.new_page()
-                await page.set_extra_http_headers(HEADERS)
-                await page.goto(url)
-
-                previous_height = 0
-                max_iterations = 0 if self.limit < 50 else math.ceil(self.limit / 50)
-                current_iteration = 0
+            async with self.get_browser_pool().page() as page:
+                await page.goto(url, wait_until='domcontentloaded')
+                await page.wait_for_selector(RESULT_ITEM_SELECTOR, timeout=stall_timeout_ms)
 
+                iteration = 0
                 while True:
-                    await page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
-                    await asyncio.sleep(1)
-                    current_height = await page.evaluate("document.body.scrollHeight")
-                    if current_height == previous_height:
-                        if current_iteration == max_iterations:
-                            break
-                        current_iteration += 1
-                        try:
-                            await page.click(".ipc-see-more__text", timeout=3000)
-                        except TimeoutError:
-                            logger.info("See more button not found or not clickable.")
-                    previous_height = current_height
-
-                html = await page.content()
-                await browser.close()
-
-            soup = BeautifulSoup(html, 'html.parser')
-            movie_containers = soup.select('ul.ipc-metadata-list')
-            current_link_count = 1
-            for ul in movie_containers:
-                lis = ul.find_all('li', recursive=False)
-                for li in lis:
-                    link_tag = li.find('a', class_='ipc-title-link-wrapper')
-                    if link_tag and 'href' in link_tag.attrs:
-                        all_links.append("https://www.imdb.com" + link_tag['href'])
-                        if current_link_count == self.limit:
-                            break
-                        current_link_count += 1
-            return all_links
+                    cards = await page.eval_on_selector_all(RESULT_ITEM_SELECTOR, RESULT_CARDS_SCRIPT, seen_items)
+                    seen_items += len(cards)
+                    cards = [
+                        fields_from_card({**card, 'url': "https://www.imdb.com" + card['href']})
+                        for card in cards if card['href']
+                    ]
+                    cards = cards[:self.limit - yielded]
+                    if cards:
+                        yielded += len(cards)
+                        yield cards
+                    if yielded >= self.limit:
+                        break
+
+                    iteration += 1
+                    started = time.monotonic()
+                    see_more = page.locator(SEE_MORE_SELECTOR).first
+                    if not await see_more.count():
+                        logger.info("No more search results to load.")
+                        break
+                    try:
+                        await see_more.click(timeout=stall_timeout_ms)
+                        await page.wait_for_function(ITEMS_GREW_SCRIPT, arg=seen_items, timeout=stall_timeout_ms)
+                    except TimeoutError:
+                        logger.info(f"Search results stalled for {self.list_stall_timeout}s, stopping discovery.")
+                        break
+                    logger.info(
+                        f"List batch {iteration}: waited {time.monotonic() - started:.2f}s, "
+                        f"{yielded}/{self.limit} links discovered"
+                    )
         except (TimeoutError, PlaywrightError):
             logger.exception(f"Error while navigating to {url}")
-            return []
 
-    async def scrape_details_concurrently(self, movie_links):
-        with ThreadPoolExecutor(max_workers=10) as pool:
-            futures = {pool.submit(self.scrape_movie_details, link): link for link in movie_links}
-            for future in tqdm(as_completed(futures), total=len(futures), desc="Scraping progress"):
-                try:
-                    movie_data = future.result()
-                except Exception as e:
-                    logger.warning(f"Error scraping {futures[future]}: {e}")
+    async def iter_frontier(self):
+        """
+        Runs discovery for every query of the job and yields their result
+        cards as one stream, dropping titles another query of the sweep has
+        already found. Discoveries run side by side, as many at a time as the
+        browser pool has pages; per-query counts are saved as each finishes.
+        """
+        batches = asyncio.Queue(maxsize=len(self.queries))
+        seen = set()
+
+        async def discover(query):
+            try:
+                async for batch in self.iter_movie_links(self.get_search_url(query)):
+                    await batches.put((query, batch))
+            except Exception as e:
+                await batches.put((query, e))
+            else:
+                await batches.put((query, None))
+
+        tasks = [asyncio.create_task(discover(query)) for query in self.queries]
+        try:
+            running = len(tasks)
+            while running:
+                query, batch = await batches.get()
+                counts = self.query_stats[query_label(query)]
+                if isinstance(batch, Exception):
+                    raise batch
+                if batch is None:
+                    running -= 1
+                    counts['discovery_complete'] = 1
+                    if self.status is not None and len(self.queries) > 1:
+                        await self.save_stats()
                     continue
 
-                if not movie_data:
-                    continue
+                cards = []
+                for card in map(as_card, batch):
+                    key = imdb_id_from_url(card['url']) or card['url']
+                    if key not in seen:
+                        seen.add(key)
+                        cards.append(card)
+                counts['links'] += len(batch)
+                counts['new'] += len(cards)
+                counts['duplicates'] += len(batch) - len(cards)
+                if cards:
+                    yield cards
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
 
-                self.movie_instances.append(Movie(
-                    title=movie_data['title'],
-                    year=movie_data['year'],
-                    rating=float(movie_data['rating']) if movie_data['rating'] else None,
-                    directors=movie_data['directors'],
-                    cast=movie_data['cast'],
-                    plot=movie_data['plot'],
-                ))
-
-                if len(self.movie_instances) >= BATCH_SIZE:
-                    await self.bulk_insert_movies()
-                    self.movie_instances.clear()
-
-        if self.movie_instances:
-            await self.bulk_insert_movies()
-
-    async def bulk_insert_movies(self):
-        titles = [m.title for m in self.movie_instances]
-        existing_titles = set(await sync_to_async(
-            lambda: list(Movie.objects.filter(title__in=titles).values_list('title', flat=True))
-        )())
-
-        to_update = [m for m in self.movie_instances if m.title in existing_titles]
-        to_create = [m for m in self.movie_instances if m.title not in existing_titles]
-
-        if to_create:
-            await sync_to_async(Movie.objects.bulk_create)(to_create, ignore_conflicts=True)
-
-        if to_update:
-            existing_movies = await sync_to_async(
-                lambda: {m.title: m for m in Movie.objects.filter(title__in=[m.title for m in to_update])}
-            )()
-            for m in to_update:
-                db_obj = existing_movies[m.title]
-                db_obj.year = m.year
-                db_obj.rating = m.rating
-                db_obj.directors = m.directors
-                db_obj.cast = m.cast
-                db_obj.plot = m.plot
-
-            await sync_to_async(Movie.objects.bulk_update)(
-                existing_movies.values(), ['year', 'rating', 'directors', 'cast', 'plot']
-            )
+    async def scrape_details_concurrently(self, movie_links):
+        """
+        Feeds links from a list or cards from the async generator returned by
+        iter_movie_links() through a bounded queue drained by detail workers.
+        In list-only and hybrid mode cards are written straight away, and
+        hybrid mode queues a detail fetch only for the fields a card lacks.
+        Returns the number of titles that were processed.
+        """
+        queue = asyncio.Queue(maxsize=self.concurrency * 2)
+        progress = tqdm(total=self.limit * max(1, len(self.queries)), desc="Scraping progress")
+        if self.parse_workers:
+            self.parse_pool = get_parse_pool(self.parse_workers)
+        self.title_flights = self.title_flights or get_title_flights()
+        writer = MovieWriter(self.status, self.batch_size, self.flush_interval, checkpoint=self.checkpoint,
+                             lease_owner=self.title_flights.owner)
+        writer.start()
+        # One worker per slot up to the ceiling; the limiter decides how many of them are fetching
+        self.limiter = AdaptiveLimiter(self.initial_concurrency, maximum=self.concurrency)
+        fetcher = AsyncFetcher(self.concurrency, self.per_host, self.timeout, headers=HEADERS, cache=self.cache,
+                               limiter=self.limiter, retries=self.retries,
+                               on_download=self.archive_page if self.archive else None)
+        async with fetcher:
+            producer = asyncio.create_task(self.produce_links(movie_links, queue, writer, progress))
+            workers = [
+                asyncio.create_task(self.detail_worker(fetcher, writer, queue, progress))
+                for _ in range(self.concurrency)
+            ]
+            tasks = [producer, *workers]
+            stages = asyncio.gather(*tasks)
+            try:
+                # A failed write must stop the fetchers, which would otherwise block on the full writer queue
+                await asyncio.wait([stages, writer.task], return_when=asyncio.FIRST_COMPLETED)
+                if writer.task.done():
+                    writer.task.result()
+                await stages
+                await writer.close()
+            except BaseException:
+                stages.cancel()
+                writer.task.cancel()
+                await asyncio.gather(stages, writer.task, return_exceptions=True)
+                raise
+            finally:
+                progress.close()
+                self.request_stats.update(fetcher.stats)
+                self.cache_stats.update(fetcher.cache_stats)
+
+        return producer.result()
+
+    async def produce_links(self, movie_links, queue, writer, progress):
+        count = 0
+        async for batch in self.link_batches(movie_links):
+            count += len(batch)
+            if self.mode != 'list-only':
+                remaining = await self.skip_fresh(batch)
+                progress.update(len(batch) - len(remaining))
+                batch = remaining
+            for card in batch:
+                await self.dispatch(card, queue, writer, progress)
+
+        for _ in range(self.concurrency):
+            await queue.put(None)
+        return count
+
+    async def link_batches(self, movie_links):
+        """Batches of cards from discovery, checkpointed as they are found, or from a list of links."""
+        if not hasattr(movie_links, '__aiter__'):
+            for start in range(0, len(movie_links), IMDB_PAGE_SIZE):
+                yield [as_card(link) for link in movie_links[start:start + IMDB_PAGE_SIZE]]
+            return
 
-    def scrape_movie_details(self, movie_url):
+        try:
+            async for batch in movie_links:
+                batch = [as_card(card) for card in batch]
+                if self.checkpoint:
+                    batch = await self.checkpoint_discovered(batch)
+                yield batch
+        except Exception:
+            logger.exception("Failed to fetch movie list")
+            raise
+        finally:
+            await movie_links.aclose()
+        if self.checkpoint:
+            await sync_to_async(self.checkpoint.mark_discovery_complete)()
+
+    async def skip_fresh(self, cards):
+        """Drops titles whose page was scraped, by any job, within the freshness window."""
+        imdb_ids = [imdb_id_from_url(card['url']) for card in cards]
+        fresh = await sync_to_async(fresh_imdb_ids)([imdb_id for imdb_id in imdb_ids if imdb_id], self.fresh_within)
+        if not fresh:
+            return cards
+        self.dedup_stats['fresh'] += len(fresh)
+        if self.checkpoint:
+            await sync_to_async(self.checkpoint.mark)(list(fresh))
+        return [card for card, imdb_id in zip(cards, imdb_ids) if imdb_id not in fresh]
+
+    async def checkpoint_discovered(self, cards):
+        """Records a discovery batch and drops titles a previous run of the job already scraped."""
+        imdb_ids = [imdb_id_from_url(card['url']) for card in cards]
+        await sync_to_async(self.checkpoint.record_discovered)([imdb_id for imdb_id in imdb_ids if imdb_id])
+        return [card for card, imdb_id in zip(cards, imdb_ids) if imdb_id not in self.checkpoint.done]
+
+    async def dispatch(self, card, queue, writer, progress):
+        """Queues a title for its detail page, or writes it straight from its search result card."""
+        # Bare links (e.g. a resumed job) and cards without a title always need the detail page
+        if self.mode == 'full' or not card.get('title') or not card.get('imdb_id'):
+            await queue.put(card)
+            return
+
+        missing = [field for field in MOVIE_FIELDS if card.get(field) is None]
+        if self.mode == 'list-only' or not missing:
+            await writer.put(movie_from_data(card), card_update_fields(card))
+            progress.update()
+            return
+        await writer.put(movie_from_data(card), card_update_fields(card), partial=True)
+        await queue.put({**card, 'missing': missing})
+
+    async def detail_worker(self, fetcher, writer, queue, progress):
+        while True:
+            card = await queue.get()
+            if card is None:
+                return
+
+            link = card['url']
+            imdb_id = imdb_id_from_url(link)
+            if imdb_id:
+                movie_data = await self.title_flights.run(
+                    imdb_id, lambda: self.scrape_movie_details(fetcher, link), self.dedup_stats
+                )
+            else:
+                movie_data = await self.scrape_movie_details(fetcher, link)
+            progress.update()
+            if movie_data is None:
+                # Another worker scraped the title while we waited for it
+                if self.checkpoint:
+                    await sync_to_async(self.checkpoint.mark)([imdb_id])
+                continue
+            if not movie_data:
+                if imdb_id:
+                    writer.mark_failed(imdb_id)
+                continue
+            if not movie_data.get('imdb_id'):
+                logger.warning(f"Skipping {link}: no IMDb id in URL")
+                continue
+            if not movie_data.get('title'):
+                # A bot check or empty page: the NOT NULL title would fail the writer's whole batch
+                logger.warning(f"Skipping {link}: no title on the page")
+                writer.mark_failed(imdb_id)
+                continue
+
+            update_fields = MOVIE_UPDATE_FIELDS
+            if 'missing' in card:
+                # Hybrid mode: the card row is already stored, only fill in what it lacked
+                movie_data = {**card, **{field: movie_data.get(field) for field in card['missing']}}
+                update_fields = card['missing'] + ['updated', 'last_scraped', 'content_hash']
+            movie = movie_from_data(movie_data)
+            movie.last_scraped = timezone.now()
+            movie.content_hash = content_hash(vars(movie))
+            if imdb_id in self.known_hashes:
+                changed = self.known_hashes[imdb_id] != movie.content_hash
+                self.content_stats['changed' if changed else 'unchanged'] += 1
+                if not changed:
+                    # Same content as stored: only record that the title was checked
+                    update_fields = ['last_scraped']
+            await writer.put(movie, update_fields)
+
+    async def scrape_movie_details(self, fetcher, movie_url):
         try:
             logger.debug(f"Scraping movie details for: {movie_url}")
-            response = requests.get(movie_url, headers=HEADERS)
-            response.raise_for_status()
-            soup = BeautifulSoup(response.text, 'html.parser')
-
-            title = soup.find('h1', {'data-testid': 'hero__pageTitle'})
-            title = title.get_text(strip=True) if title else None
-
-            year_element = soup.find('ul', {'class': 'ipc-inline-list ipc-inline-list--show-dividers'})
-            li_tags = year_element.find_all('li') if year_element else []
-            release_year = next((re.search(r'\d{4}', tag.text.strip()).group() for tag in li_tags if re.search(r'\d{4}', tag.text.strip())), None)
-
-            rating_el = soup.find('div', {'data-testid': 'hero-rating-bar__aggregate-rating__score'})
-            imdb_rating = rating_el.find('span').get_text(strip=True) if rating_el else None
-
-            director_el = soup.find('span', string=lambda s: s in ['Director', 'Directors'] if s else False)
-            directors = None
-            if director_el:
-                principal_li = director_el.find_parent('li')
-                if principal_li:
-                    a_tags = principal_li.select('ul li a')
-                    names = [a.get_text(strip=True) for a in a_tags]
-                    directors = ", ".join(names) if names else None
-
-            plot_el = soup.find('span', {'data-testid': 'plot-xl'})
-            plot_summary = plot_el.get_text(strip=True) if plot_el else None
-
-            cast = self.get_credits_details(soup, 'Stars')
-            if not directors:
-                for i in ['Creator', 'Creators']:
-                    directors = self.get_credits_details(soup, i)
-                    if directors:
-                        break
-
-            return {
-                'title': title,
-                'year': release_year,
-                'rating': imdb_rating,
-                'directors': directors,
-                'cast': cast,
-                'plot': plot_summary,
-                'url': movie_url
-            }
-        except requests.RequestException:
-            logger.exception(f"Failed to scrape movie: {movie_url}")
+            html = await fetcher.fetch(movie_url)
+        except FETCH_ERRORS as e:
+            logger.warning(f"Failed to scrape movie: {movie_url}: {e!r}")
             return {}
+        return await self.parse_movie_details(html, movie_url)
 
-    def get_credits_details(self, soup, key):
-        credits_section = soup.find('a', {'aria-label': 'See full cast and crew'}, href=True, string=key)
-        credits_list = []
-        if credits_section:
-            credits_ul = credits_section.find_next('ul')
-            if credits_ul:
-                credits_list = [a.text for a in credits_ul.find_all('a')]
-        return ", ".join(credits_list) if credits_list else None
+    async def archive_page(self, movie_url, html):
+        # Only pages downloaded from IMDb: cached and revalidated copies are already archived
+        imdb_id = imdb_id_from_url(movie_url)
+        if imdb_id:
+            await asyncio.to_thread(self.archive.append, imdb_id, movie_url, html)
+
+    async def parse_movie_details(self, html, movie_url):
+        args = (html, movie_url, self.parser_backend, self.parse_hero_only)
+        try:
+            if self.parse_pool:
+                loop = asyncio.get_running_loop()
+                movie_data, missing = await loop.run_in_executor(self.parse_pool, parse_movie_page, *args)
+            else:
+                movie_data, missing = parse_movie_page(*args)
+        except BrokenExecutor:
+            # Fail this job, and give the next one a fresh pool
+            close_parse_pool()
+            raise
+        except Exception:
+            # A malformed page fails its own title, not the whole job
+            logger.exception(f"Failed to parse movie: {movie_url}")
+            return {}
+        self.fallback_counts.update(missing)
+        return movie_data
+
+
+def add_scraper_arguments(parser, concurrency_flag='--concurrency'):
+    parser.add_argument(concurrency_flag, dest='concurrency', type=int, default=DEFAULT_CONCURRENCY,
+                        help='Upper bound on in-flight detail requests')
+    parser.add_argument('--initial-concurrency', type=int, default=INITIAL_CONCURRENCY,
+                        help='In-flight detail requests to start with before adapting to the server')
+    parser.add_argument('--retries', type=int, default=DEFAULT_RETRIES,
+                        help='Retries for throttled, timed out or failed detail requests')
+    parser.add_argument('--per-host', type=int, default=DEFAULT_PER_HOST,
+                        help='Maximum number of open connections per host')
+    parser.add_argument('--timeout', type=float, default=DEFAULT_TIMEOUT,
+                        help='Per-request timeout in seconds')
+    parser.add_argument('--parse-workers', type=int, default=os.cpu_count(),
+                        help='Processes used to parse title pages, 0 parses in the event loop')
+    parser.add_argument('--cache-dir', type=str, default=None,
+                        help='Directory for the on-disk title page cache, disabled when omitted')
+    parser.add_argument('--cache-max-bytes', type=int, default=DEFAULT_MAX_BYTES,
+                        help='Size limit of the page cache before least recently used pages are evicted')
+    parser.add_argument('--cache-ttl', type=int, default=DEFAULT_TTL,
+                        help='Seconds a cached page is served without revalidation')
+    parser.add_argument('--archive-dir', type=str, default=None,
+                        help='Directory of the raw page archive that manage.py reparse reads, disabled when omitted')
+    parser.add_argument('--batch-size', type=int, default=BATCH_SIZE,
+                        help='Movies written per upsert')
+    parser.add_argument('--flush-interval', type=float, default=FLUSH_INTERVAL,
+                        help='Seconds after which a partial batch is written')
+    parser.add_argument('--fresh-within', type=int, default=FRESHNESS_WINDOW,
+                        help='Skip titles whose page any job scraped within this many seconds, 0 disables')
+    parser.add_argument('--list-stall-timeout', type=float, default=LIST_STALL_TIMEOUT,
+                        help='Seconds to wait for more search results before ending discovery')
+
+
+def scraper_options(options):
+    """Turns the parsed add_scraper_arguments() options into IMDBScraper keyword arguments."""
+    cache = None
+    if options['cache_dir']:
+        cache = ResponseCache(options['cache_dir'], options['cache_max_bytes'], options['cache_ttl'])
+    archive = PageArchive(options['archive_dir']) if options['archive_dir'] else None
+    return {
+        'concurrency': options['concurrency'],
+        'initial_concurrency': options['initial_concurrency'],
+        'retries': options['retries'],
+        'per_host': options['per_host'],
+        'timeout': options['timeout'],
+        'list_stall_timeout': options['list_stall_timeout'],
+        'parse_workers': options['parse_workers'],
+        'cache': cache,
+        'archive': archive,
+        'batch_size': options['batch_size'],
+        'flush_interval': options['flush_interval'],
+        'fresh_within': options['fresh_within'],
+    }
+
+
+async def run_scrape_job(status, **kwargs):
+    status.status = 'running'
+    await sync_to_async(status.save)(update_fields=["status"])
+    logger.info(
+        f"Scraping IMDb for {', '.join(map(query_label, status.search_queries()))}, "
+        f"limit: {status.limit} per query, mode: {status.mode}"
+    )
+
+    try:
+        scraper = IMDBScraper(status.search_type, status.search_value, status.limit, status, mode=status.mode,
+                              queries=status.search_queries(), **kwargs)
+        await scraper.run()
+    except Exception as e:
+        logger.exception("Scraper failed")
+        status.status = 'error'
+        status.error_message = str(e)
+        await sync_to_async(status.save)(update_fields=["status", "error_message"])
+        raise
 
 
 class Command(BaseCommand):
     help = 'Scrapes IMDb movies based on genre or keyword'
 
     def add_arguments(self, parser):
-        parser.add_argument('--type', type=str, choices=SEARCH_CHOICES, required=True)
-        parser.add_argument('--value', type=str, required=True)
-        parser.add_argument('--limit', type=int, default=IMDB_PAGE_SIZE)
-        parser.add_argument('--job_id', type=str, required=False)
+        parser.add_argument('--type', type=str, choices=SEARCH_CHOICES)
+        parser.add_argument('--value', type=str)
+        parser.add_argument('--query', dest='queries', type=parse_query, action='append', default=[],
+                            help='Search as type:value, e.g. genre:action; repeat to sweep several '
+                                 'queries in one job')
+        parser.add_argument('--limit', type=int,
+                            help=f'Maximum number of results per query (default {IMDB_PAGE_SIZE})')
+        parser.add_argument('--job_id', type=str, required=False,
+                            help="Resume this job with its stored queries, limit and mode; options given "
+                                 "alongside override them")
+        parser.add_argument('--mode', type=str, choices=MODE_CHOICES,
+                            help='full (default) fetches every title page, list-only builds movies from search '
+                                 'result cards, hybrid fetches title pages only for directors and cast')
+        add_scraper_arguments(parser)
 
     def handle(self, *args, **options):
-        search_type = options['type']
-        search_value = options['value']
-        limit = options['limit']
-        job_id = options.get('job_id')
+        asyncio.run(self.run(options))
 
+    async def run(self, options):
+        queries = list(options['queries'])
+        if options['type'] and options['value']:
+            queries.insert(0, (options['type'], options['value']))
+        elif options['type'] or options['value']:
+            raise CommandError("--type and --value must be given together.")
+
+        job_id = options.get('job_id')
         if job_id:
             try:
-                status = asyncio.run(sync_to_async(ScraperStatus.objects.get)(job_id=uuid.UUID(job_id)))
-            except ScraperStatus.DoesNotExist:
+                status = await ScraperStatus.objects.aget(job_id=uuid.UUID(job_id))
+            except (ScraperStatus.DoesNotExist, ValueError):
                 raise CommandError(f"Job with id {job_id} does not exist.")
+            if not await sync_to_async(take_job)(status):
+                raise CommandError(f"Job {job_id} is being run by {status.lease_owner}; "
+                                   f"its lease expires at {status.lease_expires_at:%Y-%m-%d %H:%M:%S}.")
+        elif not queries:
+            raise CommandError("Give --type and --value, or at least one --query.")
         else:
-            status = asyncio.run(sync_to_async(ScraperStatus.objects.create)())
-
-        status.status = 'running'
-        asyncio.run(sync_to_async(status.save)(update_fields=["status"]))
-        logger.info(f"Scraping IMDb using {search_type}: '{search_value}', limit: {limit}")
+            # Saved as running with no lease, so scraper_worker never claims it
+            status = ScraperStatus(limit=IMDB_PAGE_SIZE, mode='full', status='running')
+
+        # A resumed job keeps its stored configuration except for what was passed explicitly
+        if queries:
+            (status.search_type, status.search_value), extra_queries = queries[0], queries[1:]
+            status.queries = [{'type': query_type, 'value': query_value} for query_type, query_value in extra_queries]
+        if options['limit'] is not None:
+            status.limit = options['limit']
+        if options['mode'] is not None:
+            status.mode = options['mode']
+        await sync_to_async(status.save)()
 
         try:
-            scraper = IMDBScraper(search_type, search_value, limit, status)
-            asyncio.run(scraper.run())
-        except Exception as e:
-            logger.exception("Scraper failed")
-            status.status = 'error'
-            status.error_message = str(e)
-            asyncio.run(sync_to_async(status.save)(update_fields=["status", "error_message"]))
-            raise
+            await run_scrape_job(status, **scraper_options(options))
+        finally:
+            await close_browser_pool()
+            close_parse_pool()
@@ -0,0 +1,93 @@
+import asyncio
+import logging
+import signal
+
+from asgiref.sync import sync_to_async
+from django.core.management.base import BaseCommand
+
+from scraper.browser import close_browser_pool
+from scraper.jobs import LEASE_SECONDS, claim_job, release_job, renew_lease, worker_name
+from scraper.parsers import close_parse_pool
+from scripts.management.commands.scraper import add_scraper_arguments, run_scrape_job, scraper_options
+
+logger = logging.getLogger(__name__)
+
+POLL_INTERVAL = 2
+
+
+class Command(BaseCommand):
+    help = 'Claims queued scrape jobs from the database and runs them'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--concurrency', dest='jobs', type=int, default=1,
+                            help='Number of jobs this worker runs at the same time')
+        parser.add_argument('--poll-interval', type=float, default=POLL_INTERVAL,
+                            help='Seconds between queue polls when idle')
+        parser.add_argument('--lease-seconds', type=int, default=LEASE_SECONDS,
+                            help='Seconds a claimed job stays leased without a heartbeat')
+        parser.add_argument('--once', action='store_true',
+                            help='Exit once the queue is empty and all claimed jobs finished')
+        # --concurrency sizes the worker here, so the per-job request limit gets its own flag
+        add_scraper_arguments(parser, concurrency_flag='--request-concurrency')
+
+    def handle(self, *args, **options):
+        asyncio.run(self.serve(options))
+
+    async def serve(self, options):
+        owner = worker_name()
+        stopping = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(sig, stopping.set)
+            except (NotImplementedError, RuntimeError):
+                pass
+
+        kwargs = scraper_options(options)
+        logger.info(f"Scraper worker {owner} started with {options['jobs']} job slot(s)")
+        running = set()
+        try:
+            while not stopping.is_set():
+                while len(running) < options['jobs']:
+                    job = await sync_to_async(claim_job)(owner, options['lease_seconds'])
+                    if job is None:
+                        break
+                    running.add(asyncio.create_task(self.run_job(job, owner, options['lease_seconds'], kwargs)))
+
+                if not running and options['once']:
+                    break
+                if running:
+                    _, running = await asyncio.wait(running, timeout=options['poll_interval'],
+                                                    return_when=asyncio.FIRST_COMPLETED)
+                else:
+                    try:
+                        await asyncio.wait_for(stopping.wait(), options['poll_interval'])
+                    except asyncio.TimeoutError:
+                        pass
+        finally:
+            if running:
+                logger.info(f"Waiting for {len(running)} running job(s) to finish")
+                await asyncio.gather(*running, return_exceptions=True)
+            await close_browser_pool()
+            close_parse_pool()
+        logger.info(f"Scraper worker {owner} stopped")
+
+    async def run_job(self, job, owner, lease_seconds, kwargs):
+        job_task = asyncio.current_task()
+        heartbeat = asyncio.create_task(self.heartbeat(job, owner, lease_seconds, job_task))
+        try:
+            await run_scrape_job(job, **kwargs)
+        except asyncio.CancelledError:
+            logger.warning(f"Job {job.job_id} lost its lease and was abandoned")
+        except Exception:
+            pass  # run_scrape_job logged the failure and marked the job as errored
+        finally:
+            heartbeat.cancel()
+            await sync_to_async(release_job)(job, owner)
+
+    async def heartbeat(self, job, owner, lease_seconds, job_task):
+        while True:
+            await asyncio.sleep(lease_seconds / 3)
+            if not await sync_to_async(renew_lease)(job, owner, lease_seconds):
+                job_task.cancel()
+                return